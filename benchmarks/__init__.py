@@ -0,0 +1 @@
+"""Benchmarks for the scraper; run modules with `python -m benchmarks.<name>`."""
@@ -0,0 +1,156 @@
+"""
+Load test for the read API (`scraper.jane.api`) on synthetic data.
+
+Writes a synthetic puzzle store, serves it on a local port from a child
+process (so the clients don't compete with it for the GIL) and drives it
+from `--clients` keep-alive connections for `--requests` requests each,
+mixing
+
+    page      /api/solvers?offset=..&limit=50     (random page of the ranking)
+    solver    /api/solvers/<name>                 (random solver)
+    month     /api/puzzles/<YYYY-MM>              (random month)
+    window    /api/top?since=YYYY-MM&limit=50     (random window start)
+
+A `--revalidate` share of requests repeat an earlier URL with its ETag in
+If-None-Match, as a browser would. Reports p50/p99 latency and throughput
+per kind and overall, plus how many answers were 304s.
+
+    python -m benchmarks.api_load [--scale 1] [--clients 8] [--requests 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+
+import requests
+from loguru import logger
+
+from benchmarks.synthetic import generate_puzzles
+from scraper.jane.api import IndexHolder, make_server
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _make_urls(holder: IndexHolder, rng: random.Random) -> Tuple[str, str]:
+    index = holder.index
+    kind = rng.choices(["page", "solver", "month", "window"], weights=[4, 3, 2, 1])[0]
+    if kind == "page":
+        pages = max(1, len(index.ranking) // 50)
+        return kind, f"/api/solvers?offset={rng.randrange(pages) * 50}&limit=50"
+    if kind == "solver":
+        return kind, "/api/solvers/" + quote(rng.choice(index.ranking)["name"], safe="")
+    if kind == "month":
+        return kind, f"/api/puzzles/{rng.choice(index.months)}"
+    return kind, f"/api/top?since={rng.choice(index.months)}&limit=50"
+
+
+def run_client(
+    origin: str, holder: IndexHolder, count: int, revalidate: float, seed: int,
+    results: List[Tuple[str, float, int]],
+) -> None:
+    rng = random.Random(seed)
+    seen: Dict[str, str] = {}
+    session = requests.Session()
+    session.trust_env = False
+    local: List[Tuple[str, float, int]] = []
+    for _ in range(count):
+        if seen and rng.random() < revalidate:
+            url = rng.choice(list(seen))
+            kind, headers = "revalidate", {"If-None-Match": seen[url]}
+        else:
+            kind, url = _make_urls(holder, rng)
+            headers = {}
+        start = time.perf_counter()
+        response = session.get(origin + url, headers=headers)
+        response.content
+        local.append((kind, time.perf_counter() - start, response.status_code))
+        if "ETag" in response.headers:
+            seen[url] = response.headers["ETag"]
+    session.close()
+    results.extend(local)
+
+
+def _serve(data_path: str, ready) -> None:
+    logger.remove()
+    httpd = make_server(IndexHolder(data_path), port=0)
+    ready.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="p50/p99 latency of the local read API")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per client")
+    parser.add_argument("--revalidate", type=float, default=0.3, help="Share of conditional re-requests")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "data.json")
+        with open(data_path, "w", encoding="utf-8") as f:
+            json.dump(generate_puzzles(args.scale, args.seed), f, ensure_ascii=False)
+        started = time.perf_counter()
+        # The server builds its own copy; this one picks the URLs.
+        holder = IndexHolder(data_path)
+        index_s = time.perf_counter() - started
+        ready: multiprocessing.Queue = multiprocessing.Queue()
+        server = multiprocessing.Process(target=_serve, args=(data_path, ready), daemon=True)
+        server.start()
+        origin = f"http://127.0.0.1:{ready.get(timeout=60)}"
+
+        results: List[Tuple[str, float, int]] = []
+        threads = [
+            threading.Thread(
+                target=run_client,
+                args=(origin, holder, args.requests, args.revalidate, args.seed + i, results),
+            )
+            for i in range(args.clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        server.terminate()
+        server.join()
+
+    index = holder.index
+    print(
+        f"{len(index.ranking)} solvers, {len(index.months)} months; index built in {index_s:.2f}s; "
+        f"{args.clients} client(s) x {args.requests} request(s)"
+    )
+    print(f"  {'kind':<11}{'count':>7}{'p50 ms':>9}{'p99 ms':>9}")
+    kinds = ["page", "solver", "month", "window", "revalidate"]
+    for kind in kinds + ["all"]:
+        latencies = [t for k, t, _ in results if kind in ("all", k)]
+        if latencies:
+            print(
+                f"  {kind:<11}{len(latencies):>7}{_percentile(latencies, 0.5) * 1000:>9.2f}"
+                f"{_percentile(latencies, 0.99) * 1000:>9.2f}"
+            )
+    not_modified = sum(1 for _, _, status in results if status == 304)
+    errors = sum(1 for _, _, status in results if status not in (200, 304))
+    print(f"{len(results) / wall:.0f} requests/s; {not_modified} answered 304, {errors} error(s)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+Connection-reuse benchmark against a local TLS stand-in server.
+
+Fetches small leaderboard-sized JSON documents from a local HTTPS server
+(which waits `--latency` before each response, standing in for the
+network) through `build_session`, in bursts of `--workers` concurrent
+requests like the per-archive-page fan-out, and reports connections
+opened, wall time and time per request for:
+
+    close      every request on a fresh connection (`Connection: close`)
+    pool-10    the old fixed 10-connection pool
+    pool-N     the pool sized to --workers (what the scraper now does)
+
+The difference between `close` and `pool-N` is the per-request connection
+setup (TCP + TLS handshake) that keep-alive removes. Needs the `openssl`
+command to make a throwaway certificate.
+
+    python -m benchmarks.connections [--rounds 20] [--workers 32]
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from scraper.jane.client import DEFAULT_POOL_SIZE, build_session, fetch_json, get_connection_stats
+
+BODY = json.dumps({"leaders": [f"Solver {i}" for i in range(150)]}).encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _make_certificate(directory: str) -> Optional[Tuple[str, str]]:
+    """(certificate, key) paths for a self-signed 127.0.0.1 certificate, or None without openssl."""
+    if shutil.which("openssl") is None:
+        return None
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1",
+            "-addext", "subjectAltName=IP:127.0.0.1",
+        ],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def _serve(cert: str, key: str, latency: float) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {"latency": latency})
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    httpd.daemon_threads = True
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def run_case(url: str, cert: str, rounds: int, workers: int, pool_size: int, close: bool) -> Dict[str, Any]:
+    session = build_session(pool_size=pool_size)
+    # Ignore REQUESTS_CA_BUNDLE / proxy settings from the environment.
+    session.trust_env = False
+    session.verify = cert
+    if close:
+        session.headers["Connection"] = "close"
+    stats = get_connection_stats()
+    opened, sent = stats.counters["opened"], stats.counters["requests"]
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in range(rounds):
+            list(executor.map(lambda _: fetch_json(session, url), range(workers)))
+    wall = time.perf_counter() - start
+    requests = rounds * workers
+    session.close()
+    return {
+        "connections": stats.counters["opened"] - opened,
+        "requests": stats.counters["requests"] - sent,
+        "wall_s": round(wall, 3),
+        "ms_per_request": round(wall * 1000 / requests, 3),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Keep-alive / pool sizing benchmark over local TLS")
+    parser.add_argument("--rounds", type=int, default=20, help="Bursts of --workers concurrent requests")
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.02, help="Server think time per request, seconds")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pem = _make_certificate(tmp)
+        if pem is None:
+            print("openssl not found; cannot make a certificate for the TLS server")
+            return 1
+        cert, key = pem
+        httpd = _serve(cert, key, args.latency)
+        url = f"https://127.0.0.1:{httpd.server_address[1]}/puzzles/2026-08-01-example-leaderboard.json"
+        try:
+            cases = {
+                "close": (args.workers, True),
+                f"pool-{DEFAULT_POOL_SIZE}": (DEFAULT_POOL_SIZE, False),
+                f"pool-{args.workers}": (args.workers, False),
+            }
+            results = {
+                name: run_case(url, cert, args.rounds, args.workers, pool_size, close)
+                for name, (pool_size, close) in cases.items()
+            }
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+    requests = args.rounds * args.workers
+    print(f"{args.rounds} bursts of {args.workers} concurrent requests")
+    for name, r in results.items():
+        print(
+            f"  {name:<10} {r['connections']:>6} connection(s) for {r['requests']:>6} request(s)  "
+            f"{r['wall_s']:7.3f} s  {r['ms_per_request']:7.3f} ms/request"
+        )
+    pooled = results[f"pool-{args.workers}"]
+    setup = (results["close"]["wall_s"] - pooled["wall_s"]) * 1000 / requests
+    print(f"Connection setup removed by keep-alive: {setup:.3f} ms/request of wall time")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Peak memory of loading a puzzle store: `json.load` vs the streaming loader.
+
+Writes a synthetic data.json at `--scale` and, each in a fresh interpreter
+so its peak RSS is its own, runs
+
+    index   load the store keyed by puzzle (`load_existing`, what
+            `scrape_all` does before walking the archive)
+    stats   load the store and `build_stats` it
+
+with three loaders:
+
+    json.load   the whole file parsed at once, as the loaders did before
+                they streamed (`json.load`, then a dict keyed by puzzle)
+    stream      `storage.iter_puzzles`
+    lazy        `storage.iter_puzzles(lazy=True)`: `solver_timestamps`
+                left as JSON text until read
+
+Peak RSS is reported above that of an interpreter that has only imported
+the modules, with wall time and a check that the results match `json.load`.
+
+    python -m benchmarks.loader_memory [--scale 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOADERS = ["json.load", "stream", "lazy"]
+TASKS = ["index", "stats"]
+
+
+def _rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run(task: str, loader: str, path: str) -> Dict[str, Any]:
+    from scraper.jane.aggregator import build_stats
+    from scraper.jane.storage import iter_puzzles, load_existing
+
+    start = time.perf_counter()
+    if loader == "none":
+        result: Any = None
+    elif task == "index":
+        if loader == "json.load":
+            with open(path, "r", encoding="utf-8") as f:
+                result = {f"{p.get('date_text')}_{p.get('name')}": p for p in json.load(f)}
+        else:
+            result = load_existing(path, lazy=loader == "lazy")
+    else:
+        if loader == "json.load":
+            with open(path, "r", encoding="utf-8") as f:
+                puzzles = json.load(f)
+        else:
+            puzzles = iter_puzzles(path, lazy=loader == "lazy")
+        result = build_stats(puzzles)
+        result.pop("generatedAt")
+    wall = time.perf_counter() - start
+    peak = _rss_mb()  # before serializing the result for the digest
+    digest = hashlib.sha1(json.dumps(result, sort_keys=True).encode("utf-8")).hexdigest()
+    return {"wall_s": wall, "peak_rss_mb": peak, "digest": digest}
+
+
+def _write(path: str, scale: str, seed: str) -> Dict[str, Any]:
+    from benchmarks.synthetic import generate_puzzles
+    from scraper.jane.storage import save_puzzles_raw
+
+    puzzles = generate_puzzles(int(scale), int(seed))
+    save_puzzles_raw(path, puzzles)
+    return {"puzzles": len(puzzles)}
+
+
+def _spawn(*args: str) -> Dict[str, Any]:
+    # A child forked from a big parent starts with the parent's peak RSS, so
+    # even the dataset is written from a child.
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.loader_memory", *args],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip())
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None) -> int:
+    if argv is None and sys.argv[1:2] in (["_run"], ["_write"]):
+        from loguru import logger
+        logger.remove()
+        command = _run if sys.argv[1] == "_run" else _write
+        print(json.dumps(command(*sys.argv[2:5])))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Peak RSS of json.load vs the streaming puzzle loader")
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.json")
+        count = _spawn("_write", path, str(args.scale), str(args.seed))["puzzles"]
+        base = _spawn("_run", "index", "none", path)["peak_rss_mb"]
+        print(
+            f"scale {args.scale}: {count} puzzles, {os.path.getsize(path) / 1e6:.1f} MB data.json; "
+            f"interpreter with imports {base:.0f} MB"
+        )
+        print(f"  {'task':<7}{'loader':<11}{'peak MB':>9}{'wall s':>9}")
+        for task in TASKS:
+            results = {loader: _spawn("_run", task, loader, path) for loader in LOADERS}
+            for loader, r in results.items():
+                print(f"  {task:<7}{loader:<11}{r['peak_rss_mb'] - base:>9.1f}{r['wall_s']:>9.2f}")
+                if r["digest"] != results["json.load"]["digest"]:
+                    failures.append(f"{task}/{loader}: result differs from json.load")
+    for line in failures:
+        print(f"FAIL: {line}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
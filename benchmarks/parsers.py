@@ -0,0 +1,72 @@
+"""
+Parser benchmark.
+
+Times `parse_archive_page` / `parse_solution_page` through both the
+streaming extractor and the BeautifulSoup path over the saved fixture pages.
+That both paths agree is checked by tests/test_parsers.py.
+
+    python -m benchmarks.parsers [--repeat 200] [--fixtures DIR]
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from scraper.jane.parsers import parse_archive_page, parse_solution_page
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def _load(pattern: str, directory: str) -> List[Tuple[str, str]]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def _archive_key(html: str, fast: bool):
+    return [(m.date_text, m.name, m.solution_url, m.date) for m in parse_archive_page(html, fast=fast)]
+
+
+def _solution_key(html: str, fast: bool):
+    return parse_solution_page(html, fast=fast)
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the page parsers")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="Directory of saved *.html pages")
+    parser.add_argument("--repeat", type=int, default=200, help="Timing iterations per page")
+    args = parser.parse_args(argv)
+
+    kinds = [
+        ("archive", _load("archive_*.html", args.fixtures), _archive_key),
+        ("solution", _load("solution_*.html", args.fixtures), _solution_key),
+    ]
+
+    for kind, pages, key in kinds:
+        if not pages:
+            print(f"{kind}: no fixtures in {args.fixtures}")
+            continue
+        print(f"{kind}: {len(pages)} fixtures")
+        for name, html in pages:
+            soup = _time(lambda: key(html, False), args.repeat)
+            fast = _time(lambda: key(html, True), args.repeat)
+            print(f"  {name:<28} soup {soup * 1e3:7.3f} ms  stream {fast * 1e3:7.3f} ms  x{soup / fast:5.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
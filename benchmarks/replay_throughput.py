@@ -0,0 +1,119 @@
+"""
+Offline throughput of `--full` under different `--workers`, from a fixture archive.
+
+Records a cold full scrape of the synthetic stand-in site (see
+`benchmarks.standin`) into a fixture archive, or takes one written
+by `--record`, then replays a cold `scrape_all` from it once per worker
+count. Every response is delayed by `--latency` seconds (or its recorded
+latency with `--latency recorded`) and `--error-rate` of attempts fail
+with a connection reset or a 503, retried as usual. Reports wall time,
+requests/second and puzzles/second per worker count. Every request must
+have been recorded, and without injected errors every run must produce
+the puzzles of the recording run; the benchmark exits non-zero otherwise.
+
+    python -m benchmarks.replay_throughput [--scale 1] [--workers 1,2,4,8,16,32] [--latency 0.05]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from benchmarks.standin import ARCHIVE_PATH, SITE, Reroute, StandInServer, build_routes
+from benchmarks.synthetic import generate_puzzles
+from scraper.jane.client import build_session
+from scraper.jane.pipeline import scrape_all
+from scraper.jane.replay import FixtureArchive, FixtureRecorder, FixtureReplayer
+
+
+def record(scale: int, seed: int, path: str) -> List[Dict[str, Any]]:
+    """Record a cold full scrape of the stand-in site to `path`; return the puzzles it produced."""
+    server = StandInServer(build_routes(generate_puzzles(scale, seed)))
+    recorder = FixtureRecorder(path)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            session = build_session(pool_size=8)
+            session.mount(SITE, recorder.adapter(Reroute(server.origin)))
+            puzzles = scrape_all(SITE + ARCHIVE_PATH, None, os.path.join(tmp, "data.json"), workers=8, session=session)
+    finally:
+        server.close()
+    recorder.save()
+    return [p.to_dict() for p in puzzles]
+
+
+def _comparable(puzzles: List[Dict[str, Any]]) -> str:
+    """`puzzles` without the first-seen times, which are stamped at scrape time."""
+    return json.dumps([
+        {**p, "solver_timestamps": sorted(p.get("solver_timestamps") or {})} for p in puzzles
+    ], sort_keys=True)
+
+
+def replay(
+    archive: FixtureArchive, workers: int, latency: Optional[float], error_rate: float, seed: int,
+) -> Tuple[float, FixtureReplayer, List[Dict[str, Any]]]:
+    replayer = FixtureReplayer(archive, latency=latency, error_rate=error_rate, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        session = build_session(pool_size=workers)
+        session.mount(SITE, replayer.adapter(session.get_adapter(SITE)))
+        start = time.perf_counter()
+        puzzles = scrape_all(SITE + ARCHIVE_PATH, None, os.path.join(tmp, "data.json"), workers=workers, session=session)
+        wall = time.perf_counter() - start
+    return wall, replayer, [p.to_dict() for p in puzzles]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a full scrape offline at several worker counts")
+    parser.add_argument("--archive", default=None, help="Fixture archive from --record (default: record the stand-in site)")
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", default="1,2,4,8,16,32")
+    parser.add_argument("--latency", default="0.05", help="Seconds per response, or 'recorded'")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    # The scraper logs the 404 that ends the archive walk as an error.
+    logger.remove()
+    logger.add(sys.stderr, level="CRITICAL")
+
+    expected = None
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.archive
+        if path is None:
+            path = os.path.join(tmp, "fixtures.json.gz")
+            expected = record(args.scale, args.seed, path)
+        size = os.path.getsize(path)
+        archive = FixtureArchive.load(path)
+
+    latency = None if args.latency == "recorded" else float(args.latency)
+    print(
+        f"{len(archive)} recorded response(s) for {len(archive.responses)} URL(s), "
+        f"{size / 1024:.0f} KiB archive; latency {args.latency}"
+        + ("s" if latency is not None else "") + f", error rate {args.error_rate:g}"
+    )
+    print(f"  {'workers':>7}{'wall s':>9}{'requests/s':>12}{'puzzles/s':>11}{'injected':>10}")
+    failures = []
+    for workers in [int(w) for w in args.workers.split(",")]:
+        wall, replayer, puzzles = replay(archive, workers, latency, args.error_rate, args.seed)
+        requests_made = sum(replayer.counters.values())
+        print(
+            f"  {workers:>7}{wall:>9.2f}{requests_made / wall:>12.0f}{len(puzzles) / wall:>11.0f}"
+            f"{replayer.counters['injected']:>10}"
+        )
+        if replayer.counters["missing"]:
+            failures.append(f"workers={workers}: {replayer.counters['missing']} unrecorded request(s)")
+        if expected is not None and not args.error_rate and _comparable(puzzles) != _comparable(expected):
+            failures.append(f"workers={workers}: puzzles differ from the recording run")
+    for line in failures:
+        print(f"FAIL: {line}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Scale benchmarks for the scraper and aggregator on synthetic data.
+
+Each (case, scale) pair runs in a fresh interpreter so its peak RSS is its
+own. Results are written as JSON; `compare` checks them against a stored
+baseline and exits non-zero on a regression. Baselines are machine-specific,
+so keep one per machine, e.g. by running once with
+`--out benchmarks/results/baseline.json`.
+
+    python -m benchmarks.scale run --scales 1 10 100 --out benchmarks/results/latest.json
+    python -m benchmarks.scale compare benchmarks/results/latest.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_OUT = os.path.join(RESULTS_DIR, "latest.json")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+
+CASES = [
+    "build_stats",
+    "build_stats_numpy",
+    "build_stats_sqlite",
+    "save_puzzles_raw",
+    "load_puzzles_list",
+    "save_puzzles_raw_columnar",
+    "load_puzzles_list_columnar",
+    "save_puzzles_raw_sqlite",
+    "load_puzzles_list_sqlite",
+    "parse_archive_page",
+    "parse_solution_page",
+    "merge_solvers_with_timestamps",
+]
+
+
+def _rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _setup(case: str, dataset: str, workdir: str) -> Optional[Callable[[], Any]]:
+    """Prepare inputs for `case` and return the callable to time (None if unavailable)."""
+    from scraper.jane.storage import load_puzzles_list, save_puzzles_raw
+
+    puzzles = load_puzzles_list(dataset)
+
+    if case == "build_stats":
+        from scraper.jane.aggregator import build_stats
+        return lambda: build_stats(puzzles)
+    if case == "build_stats_numpy":
+        try:
+            from scraper.jane.vectorized import build_stats_numpy
+        except ImportError:
+            return None
+        return lambda: build_stats_numpy(puzzles)
+    if case == "build_stats_sqlite":
+        from scraper.jane.sqlite_store import build_stats_from_db
+        path = os.path.join(workdir, "data.sqlite")
+        save_puzzles_raw(path, puzzles)
+        del puzzles
+        return lambda: build_stats_from_db(path)
+    if case == "save_puzzles_raw":
+        path = os.path.join(workdir, "data.json")
+        return lambda: save_puzzles_raw(path, puzzles)
+    if case == "load_puzzles_list":
+        del puzzles
+        return lambda: load_puzzles_list(dataset)
+    if case == "save_puzzles_raw_columnar":
+        path = os.path.join(workdir, "data.jcol")
+        return lambda: save_puzzles_raw(path, puzzles)
+    if case == "load_puzzles_list_columnar":
+        path = os.path.join(workdir, "data.jcol")
+        save_puzzles_raw(path, puzzles)
+        del puzzles
+        return lambda: load_puzzles_list(path)
+    if case == "save_puzzles_raw_sqlite":
+        # A fresh file per run: rewriting an existing database only touches changed puzzles.
+        paths = iter(os.path.join(workdir, f"data-{i}.sqlite") for i in range(1000))
+        return lambda: save_puzzles_raw(next(paths), puzzles)
+    if case == "load_puzzles_list_sqlite":
+        path = os.path.join(workdir, "data.sqlite")
+        save_puzzles_raw(path, puzzles)
+        del puzzles
+        return lambda: load_puzzles_list(path)
+    if case == "parse_archive_page":
+        from benchmarks.synthetic import render_archive_pages
+        from scraper.jane.parsers import parse_archive_page
+        pages = render_archive_pages(puzzles)
+        del puzzles
+        return lambda: [parse_archive_page(page) for page in pages]
+    if case == "parse_solution_page":
+        from benchmarks.synthetic import render_solution_page
+        from scraper.jane.parsers import parse_solution_page
+        pages = [render_solution_page(p) for p in puzzles]
+        del puzzles
+        return lambda: [parse_solution_page(page) for page in pages]
+    if case == "merge_solvers_with_timestamps":
+        from scraper.jane.pipeline import merge_solvers_with_timestamps
+        # Each leaderboard re-read with the last tenth of its solvers unseen so far.
+        inputs = []
+        for p in puzzles:
+            solvers = p["solvers"]
+            known = solvers[: len(solvers) * 9 // 10]
+            inputs.append((solvers, {name: "2026-01-01T00:00:00+00:00" for name in known}))
+        del puzzles
+        return lambda: [merge_solvers_with_timestamps(fresh, seen) for fresh, seen in inputs]
+    raise ValueError(f"Unknown case {case!r}")
+
+
+def _run_case(case: str, dataset: str, repeat: int) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as workdir:
+        fn = _setup(case, dataset, workdir)
+        if fn is None:
+            return {"skipped": "dependency not installed"}
+        setup_rss = _rss_mb()
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            runs.append(time.perf_counter() - start)
+        return {
+            "wall_s": min(runs),
+            "runs_s": runs,
+            "setup_rss_mb": round(setup_rss, 1),
+            "peak_rss_mb": round(_rss_mb(), 1),
+        }
+
+
+def _spawn_case(case: str, dataset: str, repeat: int) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, "-m", "benchmarks.scale", "_case", case, dataset, "--repeat", str(repeat)],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(scales: List[int], cases: List[str], repeat: int, seed: int, out: str) -> Dict[str, Any]:
+    from benchmarks.synthetic import generate_puzzles
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            dataset = os.path.join(tmp, f"data-{scale}x.json")
+            puzzles = generate_puzzles(scale, seed)
+            with open(dataset, "w", encoding="utf-8") as f:
+                json.dump(puzzles, f, ensure_ascii=False, indent=2)
+            solvers = len({name for p in puzzles for name in p["solvers"]})
+            print(f"scale {scale}x: {len(puzzles)} puzzles, {solvers} solvers")
+            del puzzles
+
+            for case in cases:
+                result = {"case": case, "scale": scale, **_spawn_case(case, dataset, repeat)}
+                results.append(result)
+                if "wall_s" in result:
+                    print(f"  {case:<32} {result['wall_s']:9.3f} s  peak {result['peak_rss_mb']:8.1f} MB")
+                else:
+                    print(f"  {case:<32} {result.get('skipped') or result.get('error')}")
+
+    report = {
+        "meta": {
+            "generatedAt": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {out}")
+    return report
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    min_seconds: float,
+    min_mb: float,
+) -> List[str]:
+    """Regressions of `current` against `baseline`, one message per (case, scale, metric)."""
+    base: Dict[Tuple[str, int], Dict[str, Any]] = {
+        (r["case"], r["scale"]): r for r in baseline.get("results", []) if "wall_s" in r
+    }
+    regressions = []
+    for result in current.get("results", []):
+        key = (result["case"], result["scale"])
+        label = f"{result['case']} @ {result['scale']}x"
+        if "wall_s" not in result:
+            continue
+        if key not in base:
+            print(f"  {label:<44} new")
+            continue
+        before = base[key]
+        notes = []
+        for metric, unit, floor in (("wall_s", "s", min_seconds), ("peak_rss_mb", "MB", min_mb)):
+            old, new = before[metric], result[metric]
+            change = (new - old) / old if old else 0.0
+            note = f"{metric} {old:.3f} -> {new:.3f} {unit} ({change:+.0%})"
+            notes.append(note)
+            if new > old * (1 + tolerance) and new - old > floor:
+                regressions.append(f"{label}: {note}")
+        print(f"  {label:<44} " + "; ".join(notes))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic scale benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="Run benchmarks and write a JSON report")
+    run_p.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    run_p.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    run_p.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the fastest is reported")
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--out", default=DEFAULT_OUT)
+
+    cmp_p = sub.add_parser("compare", help="Flag regressions against a baseline report")
+    cmp_p.add_argument("current", nargs="?", default=DEFAULT_OUT)
+    cmp_p.add_argument("--baseline", default=DEFAULT_BASELINE)
+    cmp_p.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown (default: 0.2)")
+    cmp_p.add_argument("--min-seconds", type=float, default=0.01, help="Ignore wall-time changes below this")
+    cmp_p.add_argument("--min-mb", type=float, default=5.0, help="Ignore peak RSS changes below this")
+
+    case_p = sub.add_parser("_case")  # internal: one case in a fresh process
+    case_p.add_argument("case", choices=CASES)
+    case_p.add_argument("dataset")
+    case_p.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "_case":
+        print(json.dumps(_run_case(args.case, args.dataset, args.repeat)))
+        return 0
+    if args.command == "run":
+        run(args.scales, args.cases, args.repeat, args.seed, args.out)
+        return 0
+
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.tolerance, args.min_seconds, args.min_mb)
+    if regressions:
+        print(f"{len(regressions)} regression(s):")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Queries/second of the solver-name search index (`scraper.jane.search`).
+
+Builds and writes the index for the solver names in a stats file (default
+public/data/stats.json) or in synthetic data at `--scale`, reloads it from
+disk, and times three query mixes drawn from the names themselves:
+
+    prefix    the first 1-8 characters of a word of a name, accents stripped
+    fuzzy     a name with one character dropped or swapped (typo); also
+              reports how often the intended name is in the results
+    scan      baseline: what the UI does today, a casefolded substring
+              filter over every name for the same prefix queries
+
+Also reports build time and the size of the written shards.
+
+    python -m benchmarks.search [--stats public/data/stats.json | --scale 10] [--queries 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from benchmarks.synthetic import generate_puzzles
+from scraper.jane.search import SearchIndex, fold, save_search_index
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STATS = os.path.join(ROOT, "public", "data", "stats.json")
+
+
+def _names(stats_path: str, scale: int) -> List[str]:
+    if scale:
+        counts = {}
+        for puzzle in generate_puzzles(scale):
+            for name in puzzle.get("solvers") or []:
+                counts[name] = counts.get(name, 0) + 1
+        return sorted(counts, key=counts.get, reverse=True)
+    with open(stats_path, "r", encoding="utf-8") as f:
+        return [solver["name"] for solver in json.load(f)["topSolvers"]]
+
+
+def _prefix_queries(names: List[str], count: int, rng: random.Random) -> List[str]:
+    queries = []
+    while len(queries) < count:
+        words = fold(rng.choice(names)).split()
+        if words:
+            word = rng.choice(words)
+            queries.append(word[:rng.randint(1, min(8, len(word)))])
+    return queries
+
+
+def _typo_queries(names: List[str], count: int, rng: random.Random) -> List[Tuple[str, str]]:
+    """(query, intended name) pairs."""
+    queries = []
+    while len(queries) < count:
+        name = rng.choice(names)
+        if len(name) < 5:
+            continue
+        i = rng.randrange(len(name) - 1)
+        if rng.random() < 0.5:
+            queries.append((name[:i] + name[i + 1:], name))
+        else:
+            queries.append((name[:i] + name[i + 1] + name[i] + name[i + 2:], name))
+    return queries
+
+
+def _rate(fn: Callable[[str], List[str]], queries: List[str]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Search index queries/second")
+    parser.add_argument("--stats", default=DEFAULT_STATS)
+    parser.add_argument("--scale", type=int, default=0, help="Use synthetic names at this scale instead")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    names = _names(args.stats, args.scale)
+    rng = random.Random(args.seed)
+    prefix = _prefix_queries(names, args.queries, rng)
+    typo_pairs = _typo_queries(names, args.queries, rng)
+    typos = [query for query, _ in typo_pairs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        manifest = save_search_index(tmp, names)
+        build_s = time.perf_counter() - start
+        total = sum(entry["bytes"] for entry in manifest["files"].values())
+        largest = max(entry["bytes"] for entry in manifest["files"].values())
+        index = SearchIndex.load(tmp)
+        start = time.perf_counter()
+        for query in prefix + typos:  # load every shard the queries touch
+            index.search(query, limit=args.limit)
+        warm_s = time.perf_counter() - start
+
+        def scan(query: str) -> List[str]:
+            needle = query.casefold()
+            return [name for name in names if needle in name.casefold()][:args.limit]
+
+        rates = {
+            "prefix": _rate(lambda q: index.search(q, limit=args.limit, fuzzy=False), prefix),
+            "prefix+fuzzy": _rate(lambda q: index.search(q, limit=args.limit), prefix),
+            "fuzzy": _rate(lambda q: index.search(q, limit=args.limit), typos),
+            "scan": _rate(scan, prefix[: max(1, args.queries // 10)]),
+        }
+        found = sum(1 for query, name in typo_pairs if name in index.search(query, limit=args.limit))
+
+    print(
+        f"{len(names)} names; index built in {build_s:.2f}s, {len(manifest['files'])} files, "
+        f"{total / 1024:.0f} KiB (largest {largest / 1024:.0f} KiB); first {len(prefix) + len(typos)} "
+        f"queries incl. shard loads {warm_s:.2f}s"
+    )
+    for name, rate in rates.items():
+        print(f"  {name:<13}{rate:>10.0f} queries/s")
+    print(f"typo queries returning the intended name in the top {args.limit}: {found}/{len(typos)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
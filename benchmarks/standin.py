@@ -0,0 +1,85 @@
+"""
+Local stand-in for janestreet.com.
+
+Serves a synthetic archive (listing pages, solution pages, leaderboards and
+the current-puzzle page) from a local HTTP server; mounting `Reroute` on a
+session for `SITE` sends the scraper's janestreet.com requests to it.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from benchmarks.synthetic import render_archive_pages, render_solution_page
+
+SITE = "https://www.janestreet.com"
+ARCHIVE_PATH = "/puzzles/archive/"
+
+
+def build_routes(puzzles: List[Dict[str, Any]]) -> Dict[str, Tuple[str, str, bytes]]:
+    """Path -> (kind, content type, body) for every page the scraper may request."""
+    html = "text/html; charset=utf-8"
+    routes: Dict[str, Tuple[str, str, bytes]] = {}
+    for num, page in enumerate(render_archive_pages(puzzles), start=1):
+        path = ARCHIVE_PATH + (f"page{num}/" if num > 1 else "") + "index.html"
+        routes[path] = ("archive", html, page.encode("utf-8"))
+    for p in puzzles:
+        if p["solution_url"]:
+            routes[p["solution_url"][len(SITE):]] = ("solution", html, render_solution_page(p).encode("utf-8"))
+        board = json.dumps({"leaders": p["solvers"]}).encode("utf-8")
+        routes[f"/puzzles/{p['puzzle_id']}-leaderboard.json"] = ("leaderboard", "application/json", board)
+    routes["/puzzles/current-puzzle/"] = ("current", html, render_solution_page(puzzles[0]).encode("utf-8"))
+    return routes
+
+
+class StandInServer:
+    """Local HTTP server for `routes` that counts requests by kind."""
+
+    def __init__(self, routes: Dict[str, Tuple[str, str, bytes]]):
+        self.counts: Counter = Counter()
+        lock = threading.Lock()
+        counts = self.counts
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                kind, content_type, body = routes.get(self.path, ("not-found", "text/plain", b"not found"))
+                with lock:
+                    counts[kind] += 1
+                self.send_response(404 if kind == "not-found" else 200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.origin = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class Reroute(HTTPAdapter):
+    """Send requests for `SITE` to `origin` instead."""
+
+    def __init__(self, origin: str):
+        super().__init__()
+        self.origin = origin
+
+    def send(self, request, **kwargs):
+        request.url = self.origin + request.url[len(SITE):]
+        return super().send(request, **kwargs)
+
@@ -0,0 +1,182 @@
+"""
+Deterministic synthetic puzzle data shaped like data.json.
+
+Scale 1 matches today's dataset: 150 puzzles over 150 months, ~16k solvers
+with the real solves-per-solver histogram (three in four solve once, ~280
+solve ten or more), and leaderboards that grow towards recent months and
+are empty for the oldest puzzles. Scale k keeps the same months with k
+puzzles each and k times as many solvers.
+
+    python -m benchmarks.synthetic --scale 10 --out /tmp/data-10x.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import html
+import json
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Any, Dict, List
+
+MONTHS = 150
+# Months at the old end of the archive that predate leaderboards.
+UNTRACKED_MONTHS = 22
+# Newest synthetic month (August 2026) as year * 12 + month - 1.
+ANCHOR_MONTH = 2026 * 12 + 7
+# Newest puzzles per month-of-data that carry solver_timestamps.
+TIMESTAMPED_MONTHS = 6
+
+# (solves, solvers) in the real data at scale 1.
+SOLVE_HISTOGRAM = [
+    (1, 11883), (2, 2066), (3, 772), (4, 446), (5, 242), (6, 134), (7, 110), (8, 89),
+    (9, 38), (10, 40), (11, 33), (12, 36), (13, 31), (14, 14), (15, 16), (16, 16),
+    (17, 10), (18, 9), (19, 12), (20, 8), (21, 7), (22, 8), (23, 4), (24, 5),
+    (25, 1), (26, 4), (27, 1), (28, 2), (29, 3), (30, 1), (31, 2), (32, 1),
+    (33, 1), (37, 1), (38, 2), (39, 2), (44, 1), (52, 1), (58, 2), (61, 2),
+    (66, 1), (68, 1), (81, 1), (84, 1),
+]
+
+_FIRST = [
+    "Alex", "Sam", "Jordan", "Taylor", "Chris", "Morgan", "Jamie", "Casey", "Riley", "Avery",
+    "Priya", "Wei", "Hiroshi", "Olga", "Mateo", "Aisha", "Lukas", "Ingrid", "Ravi", "Chen",
+    "José", "Zoë", "Łukasz", "Søren", "Mia", "Noah", "Emma", "Liam", "Ana", "Omar",
+    "Yuki", "Kofi", "Elena", "Ivan", "Sara", "Tom", "Nina", "Paul", "Lea", "Raj",
+]
+_LAST = [
+    "A", "B", "C", "D", "E", "F", "G", "H", "Kim", "Lee", "Park", "Nguyen", "Smith", "Chen",
+    "Garcia", "Müller", "Rossi", "Novak", "Silva", "Kowalski", "Tanaka", "Ivanov", "Dubois",
+    "O'Brien", "Van Dijk", "Haddad", "Singh", "Cohen", "Berg", "Khan",
+]
+
+
+def _month_text(month: int) -> str:
+    return datetime(month // 12, month % 12 + 1, 1).strftime("%B %Y")
+
+
+def _solver_name(i: int) -> str:
+    first = _FIRST[i % len(_FIRST)]
+    last = _LAST[(i // len(_FIRST)) % len(_LAST)]
+    cycle = i // (len(_FIRST) * len(_LAST))
+    return f"{first} {last}" if cycle == 0 else f"{first} {last} {cycle}"
+
+
+def generate_puzzles(scale: int = 1, seed: int = 0) -> List[Dict[str, Any]]:
+    """Newest-first puzzle dicts in data.json layout for `scale` times today's dataset."""
+    rng = random.Random(seed)
+    n_puzzles = MONTHS * scale
+    tracked = (MONTHS - UNTRACKED_MONTHS) * scale
+
+    # Leaderboard popularity decays with age, with heavy puzzle-to-puzzle variance.
+    popularity = [
+        (60 + 900 * math.exp(-(pos // scale) / 20)) * rng.lognormvariate(0, 0.6)
+        for pos in range(tracked)
+    ]
+    cumulative = list(accumulate(popularity))
+    total_weight = cumulative[-1]
+
+    counts = [solves for solves, solvers in SOLVE_HISTOGRAM for _ in range(solvers * scale)]
+    rng.shuffle(counts)
+
+    leaderboards: List[List[int]] = [[] for _ in range(n_puzzles)]
+    for solver_id, solves in enumerate(counts):
+        anchor = min(tracked - 1, bisect.bisect(cumulative, rng.random() * total_weight))
+        if solves == 1:
+            leaderboards[anchor].append(solver_id)
+            continue
+        # Regulars solve most puzzles across a stretch of consecutive months.
+        span = min(tracked, max(solves, round(solves * rng.uniform(1.0, 2.5))))
+        start = min(max(0, anchor - span // 2), tracked - span)
+        for pos in rng.sample(range(start, start + span), solves):
+            leaderboards[pos].append(solver_id)
+
+    base_ts = datetime(2026, 8, 3, 14, 30, 28, 104052, tzinfo=timezone.utc)
+    puzzles: List[Dict[str, Any]] = []
+    for pos, board in enumerate(leaderboards):
+        rng.shuffle(board)
+        month = ANCHOR_MONTH - pos // scale
+        slug = f"synthetic-puzzle-{pos}"
+        solvers = [_solver_name(i) for i in board]
+        timestamps: Dict[str, str] = {}
+        if pos < TIMESTAMPED_MONTHS * scale:
+            seen = base_ts - timedelta(days=31 * (pos // scale))
+            for offset, name in enumerate(solvers):
+                timestamps[name] = (seen + timedelta(minutes=offset)).isoformat()
+        entry: Dict[str, Any] = {
+            "date_text": _month_text(month),
+            "name": f"Synthetic Puzzle {pos}",
+            "solution_url": "" if pos == 0 else f"https://www.janestreet.com/puzzles/{slug}-solution",
+            "solvers": solvers,
+            "solver_timestamps": timestamps,
+            "puzzle_id": f"{month // 12}-{month % 12 + 1:02d}-01-{slug}",
+        }
+        if 0 < pos < TIMESTAMPED_MONTHS * scale:
+            entry["archived_at"] = (base_ts - timedelta(days=31 * (pos // scale - 1))).isoformat()
+        puzzles.append(entry)
+    return puzzles
+
+
+def render_archive_pages(puzzles: List[Dict[str, Any]], per_page: int = 24) -> List[str]:
+    """Archive listing pages for `puzzles`, in the markup `parse_archive_page` expects."""
+    pages = []
+    for start in range(0, len(puzzles), per_page):
+        rows = []
+        for p in puzzles[start:start + per_page]:
+            href = p["solution_url"].replace("https://www.janestreet.com", "")
+            link = f'<a class="solution-link" href="{html.escape(href)}">Solution</a>' if href else ""
+            rows.append(
+                '<div class="row">\n'
+                f'  <div class="left"><span class="date">{p["date_text"]}:</span>\n'
+                f'    <span class="name">{html.escape(p["name"], quote=False)}</span></div>\n'
+                f'  <div class="right"><a class="puzzle-link" href="/puzzles/{p["puzzle_id"]}/">Puzzle</a>\n'
+                f"    {link}</div>\n"
+                "</div>\n"
+            )
+        pages.append(
+            "<!DOCTYPE html>\n<html lang=\"en\">\n<head><meta charset=\"utf-8\"><title>Puzzle Archive</title>\n"
+            "<script>window.dataLayer = window.dataLayer || [];</script></head>\n"
+            "<body class=\"puzzles archive\">\n<div class=\"site-wrap\">\n"
+            "<header class=\"site-header\"><nav><a href=\"/\">Home</a> <a href=\"/puzzles/\">Puzzles</a></nav></header>\n"
+            "<main>\n<div class=\"puzzle-archive\">\n<div class=\"container\">\n<div class=\"archive-inner\">\n"
+            f"<div class=\"archive-list\">\n{''.join(rows)}</div>\n</div>\n</div>\n</div>\n</main>\n"
+            "<footer class=\"site-footer\"><p>&copy; 2026 Jane Street</p></footer>\n</div>\n</body>\n</html>\n"
+        )
+    return pages
+
+
+def render_solution_page(puzzle: Dict[str, Any]) -> str:
+    """Solution page for `puzzle`, with its leaderboard directory near the end."""
+    body = "".join(
+        f"<p>Paragraph {i} of the write-up for {html.escape(puzzle['name'])}, "
+        "explaining the deductions that lead to the unique answer.</p>\n"
+        for i in range(8)
+    )
+    return (
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(puzzle['name'])} Solution</title></head>\n<body>\n<div class=\"site-wrap\">\n<main>\n"
+        f"<div class=\"container\">\n<h1>{html.escape(puzzle['name'])}</h1>\n{body}"
+        "<img src=\"/solution.png\" alt=\"Solution grid\">\n<h3>Correct submissions</h3>\n"
+        f"<p class=\"correct-submissions\" data-directory=\"{puzzle['puzzle_id']}\">Loading&hellip;</p>\n"
+        "</div>\n</main>\n</div>\n</body>\n</html>\n"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic data.json")
+    parser.add_argument("--scale", type=int, default=1, help="Multiple of today's dataset size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Output JSON path")
+    args = parser.parse_args(argv)
+
+    puzzles = generate_puzzles(args.scale, args.seed)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(puzzles, f, ensure_ascii=False, indent=2)
+    solvers = len({name for p in puzzles for name in p["solvers"]})
+    print(f"Wrote {len(puzzles)} puzzles / {solvers} solvers to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
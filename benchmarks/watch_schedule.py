@@ -0,0 +1,110 @@
+"""
+Detection latency vs. polling cost for `--watch`, on simulated solver arrivals.
+
+Solvers arrive on a puzzle as a Poisson process whose rate decays
+exponentially after the puzzle drops (`--solvers` in expectation, time
+constant `--decay-days`). Each strategy polls the leaderboard over
+`--days`; a solver is detected by the first poll after they arrive. For
+
+    daily      one poll a day (the cron job)
+    fixed      a poll every --min-interval seconds
+    adaptive   `watch.PollSchedule`
+
+it reports the number of polls and the mean, p95 and max detection latency.
+No requests are made.
+
+    python -m benchmarks.watch_schedule [--solvers 150] [--decay-days 5] [--days 30]
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import math
+import random
+import sys
+from typing import Callable, Dict, List
+
+from scraper.jane.watch import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, PollSchedule
+
+DAY = 24 * 3600.0
+
+
+def arrivals(solvers: float, decay: float, horizon: float, seed: int) -> List[float]:
+    """Arrival times (seconds after the drop) for rate `solvers / decay * exp(-t / decay)`."""
+    rng = random.Random(seed)
+    peak = solvers / decay
+    times: List[float] = []
+    t = 0.0
+    # Thinning against the peak rate.
+    while True:
+        t += rng.expovariate(peak)
+        if t >= horizon:
+            return times
+        if rng.random() < math.exp(-t / decay):
+            times.append(t)
+
+
+def simulate(times: List[float], horizon: float, next_interval: Callable[[int, float], float]) -> Dict[str, float]:
+    """Poll until `horizon`; `next_interval(new, elapsed)` gives the wait after each poll."""
+    polls: List[float] = []
+    t, seen = 0.0, 0
+    elapsed = 0.0
+    while t < horizon:
+        polls.append(t)
+        now_seen = bisect.bisect_right(times, t)
+        interval = next_interval(now_seen - seen, elapsed)
+        seen = now_seen
+        elapsed = interval
+        t += interval
+    polls.append(horizon)  # whatever is left is picked up by the next run
+    latencies = sorted(polls[bisect.bisect_left(polls, a)] - a for a in times)
+    if not latencies:
+        return {"polls": len(polls) - 1, "mean_s": 0.0, "p95_s": 0.0, "max_s": 0.0}
+    return {
+        "polls": len(polls) - 1,
+        "mean_s": sum(latencies) / len(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "max_s": latencies[-1],
+    }
+
+
+def _human(seconds: float) -> str:
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds:.0f}s"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate --watch polling against decaying solver arrivals")
+    parser.add_argument("--solvers", type=float, default=150.0)
+    parser.add_argument("--decay-days", type=float, default=5.0)
+    parser.add_argument("--days", type=float, default=30.0)
+    parser.add_argument("--min-interval", type=float, default=DEFAULT_MIN_INTERVAL)
+    parser.add_argument("--max-interval", type=float, default=DEFAULT_MAX_INTERVAL)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    horizon = args.days * DAY
+    times = arrivals(args.solvers, args.decay_days * DAY, horizon, args.seed)
+    schedule = PollSchedule(args.min_interval, args.max_interval)
+    results = {
+        "daily": simulate(times, horizon, lambda new, elapsed: DAY),
+        "fixed": simulate(times, horizon, lambda new, elapsed: args.min_interval),
+        "adaptive": simulate(times, horizon, schedule.observe),
+    }
+
+    print(f"{len(times)} solvers over {args.days:g} days (decay {args.decay_days:g} days)")
+    print(f"  {'strategy':<10}{'polls':>8}{'mean':>9}{'p95':>9}{'max':>9}")
+    for name, r in results.items():
+        print(
+            f"  {name:<10}{r['polls']:>8}{_human(r['mean_s']):>9}"
+            f"{_human(r['p95_s']):>9}{_human(r['max_s']):>9}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,30 @@ import os
 
 from loguru import logger
 
-from .jane.pipeline import scrape_all, update_current, backfill_archives
-from .jane.client import build_session
-from .jane.storage import load_puzzles_list, save_puzzles_raw
-from .jane.aggregator import build_stats, save_stats
+from .jane.pipeline import (
+    scrape_all, update_current, backfill_archives, configure_freeze, get_freeze_policy,
+    FREEZE_AFTER_UNCHANGED,
+)
+from .jane.async_pipeline import scrape_all_async
+from .jane.client import (
+    build_session, enable_http_cache, get_http_cache, CachePolicy, enable_rate_limit, get_rate_limiter,
+    get_connection_stats, CircuitBreaker, enable_circuit_breaker, get_circuit_breaker,
+    enable_fixtures, get_fixtures,
+)
+from .jane.ratelimit import AdaptiveLimiter
+from .jane.replay import FixtureRecorder, FixtureReplayer
+from .jane.storage import (
+    load_puzzles_list, save_puzzles_raw, save_puzzles_journaled, export_puzzles_json, compact_journal,
+    journal_path,
+)
+from .jane.columnar import COLUMNAR_SUFFIX
+from .jane.sqlite_store import SQLITE_SUFFIX, puzzles_solved_by
+from .jane.aggregator import STATS_BACKENDS, build_stats, save_stats, save_profile_index
 from .jane.notifier import send_notification
+from .jane.metrics import enable_profiling, save_profile, summarize
+from .jane.writers import configure_output
+from .jane.api import serve
+from .jane.watch import Watcher, PollSchedule, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_INTERVAL
 
 
 def parse_arguments():
@@ -35,7 +54,54 @@ def parse_arguments():
         "--workers",
         type=int,
         default=10,
-        help="Max concurrent workers for --full mode solution fetches (default: 10)",
+        help="Max concurrent workers for --full mode solution fetches and "
+             "archived-leaderboard refreshes (default: 10)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("threads", "async"),
+        default="threads",
+        help="Scraping engine for --full mode: 'threads' walks archive pages one "
+             "by one; 'async' pipelines pages under one --workers request "
+             "budget (default: threads)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and poll the current puzzle on an adaptive schedule, "
+             "writing data and stats only when the leaderboard changed (no "
+             "email is sent); stop with Ctrl-C",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=8000,
+        default=None,
+        type=int,
+        metavar="PORT",
+        help="Serve a read-only JSON API over the puzzle store (top solvers, "
+             "solver lookup, per-month solver lists, windowed rankings) on "
+             "PORT and reload it when the store changes (default: 8000)",
+    )
+    parser.add_argument(
+        "--serve-host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface for --serve (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--watch-min-interval",
+        type=float,
+        default=DEFAULT_MIN_INTERVAL,
+        help="Seconds between polls right after a new puzzle appears and while "
+             f"solvers arrive quickly (default: {DEFAULT_MIN_INTERVAL:.0f})",
+    )
+    parser.add_argument(
+        "--watch-max-interval",
+        type=float,
+        default=DEFAULT_MAX_INTERVAL,
+        help="Longest wait between polls once solvers have slowed down "
+             f"(default: {DEFAULT_MAX_INTERVAL:.0f})",
     )
     parser.add_argument(
         "--timeout",
@@ -43,6 +109,47 @@ def parse_arguments():
         default=10,
         help="Per-request timeout in seconds (default: 10)",
     )
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=None,
+        metavar="RPS",
+        help="Pace requests through a shared adaptive limiter starting at RPS "
+             "requests/second; the rate and concurrency (up to --workers) grow "
+             "while responses are healthy and halve on 429s, 5xx errors or "
+             "slow responses (default: no limiter)",
+    )
+    parser.add_argument(
+        "--latency-target",
+        type=float,
+        default=2.0,
+        help="With --rate-limit, responses slower than this many seconds "
+             "count as congestion (default: 2.0)",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help="Stop contacting janestreet.com for the rest of the run (bar one "
+             "probe every 30s) after this many consecutive failed requests, and "
+             "fall back to the stored data; 0 disables (default: 5)",
+    )
+    parser.add_argument(
+        "--retry-budget",
+        type=int,
+        default=30,
+        help="Retries shared by all requests in the run (in each poll with "
+             "--watch); once spent, failed requests are not retried (default: 30)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Send no requests after this many seconds into the run (into "
+             "each poll with --watch); unfinished work falls back to the stored "
+             "data (default: none)",
+    )
     parser.add_argument(
         "--output",
         type=str,
@@ -62,37 +169,287 @@ def parse_arguments():
         default=24,
         help="How many months back to scan with --backfill-archives (default: 24)",
     )
+    parser.add_argument(
+        "--freeze-after",
+        type=int,
+        default=FREEZE_AFTER_UNCHANGED,
+        help="Stop re-fetching an archived puzzle's leaderboard once this many "
+             "consecutive refreshes past the late-solver window found it "
+             f"unchanged; 0 disables (default: {FREEZE_AFTER_UNCHANGED})",
+    )
+    parser.add_argument(
+        "--freeze-after-days",
+        type=int,
+        default=None,
+        help="Also freeze archived puzzles archived more than this many days "
+             "ago without fetching them again (default: off)",
+    )
+    parser.add_argument(
+        "--refresh-frozen",
+        action="store_true",
+        help="Re-fetch frozen puzzles in the daily and backfill runs anyway; "
+             "a puzzle whose leaderboard changed is thawed",
+    )
+    parser.add_argument(
+        "--http-cache",
+        type=str,
+        default=None,
+        help="Directory for an on-disk HTTP cache; responses are revalidated "
+             "with ETag / Last-Modified instead of re-downloaded",
+    )
+    parser.add_argument(
+        "--cache-immutable-months",
+        type=int,
+        default=None,
+        help="With --http-cache, serve leaderboards of puzzles older than this "
+             "many months straight from the cache (default: always revalidate)",
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Record every response fetched, with its latency, into a gzipped "
+             "fixture archive at PATH for --replay; --http-cache is bypassed "
+             "while recording so that every URL reaches the archive",
+    )
+    fixtures.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Serve requests from a fixture archive written by --record "
+             "instead of janestreet.com; unrecorded URLs answer 404",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="With --replay, delay every response by this much instead of "
+             "its recorded latency",
+    )
+    parser.add_argument(
+        "--replay-error-rate",
+        type=float,
+        default=0.0,
+        help="With --replay, share of requests that fail with a connection "
+             "reset or a 503 (seeded, so runs repeat; default: 0)",
+    )
+    store = parser.add_mutually_exclusive_group()
+    store.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Keep puzzles in the compact columnar store (data.jcol) and "
+             "export data.json from it after each run",
+    )
+    store.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="Keep puzzles in an indexed SQLite database (data.sqlite) and "
+             "export data.json from it after each run",
+    )
+    parser.add_argument(
+        "--solved-by",
+        type=str,
+        default=None,
+        metavar="NAME",
+        help="With --sqlite, list the puzzles NAME is on the leaderboard of "
+             "(newest first, with their rank) from the solver index and exit",
+    )
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="Record daily and backfill changes as small appends to a journal "
+             "next to the puzzle store (e.g. data.json.journal) and fold it into "
+             "the store about once a week, instead of rewriting it every run. "
+             "Meant for --columnar/--sqlite, which still export a full data.json "
+             "every run; on a plain data.json store the snapshot the frontend "
+             "reads only catches up at compaction",
+    )
+    parser.add_argument(
+        "--compact-journal",
+        action="store_true",
+        help="Fold the puzzle journal into the store now and exit",
+    )
+    parser.add_argument(
+        "--compact-json",
+        action="store_true",
+        help="Write data.json, stats.json and the manifests without indentation",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Also write .gz (and .br, if the brotli package is installed) "
+             "siblings of every frontend JSON file",
+    )
+    parser.add_argument(
+        "--stats-state",
+        type=str,
+        default=os.path.join(".cache", "stats_state.json"),
+        help="Persisted aggregate state used to update stats.json incrementally "
+             "in the daily mode; pass an empty string to always recompute "
+             "(default: .cache/stats_state.json)",
+    )
+    parser.add_argument(
+        "--stats-backend",
+        choices=STATS_BACKENDS,
+        default="python",
+        help="Implementation used when stats.json is recomputed from scratch; "
+             "numpy needs NumPy installed, sqlite aggregates in SQL "
+             "(in place for a --sqlite store; default: python)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=os.path.join(".cache", "profile.json"),
+        default=None,
+        metavar="PATH",
+        help="Record per-stage timings, HTTP counters and peak memory and write "
+             "them as JSON to PATH (default: .cache/profile.json)",
+    )
     return parser.parse_args()
 
 
 def main():
     args = parse_arguments()
+    profiler = enable_profiling() if args.profile else None
+    try:
+        run(args)
+    finally:
+        fixtures = get_fixtures()
+        if fixtures is not None:
+            if isinstance(fixtures, FixtureRecorder):
+                fixtures.save()
+            logger.info(fixtures.summary())
+        if profiler is not None:
+            for name, value in get_freeze_policy().counters.items():
+                profiler.count(f"freeze.{name}", value)
+            cache = get_http_cache()
+            if cache is not None:
+                for name, value in cache.counters.items():
+                    profiler.count(f"http.cache.{name}", value)
+            limiter = get_rate_limiter()
+            if limiter is not None:
+                for name, value in limiter.counters.items():
+                    profiler.count(f"http.limiter.{name}", value)
+            breaker = get_circuit_breaker()
+            if breaker is not None:
+                for name, value in breaker.counters.items():
+                    profiler.count(f"http.breaker.{name}", value)
+            if fixtures is not None:
+                for name, value in fixtures.counters.items():
+                    profiler.count(f"http.fixtures.{name}", value)
+            report = save_profile(args.profile, profiler)
+            for line in summarize(report):
+                logger.info(line)
+            logger.info(f"Wrote profile to {args.profile}")
+
+
+def run(args: argparse.Namespace) -> None:
     base_url = "https://www.janestreet.com/puzzles/archive/"
 
     logger.info("Starting Jane Street puzzle scraper")
+    configure_output(compact=args.compact_json, precompress=args.precompress)
+    freeze = configure_freeze(
+        after_unchanged=args.freeze_after,
+        after_days=args.freeze_after_days,
+        refresh_frozen=args.refresh_frozen,
+    )
+
+    if args.record:
+        enable_fixtures(FixtureRecorder(args.record))
+        logger.info(f"Recording responses to {args.record}")
+    elif args.replay:
+        enable_fixtures(FixtureReplayer.load(
+            args.replay, latency=args.replay_latency, error_rate=args.replay_error_rate,
+        ))
+        logger.info(f"Replaying responses from {args.replay}")
+
+    breaker = enable_circuit_breaker(CircuitBreaker(
+        threshold=args.breaker_threshold, retry_budget=args.retry_budget, deadline=args.deadline,
+    ))
+
+    limiter = None
+    if args.rate_limit:
+        limiter = enable_rate_limit(AdaptiveLimiter(
+            rate=args.rate_limit, max_concurrency=args.workers, latency_target=args.latency_target,
+        ))
+        logger.info(f"Rate limiting requests from {args.rate_limit}/s")
+
+    http_cache = None
+    if args.http_cache and args.record:
+        # Cache hits never reach the recording adapter and 304s are not
+        # recorded, so those URLs would be missing from the archive.
+        logger.warning(f"Not using the HTTP cache at {args.http_cache} while recording")
+    elif args.http_cache:
+        http_cache = enable_http_cache(
+            args.http_cache,
+            CachePolicy(immutable_after_months=args.cache_immutable_months),
+        )
+        logger.info(f"Using HTTP cache at {args.http_cache}")
 
     # Keep data.json and stats.json side by side for the frontend
     react_data_dir = os.path.join("public", "data")
     output_dir = react_data_dir if os.path.exists("public") else (os.path.dirname(args.output) or ".")
     output_path = os.path.join(output_dir, "data.json") if os.path.exists("public") else args.output
     stats_path = os.path.join(output_dir, "stats.json")
+    shard_dir = os.path.join(output_dir, "stats")
+    profile_dir = os.path.join(output_dir, "profiles")
 
     logger.info(f"Using output directory: {output_dir}")
 
+    json_path = output_path
+    store_suffix = COLUMNAR_SUFFIX if args.columnar else SQLITE_SUFFIX if args.sqlite else None
+    if store_suffix:
+        output_path = os.path.splitext(json_path)[0] + store_suffix
+        if not os.path.exists(output_path) and os.path.exists(json_path):
+            logger.info(f"Seeding puzzle store {output_path} from {json_path}")
+            save_puzzles_raw(output_path, load_puzzles_list(json_path))
+
+    if args.journal and not store_suffix:
+        logger.warning(
+            f"Journaling into {output_path} itself: it is only rewritten when the "
+            "journal is compacted, so readers of it will see stale data until then"
+        )
+
+    if args.compact_journal:
+        compact_journal(output_path)
+        if store_suffix:
+            export_puzzles_json(output_path, json_path)
+        return
+
+    if args.serve is not None:
+        serve(output_path, host=args.serve_host, port=args.serve)
+        return
+
+    if args.solved_by is not None:
+        if store_suffix != SQLITE_SUFFIX:
+            logger.error("--solved-by needs the SQLite store (--sqlite)")
+            return
+        if os.path.exists(journal_path(output_path)):
+            logger.warning(f"Changes still in {journal_path(output_path)} are not included; run --compact-journal first")
+        solved = puzzles_solved_by(output_path, args.solved_by)
+        logger.info(f"{args.solved_by} is on {len(solved)} leaderboard(s)")
+        for row in solved:
+            logger.info(f"  #{row['rank']:<5} {row['date_text']}: {row['name']}")
+        return
+
     if args.backfill_archives:
         logger.info(
             f"Running archive backfill (last {args.backfill_months} month(s))"
         )
-        from .jane.aggregator import build_stats, save_stats
         puzzles = load_puzzles_list(output_path)
         if not puzzles:
             logger.error(
                 f"No existing data at {output_path}. Run with --full first."
             )
             return
-        session = build_session()
+        session = build_session(pool_size=args.workers)
         late_by_puzzle = backfill_archives(
             session, puzzles, timeout=args.timeout, months=args.backfill_months,
+            workers=args.workers,
         )
         if late_by_puzzle:
             total_late = sum(len(v) for v in late_by_puzzle.values())
@@ -104,14 +461,53 @@ def main():
                 logger.info(f"  {label}: +{len(names)} -> {names}")
         else:
             logger.info("No late solvers found in backfill window.")
-        save_puzzles_raw(output_path, puzzles)
-        stats = build_stats(puzzles)
-        save_stats(stats_path, stats)
+        if args.journal:
+            save_puzzles_journaled(output_path, puzzles)
+        else:
+            save_puzzles_raw(output_path, puzzles)
+        if store_suffix:
+            export_puzzles_json(output_path, json_path)
+        stats = build_stats(puzzles, backend=args.stats_backend, store_path=output_path)
+        save_stats(stats_path, stats, shard_dir=shard_dir)
+        save_profile_index(profile_dir, puzzles)
+        logger.info(freeze.summary())
+        if http_cache:
+            logger.info(http_cache.summary())
+        if limiter:
+            logger.info(limiter.summary())
+        logger.info(get_connection_stats().summary())
+        logger.info(breaker.summary())
         return
 
-    if args.full:
-        logger.info("Running full archive scrape")
-        puzzles = scrape_all(
+    if args.watch:
+        def on_change(puzzles):
+            if store_suffix:
+                export_puzzles_json(output_path, json_path)
+            save_profile_index(profile_dir, puzzles)
+
+        watcher = Watcher(
+            base_url=base_url,
+            output_path=output_path,
+            stats_path=stats_path,
+            timeout=args.timeout,
+            state_path=args.stats_state or None,
+            shard_dir=shard_dir,
+            workers=args.workers,
+            stats_backend=args.stats_backend,
+            journal=args.journal,
+            schedule=PollSchedule(args.watch_min_interval, args.watch_max_interval),
+            on_change=on_change,
+        )
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            logger.info("Stopping watch")
+        logger.info(watcher.summary())
+        logger.info(freeze.summary())
+    elif args.full:
+        logger.info(f"Running full archive scrape ({args.engine} engine)")
+        scrape = scrape_all_async if args.engine == "async" else scrape_all
+        puzzles = scrape(
             base_url=base_url,
             max_pages=args.max_pages,
             output_path=output_path,
@@ -119,8 +515,12 @@ def main():
             workers=args.workers,
             timeout=args.timeout,
         )
-        stats = build_stats([p.to_dict() if hasattr(p, "to_dict") else p for p in puzzles])
-        save_stats(stats_path, stats)
+        if store_suffix:
+            export_puzzles_json(output_path, json_path)
+        puzzle_dicts = [p.to_dict() if hasattr(p, "to_dict") else p for p in puzzles]
+        stats = build_stats(puzzle_dicts, backend=args.stats_backend, store_path=output_path)
+        save_stats(stats_path, stats, shard_dir=shard_dir)
+        save_profile_index(profile_dir, puzzle_dicts)
         logger.info(f"Saved leaderboard stats to {stats_path}")
     else:
         logger.info("Running lightweight current-puzzle update")
@@ -129,11 +529,29 @@ def main():
             output_path=output_path,
             stats_path=stats_path,
             timeout=args.timeout,
+            state_path=args.stats_state or None,
+            shard_dir=shard_dir,
+            workers=args.workers,
+            stats_backend=args.stats_backend,
+            journal=args.journal,
         )
+        if store_suffix:
+            export_puzzles_json(output_path, json_path)
+        if puzzles:
+            save_profile_index(profile_dir, puzzles)
+
+        logger.info(freeze.summary())
 
         # Send daily email notification
         send_notification(notification)
 
+    if http_cache:
+        logger.info(http_cache.summary())
+    if limiter:
+        logger.info(limiter.summary())
+    logger.info(get_connection_stats().summary())
+    logger.info(breaker.summary())
+
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import functools
-import json
+import hashlib
 import os
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from loguru import logger
+
+from .metrics import laps, timed
+from .search import SEARCH_DIR, fnv1a_bucket, save_search_index
+from .writers import prune_directory, write_json, write_json_body
 
 
 @functools.lru_cache(maxsize=256)
@@ -22,7 +28,36 @@ def _format_month_year(dt: datetime) -> str:
     return dt.strftime("%b %Y")
 
 
-def build_stats(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
+STATS_BACKENDS = ("python", "numpy", "sqlite")
+
+
+@timed("build_stats")
+def build_stats(
+    puzzles: Iterable[Dict[str, Any]],
+    backend: str = "python",
+    store_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Leaderboard statistics for `puzzles`. With the sqlite backend and
+    `store_path` a SQLite store holding exactly `puzzles` (just saved, no
+    journal pending), the database is aggregated in place rather than
+    copied into an in-memory one.
+    """
+    if backend == "numpy":
+        try:
+            from .vectorized import build_stats_numpy
+        except ImportError:
+            logger.warning("NumPy is not installed; using the pure-Python stats backend")
+        else:
+            return build_stats_numpy(puzzles)
+    if backend == "sqlite":
+        from .sqlite_store import build_stats_from_db, build_stats_sqlite, is_sqlite_path
+        from .storage import journal_path
+        if store_path and is_sqlite_path(store_path) and not os.path.exists(journal_path(store_path)):
+            return build_stats_from_db(store_path)
+        return build_stats_sqlite(puzzles)
+
+    sections = laps("build_stats")
     solver_map: Dict[str, Dict[str, Any]] = {}
     all_months = set()
 
@@ -58,6 +93,8 @@ def build_stats(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
             if puzzle_date > _parse_date(solver["lastSolve"]):
                 solver["lastSolve"] = puzzle.get("date_text", "N/A")
 
+    sections.lap("solvers")
+
     # Top solvers by solve count
     top_solvers = sorted(solver_map.values(), key=lambda s: s["puzzlesSolved"], reverse=True)
 
@@ -93,6 +130,7 @@ def build_stats(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
         ]
     )
     longest_streaks = sorted(longest_streaks, key=lambda s: s["length"], reverse=True)[:20]
+    sections.lap("streaks")
 
     # Rising stars
     now = datetime.now(timezone.utc)
@@ -112,6 +150,7 @@ def build_stats(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
                 }
             )
     rising_stars = sorted(rising_stars, key=lambda s: s["solveRate"], reverse=True)[:20]
+    sections.lap("rising_stars")
 
     # Monthly participation
     sorted_months = sorted(list(all_months), key=lambda m: _parse_date(m))
@@ -124,6 +163,7 @@ def build_stats(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
     for month in sampled_months:
         solvers_count = sum(1 for solver in solver_map.values() if month in solver["monthlyActivity"])
         monthly_participation.append({"month": month, "solvers": solvers_count})
+    sections.lap("participation")
 
     # Solvers growth (cumulative new solvers per month)
     new_solvers_by_month: Dict[str, int] = {}
@@ -138,6 +178,7 @@ def build_stats(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
         solvers_growth.append({"month": month, "totalSolvers": total})
     if solvers_growth:
         solvers_growth[-1]["totalSolvers"] = len(solver_map)
+    sections.lap("growth")
 
     most_solved_puzzles = (
         sorted(
@@ -162,9 +203,10 @@ def build_stats(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
 
     # Current puzzle progress (timestamp-based timeline)
     current_puzzle_progress = _build_current_puzzle_progress(sorted_puzzles)
+    sections.lap("summary")
 
     return {
-        "totalPuzzles": len(puzzles),
+        "totalPuzzles": len(sorted_puzzles),
         "uniqueSolvers": len(solver_map),
         "solverDistribution": {
             "onePuzzle": one_puzzle,
@@ -210,9 +252,195 @@ def _build_current_puzzle_progress(
     return None
 
 
-def save_stats(file_path: str, stats: Dict[str, Any]) -> None:
-    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(stats, f, indent=2)
+# Sharded output: a small summary (cards, charts, first solvers) for first
+# paint, plus fixed-size topSolvers pages the frontend fetches on demand.
+STATS_PAGE_SIZE = 1000
+SUMMARY_TOP_SOLVERS = 100
+TOP_SOLVERS_SHARD_DIR = "top-solvers"
+
+
+def shard_stats(
+    stats: Dict[str, Any],
+    page_size: int = STATS_PAGE_SIZE,
+    summary_top: int = SUMMARY_TOP_SOLVERS,
+) -> Dict[str, Any]:
+    """
+    Split stats into {relative_path: payload}. `summary.json` carries every
+    field with `topSolvers` cut to `summary_top`; pages hold the full list.
+    """
+    top_solvers = stats.get("topSolvers") or []
+    summary = {**stats, "topSolvers": top_solvers[:summary_top], "topSolversTotal": len(top_solvers)}
+    shards: Dict[str, Any] = {"summary.json": summary}
+    for page, offset in enumerate(range(0, len(top_solvers), page_size), start=1):
+        shards[f"{TOP_SOLVERS_SHARD_DIR}/page-{page:04d}.json"] = {
+            "offset": offset,
+            "topSolvers": top_solvers[offset:offset + page_size],
+        }
+    return shards
+
+
+@timed("write.stats_shards")
+def save_stats_shards(
+    directory: str,
+    stats: Dict[str, Any],
+    page_size: int = STATS_PAGE_SIZE,
+    summary_top: int = SUMMARY_TOP_SOLVERS,
+) -> Dict[str, Any]:
+    """
+    Write shards, the solver-name search index (see `search`) and a
+    `manifest.json` with counts and content hashes; return the manifest.
+    """
+    shards = shard_stats(stats, page_size=page_size, summary_top=summary_top)
+    entries: Dict[str, Dict[str, Any]] = {}
+    for rel_path, payload in shards.items():
+        # Shards are fetched by browsers, so skip the indentation. Hash what
+        # is on disk: an unchanged summary keeps its old generatedAt.
+        body, _ = write_json_body(os.path.join(directory, rel_path), payload, compact=True)
+        entries[rel_path] = {"bytes": len(body), "sha256": hashlib.sha256(body).hexdigest()}
+
+    # Drop pages left over from a run with more solvers.
+    prune_directory(
+        os.path.join(directory, TOP_SOLVERS_SHARD_DIR),
+        [os.path.basename(path) for path in entries if path.startswith(f"{TOP_SOLVERS_SHARD_DIR}/")],
+    )
 
+    search = save_search_index(
+        os.path.join(directory, SEARCH_DIR), [solver["name"] for solver in stats.get("topSolvers") or []],
+    )
 
+    pages = [path for path in shards if path != "summary.json"]
+    manifest = {
+        "generatedAt": stats.get("generatedAt"),
+        "topSolversTotal": len(stats.get("topSolvers") or []),
+        "pageSize": page_size,
+        "summaryTopSolvers": summary_top,
+        "summary": {"path": "summary.json", **entries["summary.json"]},
+        "topSolverPages": [
+            {"path": path, "offset": shards[path]["offset"], "count": len(shards[path]["topSolvers"]), **entries[path]}
+            for path in pages
+        ],
+        "search": {"path": f"{SEARCH_DIR}/manifest.json", "names": search["names"]},
+    }
+    write_json(os.path.join(directory, "manifest.json"), manifest)
+    return manifest
+
+
+@timed("write.stats")
+def save_stats(file_path: str, stats: Dict[str, Any], shard_dir: Optional[str] = None) -> None:
+    if not write_json(file_path, stats):
+        logger.info(f"{file_path} unchanged apart from generatedAt; skipped write")
+    if shard_dir:
+        save_stats_shards(shard_dir, stats)
+
+
+# Per-solver profile index: solvers are spread over PROFILE_BUCKETS files by
+# `search.fnv1a_bucket` of the name (mirrored in the frontend), so a profile costs
+# one small request instead of downloading data.json.
+PROFILE_BUCKETS = 256
+
+
+def profile_bucket(name: str, buckets: int = PROFILE_BUCKETS) -> int:
+    return fnv1a_bucket(name, buckets)
+
+
+def _month_streaks(months: List[datetime]) -> List[Dict[str, Any]]:
+    """Runs of >= 2 consecutive months, longest first (same shape as stats.json)."""
+    streaks: List[Dict[str, Any]] = []
+    start = 0
+    for i in range(1, len(months) + 1):
+        if i == len(months) or (
+            (months[i].year - months[i - 1].year) * 12 + months[i].month - months[i - 1].month != 1
+        ):
+            if i - start >= 2:
+                streaks.append({
+                    "start": _format_month_year(months[start]),
+                    "end": _format_month_year(months[i - 1]),
+                    "length": i - start,
+                })
+            start = i
+    streaks.sort(key=lambda s: s["length"], reverse=True)
+    return streaks
+
+
+def build_profile_index(
+    puzzles: List[Dict[str, Any]],
+    buckets: int = PROFILE_BUCKETS,
+) -> Tuple[Dict[str, Any], List[Dict[str, Dict[str, Any]]]]:
+    """
+    Build (manifest, bucket_contents) in one pass over the puzzles.
+
+    Each profile lists `solves` as [puzzle_index, rank] (plus the first-seen
+    timestamp when known), newest first, with rank the 1-based position in
+    the puzzle's solver list; puzzle metadata lives once in the manifest, so
+    counts and first/last solve are read off `solves` rather than stored.
+    """
+    sorted_puzzles = sorted(puzzles, key=lambda p: _parse_date(p.get("date_text", "")), reverse=True)
+    bucket_contents: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(buckets)]
+    months_by_solver: Dict[str, List[datetime]] = {}
+
+    for idx, puzzle in enumerate(sorted_puzzles):
+        puzzle_date = _parse_date(puzzle.get("date_text", ""))
+        timestamps = puzzle.get("solver_timestamps") or {}
+        seen = set()
+        for rank, name in enumerate(puzzle.get("solvers") or [], start=1):
+            if name in seen:
+                continue  # duplicate listing; placement is the first one
+            seen.add(name)
+            bucket = bucket_contents[profile_bucket(name, buckets)]
+            profile = bucket.get(name)
+            if profile is None:
+                profile = bucket[name] = {"solves": []}
+                months_by_solver[name] = []
+            solve: List[Any] = [idx, rank]
+            if name in timestamps:
+                solve.append(timestamps[name])
+                first_seen = profile.get("firstSeen")
+                if first_seen is None or timestamps[name] < first_seen:
+                    profile["firstSeen"] = timestamps[name]
+            profile["solves"].append(solve)
+            months = months_by_solver[name]
+            if not months or months[-1] != puzzle_date:
+                months.append(puzzle_date)
+
+    for bucket in bucket_contents:
+        for name, profile in bucket.items():
+            months = sorted(months_by_solver[name])
+            profile["monthlyActivity"] = [_format_month_year(m) for m in months]
+            profile["streaks"] = _month_streaks(months)
+
+    manifest = {
+        "hash": "fnv1a32-utf8",
+        "buckets": buckets,
+        "puzzles": [
+            {
+                "date_text": p.get("date_text", ""),
+                "name": p.get("name", "Unknown"),
+                "solution_url": p.get("solution_url", ""),
+                "solvers": len(p.get("solvers") or []),
+            }
+            for p in sorted_puzzles
+        ],
+    }
+    return manifest, bucket_contents
+
+
+@timed("write.profile_index")
+def save_profile_index(
+    directory: str,
+    puzzles: List[Dict[str, Any]],
+    buckets: int = PROFILE_BUCKETS,
+) -> Dict[str, Any]:
+    """Write one file per bucket plus `manifest.json` (with per-bucket content hashes)."""
+    manifest, bucket_contents = build_profile_index(puzzles, buckets=buckets)
+    files = []
+    for bucket, contents in enumerate(bucket_contents):
+        path = f"buckets/{bucket:03d}.json"
+        body, _ = write_json_body(os.path.join(directory, path), contents, compact=True, ensure_ascii=False)
+        files.append({"path": path, "sha256": hashlib.sha256(body).hexdigest()})
+
+    prune_directory(os.path.join(directory, "buckets"), [os.path.basename(f["path"]) for f in files])
+
+    manifest["files"] = files
+    manifest["generatedAt"] = datetime.now(timezone.utc).isoformat()
+    write_json(os.path.join(directory, "manifest.json"), manifest, ensure_ascii=False)
+    return manifest
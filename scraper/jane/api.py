@@ -0,0 +1,354 @@
+"""
+Local read API over the puzzle data.
+
+`StatsIndex` is built once per version of the puzzle store, from
+`aggregator.build_stats` plus the puzzle list:
+
+    ranking   topSolvers rows in `build_stats` order (the rank array)
+    rank_of   solver name -> position in `ranking`
+    by_month  "YYYY-MM" -> puzzles of that month, solvers in leaderboard order
+    months    sorted month keys, bisected for windowed queries
+    flat      solver ids (ranking positions) of every solve, newest month
+              first, so any window of months is one contiguous slice
+
+`serve` exposes it over HTTP (stdlib `ThreadingHTTPServer`, JSON bodies):
+
+    GET /api/summary                                  stats.json minus topSolvers
+    GET /api/solvers?offset=0&limit=50                page of the ranking
+    GET /api/solvers/<name>                           rank, counts and months solved
+    GET /api/puzzles                                  months with puzzle names and counts
+    GET /api/puzzles/<YYYY-MM>?offset=0&limit=100     a month's solver lists
+    GET /api/top?since=YYYY-MM&until=YYYY-MM&limit=50 ranking over a window of months
+
+Every response carries an ETag derived from the data fingerprint and the
+request, so `If-None-Match` gets a 304 without rendering anything. The
+store's mtime and size (and its journal's) are checked at most every
+`reload_interval` seconds; when they change, a new index is built and
+swapped in while the old one keeps serving; a store that fails to load
+leaves the old index in place.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import heapq
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from operator import itemgetter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from loguru import logger
+
+from .aggregator import STATS_PAGE_SIZE, _parse_date, build_stats
+from .incremental import puzzles_fingerprint
+from .storage import _read_puzzles, journal_path, load_puzzles_list
+from .writers import encode_json
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = STATS_PAGE_SIZE
+RESPONSE_CACHE_SIZE = 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def month_key(date_text: str) -> str:
+    dt = _parse_date(date_text)
+    return f"{dt.year:04d}-{dt.month:02d}"
+
+
+def _int_param(query: Dict[str, List[str]], name: str, default: int, maximum: Optional[int] = None) -> int:
+    raw = query.get(name, [None])[0]
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    if value < 0:
+        raise ApiError(400, f"{name} must not be negative")
+    return min(value, maximum) if maximum is not None else value
+
+
+def _month_param(query: Dict[str, List[str]], name: str) -> Optional[str]:
+    raw = query.get(name, [None])[0]
+    if not raw:
+        return None
+    try:
+        year, month = raw.split("-")
+        return f"{int(year):04d}-{int(month):02d}"
+    except ValueError:
+        raise ApiError(400, f"{name} must look like YYYY-MM")
+
+
+class StatsIndex:
+    """Query structures for one version of the puzzle list."""
+
+    def __init__(self, puzzles: List[Dict[str, Any]]):
+        self.fingerprint = puzzles_fingerprint(puzzles)
+        stats = build_stats(puzzles)
+        self.ranking: List[Dict[str, Any]] = stats.pop("topSolvers")
+        self.summary = {**stats, "topSolversTotal": len(self.ranking)}
+        self.rank_of: Dict[str, int] = {row["name"]: i for i, row in enumerate(self.ranking)}
+
+        self.by_month: Dict[str, List[Dict[str, Any]]] = {}
+        for puzzle in puzzles:
+            self.by_month.setdefault(month_key(puzzle.get("date_text", "")), []).append(puzzle)
+        self.months: List[str] = sorted(self.by_month)
+
+        # Months each solver appears in, oldest first.
+        self.solved: Dict[str, List[str]] = {}
+        for month in self.months:
+            for puzzle in self.by_month[month]:
+                for name in puzzle.get("solvers") or []:
+                    self.solved.setdefault(name, []).append(month)
+
+        self.flat: List[int] = []
+        self._begin = [0] * len(self.months)
+        self._end = [0] * len(self.months)
+        for i in reversed(range(len(self.months))):
+            self._begin[i] = len(self.flat)
+            for puzzle in self.by_month[self.months[i]]:
+                self.flat.extend(self.rank_of[name] for name in puzzle.get("solvers") or [])
+            self._end[i] = len(self.flat)
+
+        self._windows: "OrderedDict[Tuple[Optional[str], Optional[str]], Counter]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _page(self, rows: List[Any], offset: int, limit: int) -> Dict[str, Any]:
+        return {"total": len(rows), "offset": offset, "limit": limit, "items": rows[offset:offset + limit]}
+
+    def top_solvers(self, offset: int, limit: int) -> Dict[str, Any]:
+        page = self._page(self.ranking, offset, limit)
+        page["items"] = [{"rank": offset + i + 1, **row} for i, row in enumerate(page["items"])]
+        return page
+
+    def solver(self, name: str) -> Dict[str, Any]:
+        rank = self.rank_of.get(name)
+        if rank is None:
+            raise ApiError(404, f"No solver named {name!r}")
+        return {"rank": rank + 1, **self.ranking[rank], "months": self.solved.get(name, [])}
+
+    def puzzle_months(self) -> Dict[str, Any]:
+        return {
+            "months": [
+                {
+                    "month": month,
+                    "puzzles": [
+                        {"name": p.get("name", ""), "solvers": len(p.get("solvers") or [])}
+                        for p in self.by_month[month]
+                    ],
+                }
+                for month in reversed(self.months)
+            ]
+        }
+
+    def puzzles(self, month: str, offset: int, limit: int) -> Dict[str, Any]:
+        entries = self.by_month.get(month)
+        if entries is None:
+            raise ApiError(404, f"No puzzle for {month}")
+        return {
+            "month": month,
+            "puzzles": [
+                {
+                    "name": p.get("name", ""),
+                    "date_text": p.get("date_text", ""),
+                    "solution_url": p.get("solution_url", ""),
+                    **self._page(p.get("solvers") or [], offset, limit),
+                }
+                for p in entries
+            ],
+        }
+
+    def _window(self, since: Optional[str], until: Optional[str]) -> Counter:
+        """Solve counts by solver id over the months in [since, until], in first-seen (newest first) order."""
+        key = (since, until)
+        with self._lock:
+            if key in self._windows:
+                self._windows.move_to_end(key)
+                return self._windows[key]
+        lo = bisect.bisect_left(self.months, since) if since else 0
+        hi = bisect.bisect_right(self.months, until) if until else len(self.months)
+        counts = Counter(self.flat[self._begin[hi - 1]:self._end[lo]] if hi > lo else [])
+        with self._lock:
+            self._windows[key] = counts
+            if len(self._windows) > RESPONSE_CACHE_SIZE:
+                self._windows.popitem(last=False)
+        return counts
+
+    def top_in_window(self, since: Optional[str], until: Optional[str], offset: int, limit: int) -> Dict[str, Any]:
+        counts = self._window(since, until)
+        # nlargest is sorted()[:n], ties included, so ties keep `build_stats`' order.
+        top = heapq.nlargest(offset + limit, counts.items(), key=itemgetter(1))[offset:]
+        return {
+            "since": since, "until": until, "total": len(counts), "offset": offset, "limit": limit,
+            "items": [
+                {"rank": offset + i + 1, "name": self.ranking[sid]["name"], "puzzlesSolved": count}
+                for i, (sid, count) in enumerate(top)
+            ],
+        }
+
+    def query(self, parts: List[str], query: Dict[str, List[str]]) -> Any:
+        """Route a request (unquoted path segments plus query) to its query method."""
+        if parts[:1] != ["api"]:
+            raise ApiError(404, "Not found")
+        parts = parts[1:]
+        if parts == ["summary"]:
+            return self.summary
+        if parts == ["solvers"]:
+            return self.top_solvers(
+                _int_param(query, "offset", 0), _int_param(query, "limit", DEFAULT_LIMIT, MAX_LIMIT),
+            )
+        if len(parts) == 2 and parts[0] == "solvers":
+            return self.solver(parts[1])
+        if parts == ["puzzles"]:
+            return self.puzzle_months()
+        if len(parts) == 2 and parts[0] == "puzzles":
+            month = _month_param({"month": [parts[1]]}, "month")
+            return self.puzzles(month, _int_param(query, "offset", 0), _int_param(query, "limit", 100, MAX_LIMIT))
+        if parts == ["top"]:
+            return self.top_in_window(
+                _month_param(query, "since"), _month_param(query, "until"),
+                _int_param(query, "offset", 0), _int_param(query, "limit", DEFAULT_LIMIT, MAX_LIMIT),
+            )
+        raise ApiError(404, "Not found")
+
+
+class IndexHolder:
+    """Keeps the current `StatsIndex` for `data_path`, rebuilding it when the store changes."""
+
+    def __init__(self, data_path: str, reload_interval: float = 1.0):
+        self.data_path = data_path
+        self.reload_interval = reload_interval
+        self.counters: Dict[str, int] = {"requests": 0, "not_modified": 0, "cache_hits": 0, "reloads": 0}
+        self._version: Optional[Tuple[Any, ...]] = None
+        self._checked = 0.0
+        self._responses: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self.index = self._load(load_puzzles_list)
+
+    def _stat(self) -> Tuple[Any, ...]:
+        version: List[Any] = []
+        for path in (self.data_path, journal_path(self.data_path)):
+            try:
+                st = os.stat(path)
+                version.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    def _load(self, read) -> StatsIndex:
+        self._version = self._stat()
+        started = time.perf_counter()
+        index = StatsIndex(read(self.data_path))
+        logger.info(
+            f"Indexed {len(index.ranking)} solvers across {len(index.months)} months "
+            f"from {self.data_path} in {time.perf_counter() - started:.2f}s"
+        )
+        return index
+
+    def current(self) -> StatsIndex:
+        now = time.monotonic()
+        if now - self._checked < self.reload_interval:
+            return self.index
+        self._checked = now
+        if self._stat() == self._version or not self._reload_lock.acquire(blocking=False):
+            return self.index
+        try:
+            # `_read_puzzles` raises where `load_puzzles_list` would hand back
+            # an empty list, so a store caught mid-write or broken keeps the
+            # previous index serving instead of replacing it with nothing.
+            index = self._load(_read_puzzles)
+            with self._lock:
+                self.index = index
+                self._responses.clear()
+            self.counters["reloads"] += 1
+        except Exception as exc:
+            logger.warning(f"Failed to reload {self.data_path}; still serving the previous data: {exc}")
+        finally:
+            self._reload_lock.release()
+        return self.index
+
+    def respond(self, target: str, if_none_match: Optional[str]) -> Tuple[int, Optional[str], bytes]:
+        """(status, etag, body) for a GET of `target` (path plus query string)."""
+        index = self.current()
+        etag = '"' + hashlib.sha1(f"{index.fingerprint}\x00{target}".encode("utf-8")).hexdigest()[:20] + '"'
+        with self._lock:
+            self.counters["requests"] += 1
+            if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+                self.counters["not_modified"] += 1
+                return 304, etag, b""
+            cached = self._responses.get(etag)
+            if cached is not None:
+                self._responses.move_to_end(etag)
+                self.counters["cache_hits"] += 1
+                return cached[0], etag, cached[1]
+        url = urlsplit(target)
+        try:
+            parts = [unquote(part) for part in url.path.split("/") if part]
+            status, body = 200, index.query(parts, parse_qs(url.query))
+        except ApiError as exc:
+            status, body = exc.status, {"error": str(exc)}
+        payload = encode_json(body, compact=True, ensure_ascii=False)
+        with self._lock:
+            self._responses[etag] = (status, payload)
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return status, etag, payload
+
+    def summary(self) -> str:
+        c = self.counters
+        return (
+            f"API: {c['requests']} request(s), {c['not_modified']} not modified, "
+            f"{c['cache_hits']} served from cache, {c['reloads']} reload(s)"
+        )
+
+
+def make_server(holder: IndexHolder, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; don't let Nagle hold the body back.
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            status, etag, body = holder.respond(self.path, self.headers.get("If-None-Match"))
+            self.send_response(status)
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            if status != 304:
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    return httpd
+
+
+def serve(data_path: str, host: str = "127.0.0.1", port: int = 8000, reload_interval: float = 1.0) -> None:
+    """Serve the read API for `data_path` until interrupted."""
+    holder = IndexHolder(data_path, reload_interval=reload_interval)
+    httpd = make_server(holder, host, port)
+    logger.info(f"Serving the read API for {data_path} on http://{host}:{httpd.server_address[1]}/api/")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping API server")
+    finally:
+        httpd.server_close()
+        logger.info(holder.summary())
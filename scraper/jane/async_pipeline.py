@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import List, Dict, Any, Optional, Tuple
+
+from loguru import logger
+
+from .client import fetch_html, build_session, is_upstream_failure, DEFAULT_TIMEOUT
+from .models import Puzzle, PuzzleMeta
+from .parsers import parse_archive_page
+from .pipeline import (
+    archive_page_url, enrich_or_reuse, finalize_full_scrape, is_settled, split_page_metas, stored_remainder,
+)
+from .storage import load_existing
+
+# Archive pages kept in flight ahead of the one being consumed. The page past
+# the end comes back empty while earlier pages are still being enriched, so
+# the last page is found without a sequential probe.
+PAGE_LOOKAHEAD = 4
+
+
+class BoundedSession:
+    """
+    Session proxy that caps in-flight GETs across every thread using it, so
+    page fetches and leaderboard fan-out share one global concurrency budget.
+    """
+
+    def __init__(self, session, limit: int):
+        self._session = session
+        self._slots = threading.BoundedSemaphore(max(1, limit))
+
+    def get(self, *args, **kwargs):
+        with self._slots:
+            return self._session.get(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+def _fetch_page_metas(session, page_url: str, timeout: int) -> Tuple[List[PuzzleMeta], Optional[Exception]]:
+    # Errors are returned rather than logged: speculative pages past the end
+    # of the archive are expected to fail and are never consumed.
+    try:
+        html = fetch_html(session, page_url, timeout=timeout)
+        return parse_archive_page(html), None
+    except Exception as exc:  # pragma: no cover - network/HTML errors
+        return [], exc
+
+
+async def _scrape_pages(
+    session,
+    base_url: str,
+    max_pages: Optional[int],
+    existing: Dict[str, Dict[str, Any]],
+    timeout: int,
+    workers: int,
+    lookahead: int,
+    reuse_settled: bool = False,
+    stored: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Puzzle]:
+    loop = asyncio.get_running_loop()
+    # Threads only wait on the semaphore beyond `workers`; size the pool so
+    # queued enrich jobs never starve the page fetches.
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers + lookahead)
+
+    def run(fn, *args):
+        return loop.run_in_executor(executor, fn, *args)
+
+    page_tasks: Dict[int, asyncio.Future] = {}
+
+    def schedule_through(last: int) -> None:
+        for n in range(1, last + 1):
+            if n not in page_tasks and not (max_pages and n > max_pages):
+                page_tasks[n] = run(_fetch_page_metas, session, archive_page_url(base_url, n), timeout)
+
+    pages: List[Tuple[List[Puzzle], List[asyncio.Future]]] = []
+    page_num = 1
+    settled = degraded = False
+    try:
+        while True:
+            schedule_through(page_num + lookahead)
+            page_url = archive_page_url(base_url, page_num)
+            logger.info(f"Scraping page {page_num} at {page_url}")
+            metas, error = await page_tasks[page_num]
+            if error is not None:
+                logger.error(f"Error processing page {page_url}: {error}")
+            if not metas:
+                degraded = error is not None and is_upstream_failure(error)
+                break
+
+            ready, to_enrich = split_page_metas(metas, existing)
+            enrich_jobs = [
+                run(enrich_or_reuse, session, meta, existing_entry, timeout, reuse_settled)
+                for meta, existing_entry in to_enrich
+            ]
+            logger.info(f"Found {len(ready) + len(to_enrich)} puzzles on page {page_num}")
+            pages.append((ready, enrich_jobs))
+
+            settled = all(is_settled(meta, existing.get(f"{meta.date_text}_{meta.name}")) for meta in metas)
+            if settled:
+                logger.info(f"Page {page_num} is fully settled; reusing stored puzzles for the rest")
+                break
+
+            if max_pages and page_num >= max_pages:
+                break
+            page_num += 1
+
+        all_puzzles: List[Puzzle] = []
+        for ready, enrich_jobs in pages:
+            all_puzzles.extend(ready)
+            all_puzzles.extend(await asyncio.gather(*enrich_jobs))
+        if settled:
+            all_puzzles.extend(stored_remainder(existing, {f"{p.date_text}_{p.name}" for p in all_puzzles}))
+        elif degraded:
+            # Don't truncate the archive because the site is down.
+            rest = stored_remainder(
+                existing if stored is None else stored, {f"{p.date_text}_{p.name}" for p in all_puzzles},
+            )
+            logger.warning(f"Archive unavailable; keeping {len(rest)} stored puzzle(s) for the rest")
+            all_puzzles.extend(rest)
+        return all_puzzles
+    finally:
+        for task in page_tasks.values():
+            task.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def scrape_all_async(
+    base_url: str,
+    max_pages: Optional[int],
+    output_path: str,
+    force_refresh: bool = False,
+    workers: int = 10,
+    timeout: int = DEFAULT_TIMEOUT,
+    lookahead: int = PAGE_LOOKAHEAD,
+) -> List[Puzzle]:
+    """
+    Drop-in replacement for `pipeline.scrape_all` that pipelines archive pages:
+    pages N+1..N+lookahead download while page N's puzzles are enriched, all
+    under one `workers`-wide request budget. Output is identical, including
+    the stop at the first fully settled page.
+    """
+    session = BoundedSession(build_session(pool_size=workers), workers)
+    stored = load_existing(output_path, lazy=True)
+    existing = {} if force_refresh else stored
+
+    logger.info(f"Starting async full scrape from {base_url} (max_pages={max_pages or 'all'})")
+    logger.info(f"Using {len(existing)} existing puzzles as reference")
+
+    all_puzzles = asyncio.run(
+        _scrape_pages(
+            session, base_url, max_pages, existing, timeout, workers, lookahead,
+            reuse_settled=not force_refresh, stored=stored,
+        )
+    )
+    return finalize_full_scrape(session, all_puzzles, output_path, timeout, force_refresh)
@@ -1,47 +1,543 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Tuple, Union
+
 import requests
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from urllib3.util.retry import Retry
-from typing import Optional
+
+from . import metrics
+from .ratelimit import AdaptiveLimiter
+from .replay import FixtureRecorder, FixtureReplayer
+from .writers import atomic_write
 
 DEFAULT_TIMEOUT = 10
+# Connections kept alive per host when the caller does not size the pool;
+# matches urllib3's default.
+DEFAULT_POOL_SIZE = 10
+
+# Leaderboard ids (and so their JSON URLs) start with the puzzle date.
+_URL_DATE_RE = re.compile(r"/(\d{4})-(\d{2})-\d{2}-[^/]*$")
+_SOLUTION_URL_RE = re.compile(r"-solution/?$")
+
+
+@dataclass
+class CachePolicy:
+    """
+    When a cached response may be served without contacting the server.
+
+    Solution pages only carry the leaderboard id, which never changes once
+    published. Leaderboards keep gaining late solvers for a while, so they
+    are only treated as immutable once `immutable_after_months` have passed
+    since the puzzle date (None: always revalidate).
+    """
+
+    immutable_after_months: Optional[int] = None
+    immutable_solution_pages: bool = True
+
+    def is_immutable(self, url: str, now: Optional[datetime] = None) -> bool:
+        if self.immutable_solution_pages and _SOLUTION_URL_RE.search(url):
+            return True
+        if self.immutable_after_months is None:
+            return False
+        match = _URL_DATE_RE.search(url)
+        if not match:
+            return False
+        now = now or datetime.now(timezone.utc)
+        age_months = (now.year - int(match.group(1))) * 12 + now.month - int(match.group(2))
+        return age_months > self.immutable_after_months
+
+
+class HttpCache:
+    """
+    On-disk response cache keyed by URL. Stores the body plus ETag /
+    Last-Modified validators; stale entries are revalidated with a
+    conditional GET and a 304 reuses the stored body.
+    """
+
+    def __init__(self, directory: str, policy: Optional[CachePolicy] = None):
+        self.directory = directory
+        self.policy = policy or CachePolicy()
+        self.counters: Dict[str, int] = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, digest[:2], digest)
+        return base + ".json", base + ".body"
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def load(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, body
+
+    def store(self, url: str, response: requests.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not (etag or last_modified or self.policy.is_immutable(url)):
+            return  # nothing to revalidate with and never served blind
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": response.headers.get("Content-Type"),
+            "encoding": response.encoding,
+            "stored_at": time.time(),
+        }
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # Body first, then metadata, each via rename, so a reader never pairs
+        # new metadata with a missing or partial body.
+        atomic_write(body_path, response.content)
+        atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+        self.count("stored")
+
+    def summary(self) -> str:
+        c = self.counters
+        return (
+            f"HTTP cache: {c['hits']} hit(s), {c['revalidated']} revalidated (304), "
+            f"{c['misses']} miss(es), {c['stored']} stored"
+        )
+
+
+def _cached_response(url: str, meta: Dict[str, Any], body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.headers = CaseInsensitiveDict({"Content-Type": meta.get("content_type") or ""})
+    response.encoding = meta.get("encoding")
+    return response
+
+
+_default_cache: Optional[HttpCache] = None
+
+
+def enable_http_cache(directory: str, policy: Optional[CachePolicy] = None) -> HttpCache:
+    """Attach an on-disk cache to every session built by `build_session` from now on."""
+    global _default_cache
+    _default_cache = HttpCache(directory, policy)
+    return _default_cache
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    return _default_cache
+
+
+class ConnectionStats:
+    """Connections opened vs requests sent by sessions from `build_session`."""
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {"opened": 0, "requests": 0}
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def summary(self) -> str:
+        c = self.counters
+        reused = max(0, c["requests"] - c["opened"])
+        return (
+            f"HTTP connections: {c['opened']} opened for {c['requests']} request(s), "
+            f"{reused} served over kept-alive connections"
+        )
+
+
+_connection_stats = ConnectionStats()
+
+
+def get_connection_stats() -> ConnectionStats:
+    return _connection_stats
+
+
+def _count_connection() -> None:
+    _connection_stats.count("opened")
+    metrics.count("http.connections")
+
+
+# Counted at connect() rather than when the pool creates a connection object:
+# urllib3 reconnects a pooled connection the server closed in place.
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self) -> None:
+        _count_connection()
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self) -> None:
+        _count_connection()
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """`HTTPAdapter` whose connection pools report to `ConnectionStats`."""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        _connection_stats.count("requests")
+        return super().send(request, *args, **kwargs)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the circuit breaker is open."""
 
 
-def _build_retry(total: int = 3) -> Retry:
+class CircuitBreaker:
+    """
+    Run-wide guard against a failing upstream.
+
+    A request fails when it raises or ends in a 429/5xx after its retries.
+    After `threshold` consecutive failures (0: never) the circuit opens and
+    every fetch raises `CircuitOpenError` at once; after `cooldown` seconds a
+    single probe request is let through and closes the circuit again if it
+    succeeds. Once `deadline` seconds have passed since the breaker was
+    created the circuit opens for good. Retries (urllib3's and the rate
+    limiter's) draw on one shared `retry_budget`; once it is spent requests
+    are still sent, but only once each.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 5,
+        cooldown: float = 30.0,
+        retry_budget: Optional[int] = 30,
+        deadline: Optional[float] = None,
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.retry_budget = retry_budget
+        self.deadline = deadline
+        self.started = time.monotonic()
+        self.consecutive = 0
+        self.opened_at: Optional[float] = None
+        self.reason = ""
+        self.counters: Dict[str, int] = {
+            "requests": 0, "failures": 0, "retries": 0, "short_circuited": 0, "trips": 0,
+        }
+        self._budget_base = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _trip(self, reason: str, now: float) -> None:
+        if self.opened_at is None:
+            self.counters["trips"] += 1
+        self.opened_at = now
+        self.reason = reason
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.opened_at is not None
+
+    def retries_exhausted(self) -> bool:
+        return self.retry_budget is not None and self.counters["retries"] - self._budget_base >= self.retry_budget
+
+    def renew(self) -> None:
+        """
+        Start a new run for a long-lived process (`--watch`): refill the retry
+        budget, restart the deadline clock and lift a deadline trip.
+        """
+        with self._lock:
+            self._budget_base = self.counters["retries"]
+            self.started = time.monotonic()
+            if self.reason == "deadline":
+                self.opened_at = None
+
+    def before(self) -> bool:
+        """
+        Raise `CircuitOpenError` unless a request may be sent now. Returns
+        True for the half-open probe, which must be handed back to `record`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.deadline is not None and now - self.started >= self.deadline:
+                self._trip("deadline", now)
+            if self.opened_at is not None:
+                cooled = now - self.opened_at >= self.cooldown
+                if self.reason == "failures" and cooled and not self._probing:
+                    self._probing = True  # half-open: this request decides
+                    self.counters["requests"] += 1
+                    return True
+                self.counters["short_circuited"] += 1
+                raise CircuitOpenError(f"Circuit open ({self.reason}); skipping request")
+            self.counters["requests"] += 1
+            return False
+
+    def take_retry(self) -> bool:
+        """Spend one retry from the budget; False once it is exhausted."""
+        with self._lock:
+            if self.retries_exhausted():
+                return False
+            self.counters["retries"] += 1
+            return True
+
+    def record(self, ok: bool, retries: int = 0, probe: bool = False) -> None:
+        """
+        Record the outcome of a request that `before` let through; `probe` is
+        what `before` returned for it. Only the probe decides a half-open
+        circuit: requests already in flight when it tripped land here too.
+        """
+        with self._lock:
+            self.counters["retries"] += retries
+            if probe:
+                self._probing = False
+            if ok:
+                self.consecutive = 0
+                if probe and self.reason == "failures":
+                    self.opened_at = None
+                return
+            self.counters["failures"] += 1
+            self.consecutive += 1
+            if probe or (self.opened_at is None and self.threshold and self.consecutive >= self.threshold):
+                self._trip("failures", time.monotonic())
+
+    def summary(self) -> str:
+        c = self.counters
+        state = f"open ({self.reason})" if self.opened_at is not None else "closed"
+        budget = "" if self.retry_budget is None else f" of {self.retry_budget}"
+        return (
+            f"Circuit breaker: {state}; {c['requests']} request(s), {c['failures']} failed, "
+            f"{c['retries'] - self._budget_base}{budget} retries used, {c['trips']} trip(s), "
+            f"{c['short_circuited']} request(s) short-circuited"
+        )
+
+
+_default_breaker: Optional[CircuitBreaker] = None
+
+
+def enable_circuit_breaker(breaker: CircuitBreaker) -> CircuitBreaker:
+    """Guard every session built by `build_session` from now on with `breaker`."""
+    global _default_breaker
+    _default_breaker = breaker
+    return _default_breaker
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    return _default_breaker
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """True if `exc` means the site is down or failing, rather than e.g. a 404 for a missing page."""
+    if isinstance(exc, requests.exceptions.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, requests.exceptions.RequestException)
+
+
+def circuit_open(session) -> bool:
+    """True if `session`'s circuit breaker is currently refusing requests."""
+    breaker: Optional[CircuitBreaker] = getattr(session, "circuit_breaker", None)
+    return breaker is not None and breaker.is_open()
+
+
+_default_limiter: Optional[AdaptiveLimiter] = None
+
+
+def enable_rate_limit(limiter: AdaptiveLimiter) -> AdaptiveLimiter:
+    """Route every session built by `build_session` from now on through `limiter`."""
+    global _default_limiter
+    _default_limiter = limiter
+    return _default_limiter
+
+
+def get_rate_limiter() -> Optional[AdaptiveLimiter]:
+    return _default_limiter
+
+
+_default_fixtures: Optional[Union[FixtureRecorder, FixtureReplayer]] = None
+
+
+def enable_fixtures(fixtures: Union[FixtureRecorder, FixtureReplayer]) -> Union[FixtureRecorder, FixtureReplayer]:
+    """Record (or replay) the traffic of every session built by `build_session` from now on."""
+    global _default_fixtures
+    _default_fixtures = fixtures
+    return fixtures
+
+
+def get_fixtures() -> Optional[Union[FixtureRecorder, FixtureReplayer]]:
+    return _default_fixtures
+
+
+def _build_retry(total: int = 3, retry_statuses: bool = True) -> Retry:
     return Retry(
         total=total,
         read=total,
         connect=total,
         backoff_factor=0.5,
-        status_forcelist=(429, 500, 502, 503, 504),
+        status_forcelist=(429, 500, 502, 503, 504) if retry_statuses else (),
         allowed_methods=frozenset(["GET", "HEAD"]),
         raise_on_status=False,
     )
 
 
-def build_session(retries: int = 3, user_agent: Optional[str] = None) -> requests.Session:
+def build_session(
+    retries: int = 3,
+    user_agent: Optional[str] = None,
+    pool_size: int = DEFAULT_POOL_SIZE,
+) -> requests.Session:
     """
-    Create a requests session with retry/backoff and sane defaults.
+    Create a requests session with retry/backoff and sane defaults. With a
+    rate limiter enabled, throttled responses are retried by the limiter
+    instead of urllib3 so that every attempt waits its turn.
+
+    `pool_size` is how many connections per host are kept alive, so size it
+    to the number of threads sharing the session: each concurrent request
+    beyond it opens (and handshakes) a connection that is then thrown away.
     """
     session = requests.Session()
-    adapter = HTTPAdapter(max_retries=_build_retry(retries))
+    adapter = PooledAdapter(
+        pool_maxsize=max(1, pool_size),
+        max_retries=_build_retry(retries, retry_statuses=_default_limiter is None),
+    )
+    if _default_fixtures is not None:
+        adapter = _default_fixtures.adapter(adapter)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
 
     headers = {"User-Agent": user_agent or "jspuzzle-scraper/1.0"}
     session.headers.update(headers)
+    session.http_cache = _default_cache
+    session.rate_limiter = _default_limiter
+    session.circuit_breaker = _default_breaker
     return session
 
 
+def _attempts(response: requests.Response) -> int:
+    retries = getattr(getattr(response, "raw", None), "retries", None)
+    return len(retries.history) if retries is not None and retries.history else 0
+
+
+def _budget_retries(session: requests.Session, exhausted: bool) -> None:
+    """Stop urllib3 retrying on `session` while the retry budget is spent; restore it once renewed."""
+    for adapter in session.adapters.values():
+        if getattr(adapter, "max_retries", None) is None:
+            continue
+        saved = getattr(adapter, "budgeted_retries", None)
+        if exhausted and saved is None and adapter.max_retries.total != 0:
+            adapter.budgeted_retries = adapter.max_retries
+            adapter.max_retries = _build_retry(0)
+        elif not exhausted and saved is not None:
+            adapter.max_retries = saved
+            adapter.budgeted_retries = None
+
+
+def _send_once(session: requests.Session, url: str, timeout: int, **kwargs) -> requests.Response:
+    response = session.get(url, timeout=timeout, **kwargs)
+    if metrics.get_profiler() is not None:
+        metrics.count("http.requests")
+        metrics.count(f"http.status.{response.status_code}")
+        metrics.count("http.bytes", len(response.content or b""))
+        if _attempts(response):
+            metrics.count("http.retries", _attempts(response))
+    return response
+
+
+def _send(session: requests.Session, url: str, timeout: int, **kwargs) -> requests.Response:
+    breaker: Optional[CircuitBreaker] = getattr(session, "circuit_breaker", None)
+    limiter: Optional[AdaptiveLimiter] = getattr(session, "rate_limiter", None)
+    if breaker is None:
+        if limiter is None:
+            return _send_once(session, url, timeout, **kwargs)
+        return limiter.call(lambda: _send_once(session, url, timeout, **kwargs))
+
+    _budget_retries(session, breaker.retries_exhausted())
+    probe = breaker.before()
+    try:
+        if limiter is None:
+            response = _send_once(session, url, timeout, **kwargs)
+        else:
+            response = limiter.call(lambda: _send_once(session, url, timeout, **kwargs), breaker.take_retry)
+    except requests.exceptions.RequestException:
+        # urllib3 gave up, so its retries were used up too.
+        adapter = session.get_adapter(url)
+        total = getattr(getattr(adapter, "max_retries", None), "total", 0)
+        breaker.record(False, retries=total if isinstance(total, int) else 0, probe=probe)
+        raise
+    failed = response.status_code == 429 or response.status_code >= 500
+    breaker.record(not failed, retries=_attempts(response), probe=probe)
+    return response
+
+
+def _get(session: requests.Session, url: str, timeout: int) -> requests.Response:
+    cache: Optional[HttpCache] = getattr(session, "http_cache", None)
+    if cache is None:
+        return _send(session, url, timeout)
+
+    cached = cache.load(url)
+    if cached is None:
+        response = _send(session, url, timeout)
+        if response.status_code == 200:
+            cache.count("misses")
+            cache.store(url, response)
+        return response
+
+    meta, body = cached
+    if cache.policy.is_immutable(url):
+        cache.count("hits")
+        return _cached_response(url, meta, body)
+
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    response = _send(session, url, timeout, headers=headers)
+    if response.status_code == 304:
+        cache.count("revalidated")
+        return _cached_response(url, meta, body)
+    if response.status_code == 200:
+        cache.count("misses")
+        cache.store(url, response)
+    return response
+
+
+@metrics.timed("http.fetch_json")
 def fetch_json(session: requests.Session, url: str, timeout: int = DEFAULT_TIMEOUT):
-    response = session.get(url, timeout=timeout)
+    response = _get(session, url, timeout)
     response.raise_for_status()
     return response.json()
 
 
+@metrics.timed("http.fetch_html")
 def fetch_html(session: requests.Session, url: str, timeout: int = DEFAULT_TIMEOUT) -> str:
-    response = session.get(url, timeout=timeout)
+    response = _get(session, url, timeout)
     response.raise_for_status()
     # `requests` falls back to ISO-8859-1 when the server omits `charset` in the
     # Content-Type header, which mojibakes UTF-8 curly quotes in puzzle titles
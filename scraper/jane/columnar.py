@@ -0,0 +1,205 @@
+"""
+Columnar, interned on-disk format for the puzzle list.
+
+Layout (little-endian), zlib-compressed after the magic:
+
+    u32 header length + header JSON   puzzle metadata, field order, counts
+    u32 names length  + names blob    NUL-separated solver-name dictionary
+    int32[]                           solver ids, puzzle after puzzle
+    int32[] + int64[]                 solver_timestamps ids / epoch microseconds
+
+Decoding yields the same list of dicts as `json.load` on data.json, but
+every solver name (and repeated timestamp) is a single shared object.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+from .writers import atomic_write
+
+MAGIC = b"JSPZCOL1"
+COLUMNAR_SUFFIX = ".jcol"
+
+_COLUMNS = ("solvers", "solver_timestamps")
+
+
+def is_columnar_path(file_path: str) -> bool:
+    return file_path.endswith(COLUMNAR_SUFFIX)
+
+
+def _to_micros(ts: str) -> Optional[int]:
+    """Epoch microseconds for an ISO timestamp, or None if it would not round-trip."""
+    try:
+        dt = datetime.fromisoformat(ts)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None or dt.utcoffset().total_seconds() != 0:
+        return None
+    delta = dt - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    micros = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    if _from_micros(micros) != ts:
+        return None
+    return micros
+
+
+def _from_micros(micros: int) -> str:
+    seconds, us = divmod(micros, 1_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=us).isoformat()
+
+
+def _columnar_ok(entry: Dict[str, Any]) -> bool:
+    solvers = entry.get("solvers", [])
+    timestamps = entry.get("solver_timestamps", {})
+    return (
+        isinstance(solvers, list)
+        and all(isinstance(s, str) and "\x00" not in s for s in solvers)
+        and isinstance(timestamps, dict)
+        and all(isinstance(k, str) and "\x00" not in k and isinstance(v, str) for k, v in timestamps.items())
+    )
+
+
+def encode_puzzles(puzzles: List[Dict[str, Any]]) -> bytes:
+    names: Dict[str, int] = {}
+    solver_ids = array("i")
+    ts_ids = array("i")
+    ts_micros = array("q")
+    header_puzzles: List[Dict[str, Any]] = []
+
+    def intern(name: str) -> int:
+        sid = names.get(name)
+        if sid is None:
+            sid = names[name] = len(names)
+        return sid
+
+    for entry in puzzles:
+        if not _columnar_ok(entry):
+            # Unusual shapes are kept verbatim in the header.
+            header_puzzles.append({"raw": entry})
+            continue
+        meta = {k: v for k, v in entry.items() if k not in _COLUMNS}
+        record: Dict[str, Any] = {"fields": list(entry.keys()), "meta": meta}
+
+        solvers = entry.get("solvers", [])
+        solver_ids.extend(intern(s) for s in solvers)
+        record["solvers"] = len(solvers)
+
+        raw_ts: Dict[str, str] = {}
+        count = 0
+        for name, ts in entry.get("solver_timestamps", {}).items():
+            micros = _to_micros(ts)
+            if micros is None:
+                raw_ts[name] = ts
+                continue
+            ts_ids.append(intern(name))
+            ts_micros.append(micros)
+            count += 1
+        record["timestamps"] = count
+        if raw_ts:
+            # Rare: non-UTC timestamps. Keep dict order by storing the
+            # full key order alongside the verbatim strings.
+            record["raw_timestamps"] = raw_ts
+            record["timestamp_order"] = list(entry["solver_timestamps"].keys())
+        header_puzzles.append(record)
+
+    if sys.byteorder != "little":
+        for arr in (solver_ids, ts_ids, ts_micros):
+            arr.byteswap()
+
+    # The name count is stored because a dictionary holding only "" encodes
+    # to the same empty blob as no names at all.
+    header = json.dumps({"puzzles": header_puzzles, "names": len(names)}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    names_blob = "\x00".join(names).encode("utf-8")
+    body = b"".join([
+        struct.pack("<I", len(header)), header,
+        struct.pack("<I", len(names_blob)), names_blob,
+        struct.pack("<III", len(solver_ids), len(ts_ids), len(ts_micros)),
+        solver_ids.tobytes(), ts_ids.tobytes(), ts_micros.tobytes(),
+    ])
+    return MAGIC + zlib.compress(body, 9)
+
+
+def decode_puzzles(data: bytes) -> List[Dict[str, Any]]:
+    if not data.startswith(MAGIC):
+        raise ValueError("Not a columnar puzzle file")
+    body = zlib.decompress(data[len(MAGIC):])
+    view = memoryview(body)
+    offset = 0
+
+    def take(length: int) -> memoryview:
+        nonlocal offset
+        chunk = view[offset:offset + length]
+        offset += length
+        return chunk
+
+    (header_len,) = struct.unpack("<I", take(4))
+    header = json.loads(bytes(take(header_len)).decode("utf-8"))
+    (names_len,) = struct.unpack("<I", take(4))
+    names_blob = bytes(take(names_len)).decode("utf-8")
+    n_solvers, n_ts, n_micros = struct.unpack("<III", take(12))
+    n_names = header.get("names")
+    if n_names is None:
+        # Written before the count was stored: any ids mean at least one name.
+        names = names_blob.split("\x00") if names_len or n_solvers or n_ts else []
+    else:
+        names = names_blob.split("\x00") if n_names else []
+        if len(names) != n_names:
+            raise ValueError(f"Columnar name dictionary holds {len(names)} names, header says {n_names}")
+
+    solver_ids = array("i")
+    solver_ids.frombytes(take(n_solvers * 4))
+    ts_ids = array("i")
+    ts_ids.frombytes(take(n_ts * 4))
+    ts_micros = array("q")
+    ts_micros.frombytes(take(n_micros * 8))
+    if sys.byteorder != "little":
+        for arr in (solver_ids, ts_ids, ts_micros):
+            arr.byteswap()
+
+    ts_strings: Dict[int, str] = {}
+    puzzles: List[Dict[str, Any]] = []
+    s_pos = 0
+    t_pos = 0
+    for record in header["puzzles"]:
+        if "raw" in record:
+            puzzles.append(record["raw"])
+            continue
+
+        count = record["solvers"]
+        solvers = list(map(names.__getitem__, solver_ids[s_pos:s_pos + count]))
+        s_pos += count
+
+        timestamps: Dict[str, str] = {}
+        for i in range(t_pos, t_pos + record["timestamps"]):
+            micros = ts_micros[i]
+            ts = ts_strings.get(micros)
+            if ts is None:
+                ts = ts_strings[micros] = _from_micros(micros)
+            timestamps[names[ts_ids[i]]] = ts
+        t_pos += record["timestamps"]
+        if "raw_timestamps" in record:
+            timestamps.update(record["raw_timestamps"])
+            timestamps = {name: timestamps[name] for name in record["timestamp_order"]}
+
+        columns = {"solvers": solvers, "solver_timestamps": timestamps}
+        meta = record["meta"]
+        puzzles.append({
+            key: columns[key] if key in columns else meta[key]
+            for key in record["fields"]
+        })
+    return puzzles
+
+
+def load_puzzles_columnar(file_path: str) -> List[Dict[str, Any]]:
+    with open(file_path, "rb") as f:
+        return decode_puzzles(f.read())
+
+
+def save_puzzles_columnar(file_path: str, puzzles: List[Dict[str, Any]]) -> None:
+    atomic_write(file_path, encode_puzzles(puzzles))
@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from loguru import logger
+
+from .aggregator import _parse_date, _format_month_year
+from .metrics import timed
+from .writers import atomic_write
+
+STATE_VERSION = 1
+
+
+def _month_index(date_text: str) -> int:
+    dt = _parse_date(date_text)
+    return dt.year * 12 + dt.month - 1
+
+
+def _month_label(month: int) -> str:
+    return _format_month_year(datetime(month // 12, month % 12 + 1, 1))
+
+
+def _puzzle_key(entry: Dict[str, Any]) -> str:
+    return f"{entry.get('date_text', '')}_{entry.get('name', '')}"
+
+
+@dataclass
+class SolverAggregate:
+    count: int
+    first_pos: int
+    last_pos: int
+    encounter: Tuple[int, int]
+    months: List[int] = field(default_factory=list)
+
+
+@dataclass
+class StatsState:
+    """
+    Persisted aggregate state behind `stats.json`.
+
+    Puzzles are stored in `build_stats` order (newest first) and referenced
+    by position; `encounter` is the (position, index) at which `build_stats`
+    would first meet a solver, which fixes every tie-break in its output.
+    Indexes below `solvers` are derived on load and never persisted.
+    """
+
+    puzzles: List[Dict[str, Any]] = field(default_factory=list)
+    solvers: Dict[str, SolverAggregate] = field(default_factory=dict)
+    progress: Optional[Dict[str, Any]] = None
+    fingerprint: str = ""
+    key_to_pos: Dict[str, int] = field(default_factory=dict)
+    month_counts: Dict[int, int] = field(default_factory=dict)
+    first_by_month: Dict[int, Set[str]] = field(default_factory=dict)
+    streaks: Dict[str, Tuple[int, int, int]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "fingerprint": self.fingerprint,
+            "puzzles": self.puzzles,
+            "solvers": {
+                name: [s.count, s.first_pos, s.last_pos, list(s.encounter), s.months]
+                for name, s in self.solvers.items()
+            },
+            "progress": self.progress,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StatsState":
+        state = cls(
+            puzzles=data["puzzles"],
+            solvers={
+                name: SolverAggregate(count, first_pos, last_pos, (enc[0], enc[1]), months)
+                for name, (count, first_pos, last_pos, enc, months) in data["solvers"].items()
+            },
+            progress=data.get("progress"),
+            fingerprint=data.get("fingerprint", ""),
+        )
+        _reindex(state)
+        return state
+
+
+def _best_streak(months: List[int]) -> Optional[Tuple[int, int, int]]:
+    """Longest run of consecutive months (earliest wins ties), or None if shorter than 2."""
+    best: Optional[Tuple[int, int, int]] = None
+    start = 0
+    for i in range(1, len(months) + 1):
+        if i == len(months) or months[i] - months[i - 1] != 1:
+            length = i - start
+            if length >= 2 and (best is None or length > best[2]):
+                best = (months[start], months[i - 1], length)
+            start = i
+    return best
+
+
+def _reindex(state: StatsState) -> None:
+    state.key_to_pos = {p["key"]: pos for pos, p in enumerate(state.puzzles)}
+    state.month_counts = {}
+    state.first_by_month = {}
+    state.streaks = {}
+    for name, solver in state.solvers.items():
+        for month in solver.months:
+            state.month_counts[month] = state.month_counts.get(month, 0) + 1
+        first_month = state.puzzles[solver.first_pos]["month"]
+        state.first_by_month.setdefault(first_month, set()).add(name)
+        streak = _best_streak(solver.months)
+        if streak:
+            state.streaks[name] = streak
+
+
+def _add_solve(state: StatsState, name: str, pos: int, idx: int, track_streaks: bool = True) -> None:
+    month = state.puzzles[pos]["month"]
+    solver = state.solvers.get(name)
+    if solver is None:
+        state.solvers[name] = SolverAggregate(1, pos, pos, (pos, idx), [month])
+        state.month_counts[month] = state.month_counts.get(month, 0) + 1
+        state.first_by_month.setdefault(month, set()).add(name)
+        return
+
+    solver.count += 1
+    if (pos, idx) < solver.encounter:
+        solver.encounter = (pos, idx)
+
+    first_month = state.puzzles[solver.first_pos]["month"]
+    if (month, pos) < (first_month, solver.first_pos):
+        solver.first_pos = pos
+        if month != first_month:
+            state.first_by_month[first_month].discard(name)
+            state.first_by_month.setdefault(month, set()).add(name)
+    last_month = state.puzzles[solver.last_pos]["month"]
+    if (month, -pos) > (last_month, -solver.last_pos):
+        solver.last_pos = pos
+
+    at = bisect.bisect_left(solver.months, month)
+    if at == len(solver.months) or solver.months[at] != month:
+        solver.months.insert(at, month)
+        state.month_counts[month] = state.month_counts.get(month, 0) + 1
+        if track_streaks:
+            streak = _best_streak(solver.months)
+            if streak:
+                state.streaks[name] = streak
+
+
+def puzzles_fingerprint(puzzles: List[Dict[str, Any]]) -> str:
+    """Digest of everything `build_stats` reads, used to validate a persisted state."""
+    digest = hashlib.sha1()
+    for puzzle in puzzles:
+        digest.update(_puzzle_key(puzzle).encode("utf-8"))
+        digest.update(b"\x00" + (puzzle.get("solution_url") or "").encode("utf-8"))
+        digest.update(b"\x00" + "\x1f".join(puzzle.get("solvers") or []).encode("utf-8"))
+        digest.update(b"\x00%d\x1e" % len(puzzle.get("solver_timestamps") or {}))
+    return digest.hexdigest()
+
+
+def build_state(puzzles: List[Dict[str, Any]]) -> StatsState:
+    """Build the aggregate state from scratch (same walk as `build_stats`)."""
+    state = StatsState()
+    sorted_puzzles = sorted(puzzles, key=lambda p: _parse_date(p.get("date_text", "")), reverse=True)
+
+    for pos, puzzle in enumerate(sorted_puzzles):
+        solvers = puzzle.get("solvers") or []
+        key = _puzzle_key(puzzle)
+        state.puzzles.append({
+            "key": key,
+            "date_text": puzzle.get("date_text", "N/A"),
+            "name": puzzle.get("name", "Unknown"),
+            "solution_url": puzzle.get("solution_url", ""),
+            "month": _month_index(puzzle.get("date_text", "")),
+            "solvers": len(solvers),
+        })
+        state.key_to_pos[key] = pos
+        for idx, name in enumerate(solvers):
+            _add_solve(state, name, pos, idx, track_streaks=False)
+        timestamps = puzzle.get("solver_timestamps", {})
+        if state.progress is None and timestamps:
+            state.progress = {"pos": pos, "timestamps": list(timestamps.items())}
+
+    for name, solver in state.solvers.items():
+        streak = _best_streak(solver.months)
+        if streak:
+            state.streaks[name] = streak
+
+    state.fingerprint = puzzles_fingerprint(puzzles)
+    return state
+
+
+def apply_delta(state: StatsState, puzzle: Dict[str, Any], added_solvers: List[str]) -> None:
+    """
+    Fold solvers appended to an already-known puzzle into `state`.
+
+    `puzzle` is the updated entry; its `solvers` list must be the previous
+    list followed by `added_solvers`. Anything else (new puzzles, removals,
+    reordering) raises ValueError and needs a `build_state` rebuild.
+    """
+    key = _puzzle_key(puzzle)
+    pos = state.key_to_pos.get(key)
+    if pos is None:
+        raise ValueError(f"Unknown puzzle {key!r}; rebuild required")
+
+    record = state.puzzles[pos]
+    solvers = puzzle.get("solvers") or []
+    old_count = record["solvers"]
+    if len(solvers) != old_count + len(added_solvers) or solvers[old_count:] != list(added_solvers):
+        raise ValueError(f"Solvers of {key!r} changed beyond an append; rebuild required")
+
+    for offset, name in enumerate(added_solvers):
+        _add_solve(state, name, pos, old_count + offset)
+    record["solvers"] = len(solvers)
+    record["solution_url"] = puzzle.get("solution_url", "")
+
+    timestamps = puzzle.get("solver_timestamps", {})
+    if timestamps and (state.progress is None or pos <= state.progress["pos"]):
+        state.progress = {"pos": pos, "timestamps": list(timestamps.items())}
+
+
+@timed("stats_state.render")
+def render_stats(state: StatsState) -> Dict[str, Any]:
+    """Render `stats.json` content; identical to `build_stats` on the same puzzles."""
+    puzzles = state.puzzles
+
+    def rank_key(item: Tuple[str, SolverAggregate]):
+        return (-item[1].count, item[1].encounter)
+
+    top_solvers = sorted(state.solvers.items(), key=rank_key)
+
+    longest_streaks = [
+        {
+            "solver": name,
+            "start": _month_label(state.streaks[name][0]),
+            "end": _month_label(state.streaks[name][1]),
+            "length": state.streaks[name][2],
+        }
+        for name, _ in top_solvers
+        if name in state.streaks
+    ]
+    longest_streaks = sorted(longest_streaks, key=lambda s: s["length"], reverse=True)[:20]
+
+    now = datetime.now(timezone.utc)
+    one_year_ago = (now.year - 1) * 12 + now.month - 1
+    candidates = []
+    for month, names in state.first_by_month.items():
+        if month < one_year_ago:
+            continue
+        months_since = max(1, (now.year - month // 12) * 12 + (now.month - month % 12 - 1))
+        for name in names:
+            solver = state.solvers[name]
+            if solver.count >= 3:
+                candidates.append((solver.count / months_since, solver.encounter, name))
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+    rising_stars = [
+        {
+            "solver": name,
+            "puzzlesSolved": state.solvers[name].count,
+            "solveRate": rate,
+            "firstAppearance": puzzles[state.solvers[name].first_pos]["date_text"],
+        }
+        for rate, _, name in candidates[:20]
+    ]
+
+    sorted_months = sorted({p["month"] for p in puzzles})
+    if len(sorted_months) > 48:
+        sampled_months = [m for idx, m in enumerate(sorted_months) if idx % 3 == 0 or idx == len(sorted_months) - 1]
+    else:
+        sampled_months = sorted_months
+    monthly_participation = [
+        {"month": _month_label(m), "solvers": state.month_counts.get(m, 0)}
+        for m in sampled_months
+    ]
+
+    solvers_growth = []
+    total = 0
+    for month in sorted_months:
+        total += len(state.first_by_month.get(month, ()))
+        solvers_growth.append({"month": _month_label(month), "totalSolvers": total})
+    if solvers_growth:
+        solvers_growth[-1]["totalSolvers"] = len(state.solvers)
+
+    most_solved_puzzles = sorted(
+        [
+            {
+                "id": f"{p['month'] // 12}-{p['month'] % 12 + 1}",
+                "name": p["name"],
+                "solvers": p["solvers"],
+                "solution_url": p["solution_url"],
+            }
+            for p in puzzles
+        ],
+        key=lambda p: p["solvers"],
+        reverse=True,
+    )[:20]
+
+    counts = [s.count for s in state.solvers.values()]
+
+    current_puzzle_progress = None
+    if state.progress is not None:
+        puzzle = puzzles[state.progress["pos"]]
+        entries = sorted(state.progress["timestamps"], key=lambda x: x[1])
+        current_puzzle_progress = {
+            "puzzleName": puzzle["name"],
+            "puzzleDate": puzzle["date_text"],
+            "solverCount": puzzle["solvers"],
+            "timeline": [{"solver": name, "timestamp": ts} for name, ts in entries],
+        }
+
+    return {
+        "totalPuzzles": len(puzzles),
+        "uniqueSolvers": len(state.solvers),
+        "solverDistribution": {
+            "onePuzzle": sum(1 for c in counts if c == 1),
+            "twoToNine": sum(1 for c in counts if 2 <= c <= 9),
+            "tenPlus": sum(1 for c in counts if c >= 10),
+        },
+        "topSolvers": [
+            {
+                "name": name,
+                "puzzlesSolved": solver.count,
+                "firstAppearance": puzzles[solver.first_pos]["date_text"],
+                "lastSolve": puzzles[solver.last_pos]["date_text"],
+            }
+            for name, solver in top_solvers
+        ],
+        "longestStreaks": longest_streaks,
+        "risingStars": rising_stars,
+        "monthlyParticipation": monthly_participation,
+        "solversGrowth": solvers_growth,
+        "mostSolvedPuzzles": most_solved_puzzles,
+        "currentPuzzleProgress": current_puzzle_progress,
+        "generatedAt": now.isoformat(),
+    }
+
+
+def snapshot_puzzles(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cheap pre-run snapshot (list references only) used by `diff_puzzles`."""
+    return {
+        _puzzle_key(p): (p.get("solvers"), p.get("solver_timestamps"), p.get("solution_url", ""))
+        for p in puzzles
+    }
+
+
+def diff_puzzles(
+    snapshot: Dict[str, Any],
+    puzzles: List[Dict[str, Any]],
+) -> Optional[List[Tuple[Dict[str, Any], List[str]]]]:
+    """
+    Return (entry, added_solvers) pairs for entries whose solvers grew by an
+    append since `snapshot`, or None if the change set needs a full rebuild.
+    """
+    if len(snapshot) != len(puzzles):
+        return None
+    deltas: List[Tuple[Dict[str, Any], List[str]]] = []
+    for entry in puzzles:
+        before = snapshot.get(_puzzle_key(entry))
+        if before is None:
+            return None
+        old_solvers, old_timestamps, old_url = before
+        if (
+            entry.get("solvers") is old_solvers
+            and entry.get("solver_timestamps") is old_timestamps
+            and entry.get("solution_url", "") == old_url
+        ):
+            continue
+        solvers = entry.get("solvers") or []
+        old_solvers = old_solvers or []
+        if solvers[:len(old_solvers)] != old_solvers:
+            return None
+        deltas.append((entry, solvers[len(old_solvers):]))
+    return deltas
+
+
+@timed("stats_state.update")
+def update_stats_state(
+    puzzles: List[Dict[str, Any]],
+    snapshot: Optional[Dict[str, Any]],
+    state: Optional[StatsState],
+) -> StatsState:
+    """Bring `state` in line with `puzzles`, rebuilding from scratch when a delta won't do."""
+    deltas = diff_puzzles(snapshot, puzzles) if state is not None and snapshot is not None else None
+    if state is not None and deltas is not None:
+        try:
+            for entry, added in deltas:
+                apply_delta(state, entry, added)
+            state.fingerprint = puzzles_fingerprint(puzzles)
+            logger.info(f"Applied {len(deltas)} incremental stats delta(s)")
+            return state
+        except ValueError as exc:
+            logger.info(f"Incremental stats update not possible: {exc}")
+    logger.info("Rebuilding aggregate stats state from scratch")
+    return build_state(puzzles)
+
+
+def load_state(file_path: str, puzzles: List[Dict[str, Any]]) -> Optional[StatsState]:
+    """Load a persisted state, returning None if missing, stale or unreadable."""
+    if not file_path or not os.path.exists(file_path):
+        return None
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != STATE_VERSION:
+            return None
+        state = StatsState.from_dict(data)
+    except Exception as exc:
+        logger.warning(f"Failed to load stats state from {file_path}: {exc}")
+        return None
+    if state.fingerprint != puzzles_fingerprint(puzzles):
+        logger.info(f"Stats state at {file_path} is stale; ignoring it")
+        return None
+    return state
+
+
+def save_state(file_path: str, state: StatsState) -> None:
+    body = json.dumps(state.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    atomic_write(file_path, body.encode("utf-8"))
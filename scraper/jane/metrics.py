@@ -0,0 +1,245 @@
+"""
+Opt-in per-stage timers and counters for `--profile`.
+
+Nothing is recorded until `enable_profiling()` is called; until then the
+`timed` wrappers and `stage` blocks cost a single global check.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds (milliseconds) of the latency histogram buckets; the last one is open.
+BUCKETS_MS = [0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, ms)
+        self.max = max(self.max, ms)
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def _quantile(self, q: float) -> float:
+        # Linear interpolation inside the bucket holding the q-th sample,
+        # with the bucket narrowed to the observed min/max.
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for bound, n in zip(BUCKETS_MS + [self.max], self.buckets):
+            if n and seen + n >= rank:
+                lo, hi = max(lower, self.min), min(bound, self.max)
+                return lo + (hi - lo) * (rank - seen) / n
+            seen += n
+            lower = bound
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={b:g}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]:g}ms"]
+        return {
+            "count": self.count,
+            "total_s": round(self.total, 6),
+            "mean_ms": round(self.total * 1000 / self.count, 3),
+            "min_ms": round(self.min, 3),
+            "max_ms": round(self.max, 3),
+            "p50_ms": round(self._quantile(0.5), 3),
+            "p95_ms": round(self._quantile(0.95), 3),
+            "histogram": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class Profiler:
+    """Thread-safe latency histograms per stage, named counters and gauges."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.stages: Dict[str, _Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            hist = self.stages.get(name)
+            if hist is None:
+                hist = self.stages[name] = _Histogram()
+            hist.add(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            g = self.gauges.get(name)
+            if g is None:
+                self.gauges[name] = {"last": value, "min": value, "max": value}
+            else:
+                g["last"] = value
+                g["min"] = min(g["min"], value)
+                g["max"] = max(g["max"], value)
+
+    def report(self) -> Dict[str, Any]:
+        peak_rss_mb = None
+        if resource is not None:
+            # ru_maxrss is kilobytes on Linux and bytes on macOS.
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            peak_rss_mb = round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+        with self._lock:
+            return {
+                "generatedAt": datetime.now(timezone.utc).isoformat(),
+                "wall_s": round(time.perf_counter() - self.started, 3),
+                "peak_rss_mb": peak_rss_mb,
+                "counters": dict(sorted(self.counters.items())),
+                "gauges": {
+                    name: {k: round(v, 3) for k, v in g.items()} for name, g in sorted(self.gauges.items())
+                },
+                "stages": {name: hist.to_dict() for name, hist in sorted(self.stages.items())},
+            }
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable_profiling() -> Profiler:
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def count(name: str, amount: int = 1) -> None:
+    if _profiler is not None:
+        _profiler.count(name, amount)
+
+
+def gauge(name: str, value: float) -> None:
+    """Record the current value of `name` (last, min and max are reported)."""
+    if _profiler is not None:
+        _profiler.gauge(name, value)
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        profiler = _profiler
+        if profiler is not None:
+            profiler.observe(self.name, time.perf_counter() - self.start)
+
+
+class _NullStage:
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str):
+    """`with stage("name"):` times the block when profiling is on."""
+    return _NULL_STAGE if _profiler is None else _Stage(name)
+
+
+class _Laps:
+    __slots__ = ("prefix", "last")
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self.last = time.perf_counter()
+
+    def lap(self, name: str) -> None:
+        now = time.perf_counter()
+        profiler = _profiler
+        if profiler is not None:
+            profiler.observe(f"{self.prefix}.{name}", now - self.last)
+        self.last = now
+
+
+class _NullLaps:
+    def lap(self, name: str) -> None:
+        return None
+
+
+_NULL_LAPS = _NullLaps()
+
+
+def laps(prefix: str):
+    """Sequential section timer: each `.lap("name")` records the time since the previous one."""
+    return _NULL_LAPS if _profiler is None else _Laps(prefix)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator recording each call's latency under `name`."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profiler.observe(name, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def save_profile(file_path: str, profiler: Profiler) -> Dict[str, Any]:
+    report = profiler.report()
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def summarize(report: Dict[str, Any], limit: int = 8) -> List[str]:
+    """Log lines for the slowest stages of a report."""
+    stages = sorted(report["stages"].items(), key=lambda item: item[1]["total_s"], reverse=True)
+    lines = [f"Profile: {report['wall_s']}s wall, peak RSS {report['peak_rss_mb']} MB"]
+    for name, s in stages[:limit]:
+        lines.append(f"  {name}: {s['count']} call(s), {s['total_s']:.3f}s total, p95 {s['p95_ms']}ms")
+    return lines
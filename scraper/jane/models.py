@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
 @dataclass
@@ -12,9 +12,21 @@ class Puzzle:
     solution_url: str
     solvers: List[str] = field(default_factory=list)
     solver_timestamps: Dict[str, str] = field(default_factory=dict)
+    # Leaderboard directory from the solution page (`data-directory`); stored
+    # so later runs can go straight to `<puzzle_id>-leaderboard.json`.
+    puzzle_id: Optional[str] = None
+    archived_at: Optional[str] = None
+    # Freeze bookkeeping, see `pipeline.FreezePolicy`.
+    unchanged_fetches: Optional[int] = None
+    frozen_at: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        return asdict(self)
+        data = asdict(self)
+        # Unknown optional fields are left out rather than written as null.
+        for key in ("puzzle_id", "archived_at", "unchanged_fetches", "frozen_at"):
+            if data[key] is None:
+                del data[key]
+        return data
 
 
 @dataclass
@@ -23,5 +35,3 @@ class PuzzleMeta:
     name: str
     solution_url: str
     date: datetime
-
-
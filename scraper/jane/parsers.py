@@ -7,6 +7,8 @@ from typing import List, Optional
 from bs4 import BeautifulSoup
 
 from .models import PuzzleMeta
+from .metrics import timed
+from .streamparse import ArchiveRow, UnsupportedMarkup, extract_archive_rows, extract_solution_directory
 
 
 def clean_solver_name(name: str) -> str:
@@ -16,38 +18,55 @@ def clean_solver_name(name: str) -> str:
     return re.sub(r"\s*\([^)]*\)", "", name).strip()
 
 
-def parse_archive_page(html: str) -> List[PuzzleMeta]:
-    """
-    Parse the archive page HTML and return puzzle metadata entries with dates and solution URLs.
-    """
+def _archive_rows_soup(html: str) -> List[ArchiveRow]:
     soup = BeautifulSoup(html, "html.parser")
     container = soup.select_one("body > div.site-wrap > main > div > div.container > div > div")
     if not container:
         return []
 
-    rows = container.select("div.row")
-    puzzles: List[PuzzleMeta] = []
-
-    for row in rows:
+    rows: List[ArchiveRow] = []
+    for row in container.select("div.row"):
         date_tag = row.select_one(".left span.date")
         name_tag = row.select_one(".left span.name")
         solution_link_tag = row.select_one(".right a.solution-link")
 
-        if not (date_tag and name_tag):
+        href = None
+        if solution_link_tag and solution_link_tag.has_attr("href"):
+            href = solution_link_tag["href"]
+            href = href if isinstance(href, str) else str(href)
+        rows.append((
+            date_tag.get_text(strip=True) if date_tag else None,
+            name_tag.get_text(strip=True) if name_tag else None,
+            href,
+        ))
+    return rows
+
+
+def _solution_directory_soup(html: str) -> Optional[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    submissions_tag = soup.select_one("p.correct-submissions")
+    if submissions_tag and submissions_tag.has_attr("data-directory"):
+        return str(submissions_tag["data-directory"])
+    return None
+
+
+def _metas_from_rows(rows: List[ArchiveRow]) -> List[PuzzleMeta]:
+    puzzles: List[PuzzleMeta] = []
+
+    for raw_date, puzzle_name, href in rows:
+        if raw_date is None or puzzle_name is None:
             continue
 
-        date_text = date_tag.get_text(strip=True).rstrip(":")
+        date_text = raw_date.rstrip(":")
         try:
             date = datetime.strptime(date_text, "%B %Y")
         except ValueError:
             # Skip malformed dates to avoid poisoning downstream logic.
             continue
 
-        puzzle_name = name_tag.get_text(strip=True)
         solution_url = ""
-        if solution_link_tag and solution_link_tag.has_attr("href"):
-            href = solution_link_tag["href"]
-            solution_url = "https://www.janestreet.com" + (href if isinstance(href, str) else str(href))
+        if href is not None:
+            solution_url = "https://www.janestreet.com" + href
 
         puzzles.append(
             PuzzleMeta(
@@ -61,15 +80,29 @@ def parse_archive_page(html: str) -> List[PuzzleMeta]:
     return puzzles
 
 
-def parse_solution_page(html: str) -> Optional[str]:
+@timed("parse.archive_page")
+def parse_archive_page(html: str, fast: bool = True) -> List[PuzzleMeta]:
     """
-    Extract the puzzle leaderboard directory id from a solution page.
-    Returns the puzzle id string or None if not found.
+    Parse the archive page HTML and return puzzle metadata entries with dates and solution URLs.
+    Uses the streaming extractor unless `fast` is False or the markup needs a full tree.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    submissions_tag = soup.select_one("p.correct-submissions")
-    if submissions_tag and submissions_tag.has_attr("data-directory"):
-        return str(submissions_tag["data-directory"])
-    return None
+    if fast:
+        try:
+            return _metas_from_rows(extract_archive_rows(html))
+        except UnsupportedMarkup:
+            pass
+    return _metas_from_rows(_archive_rows_soup(html))
 
 
+@timed("parse.solution_page")
+def parse_solution_page(html: str, fast: bool = True) -> Optional[str]:
+    """
+    Extract the puzzle leaderboard directory id from a solution page.
+    Returns the puzzle id string or None if not found.
+    """
+    if fast:
+        try:
+            return extract_solution_directory(html)
+        except UnsupportedMarkup:
+            pass
+    return _solution_directory_soup(html)
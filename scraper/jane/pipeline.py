@@ -1,15 +1,20 @@
 from __future__ import annotations
 
 import concurrent.futures
+import threading
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 from loguru import logger
 
-from .client import fetch_html, fetch_json, build_session, DEFAULT_TIMEOUT
+from .client import fetch_html, fetch_json, build_session, circuit_open, is_upstream_failure, DEFAULT_TIMEOUT
 from .models import Puzzle, PuzzleMeta
+from .metrics import timed
 from .parsers import parse_archive_page, parse_solution_page, clean_solver_name
-from .storage import load_existing, save_puzzles, load_puzzles_list, save_puzzles_raw
+from .storage import load_existing, save_puzzles, load_puzzles_list, save_puzzles_raw, save_puzzles_journaled
+from .incremental import (
+    StatsState, load_state, save_state, snapshot_puzzles, update_stats_state, render_stats,
+)
 
 CURRENT_PUZZLE_URL = "https://www.janestreet.com/puzzles/current-puzzle/"
 
@@ -19,13 +24,26 @@ CURRENT_PUZZLE_URL = "https://www.janestreet.com/puzzles/current-puzzle/"
 # so those late additions land on the leaderboard.
 LEEWAY_DAYS = 30
 
+# Solution pages from before this month have no leaderboard to fetch.
+LEADERBOARDS_SINCE = datetime(2015, 11, 1)
 
-def get_leaderboard_names(session, puzzle_id: str, timeout: int = DEFAULT_TIMEOUT) -> List[str]:
+# Archived puzzles past the leeway window whose leaderboard came back
+# unchanged this many refreshes in a row stop being re-fetched.
+FREEZE_AFTER_UNCHANGED = 3
+
+
+def fetch_leaderboard(session, puzzle_id: str, timeout: int = DEFAULT_TIMEOUT) -> List[str]:
+    """Solver names on a puzzle's leaderboard; raises on network/HTTP errors."""
     json_url = f"https://www.janestreet.com/puzzles/{puzzle_id}-leaderboard.json"
+    data = fetch_json(session, json_url, timeout=timeout)
+    solvers = data.get("leaders", [])
+    return [clean_solver_name(solver) for solver in solvers]
+
+
+def get_leaderboard_names(session, puzzle_id: str, timeout: int = DEFAULT_TIMEOUT) -> List[str]:
+    """`fetch_leaderboard`, with failures logged and returned as an empty list."""
     try:
-        data = fetch_json(session, json_url, timeout=timeout)
-        solvers = data.get("leaders", [])
-        return [clean_solver_name(solver) for solver in solvers]
+        return fetch_leaderboard(session, puzzle_id, timeout=timeout)
     except Exception as exc:  # pragma: no cover - network/HTML errors
         logger.warning(f"Failed to fetch leaderboard {puzzle_id}: {exc}")
         return []
@@ -66,7 +84,8 @@ def scrape_current_puzzle(
         if not puzzle_id:
             logger.warning("No data-directory found on current puzzle page")
             return None
-        solvers = get_leaderboard_names(session, puzzle_id, timeout=timeout)
+        # A failed fetch must not read as an empty leaderboard.
+        solvers = fetch_leaderboard(session, puzzle_id, timeout=timeout)
         logger.info(f"Current puzzle {puzzle_id}: {len(solvers)} solvers")
         return puzzle_id, solvers
     except Exception as exc:
@@ -74,43 +93,28 @@ def scrape_current_puzzle(
         return None
 
 
-def update_current(
+def current_puzzle_unchanged(puzzles: List[Dict[str, Any]], puzzle_id: str, fresh_solvers: List[str]) -> bool:
+    """True if the stored current puzzle is `puzzle_id` with exactly `fresh_solvers`."""
+    for entry in puzzles:
+        if not entry.get("solution_url"):
+            return entry.get("puzzle_id") == puzzle_id and list(entry.get("solvers") or []) == fresh_solvers
+    return False
+
+
+def apply_current_puzzle(
+    session,
     base_url: str,
-    output_path: str,
-    stats_path: str,
+    puzzles: List[Dict[str, Any]],
+    puzzle_id: str,
+    fresh_solvers: List[str],
     timeout: int = DEFAULT_TIMEOUT,
-) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+) -> Dict[str, Any]:
     """
-    Lightweight daily update: only refresh the current puzzle's leaderboard.
-    Handles month transitions (new puzzle appearing) automatically.
-
-    Returns (puzzles, notification) where notification contains info about
-    new solvers detected during this run.
+    Merge the current puzzle's live leaderboard into `puzzles` in place,
+    handling a month transition if `puzzle_id` is a new puzzle. Returns the
+    notification fields (puzzle_name, puzzle_date, new_solvers, total_solvers).
     """
-    from .aggregator import build_stats, save_stats
-
-    empty_notification: Dict[str, Any] = {
-        "puzzle_name": "", "puzzle_date": "", "new_solvers": [], "total_solvers": 0,
-        "late_solvers_by_puzzle": {},
-    }
-
-    session = build_session()
-    puzzles = load_puzzles_list(output_path)
-
-    if not puzzles:
-        logger.error("No existing data found. Run with --full to do initial scrape.")
-        return puzzles, empty_notification
-
-    # Scrape the current puzzle page
-    result = scrape_current_puzzle(session, timeout=timeout)
-    if result is None:
-        logger.warning("Could not fetch current puzzle; saving stats and exiting")
-        stats = build_stats(puzzles)
-        save_stats(stats_path, stats)
-        return puzzles, empty_notification
-
-    puzzle_id, fresh_solvers = result
-    notification = dict(empty_notification)
+    result: Dict[str, Any] = {}
 
     # Find the existing "current" entry (no solution_url)
     current_idx = None
@@ -132,10 +136,10 @@ def update_current(
             current_entry["solver_timestamps"] = merged_ts
             current_entry["puzzle_id"] = puzzle_id
 
-            notification["puzzle_name"] = current_entry.get("name", "")
-            notification["puzzle_date"] = current_entry.get("date_text", "")
-            notification["new_solvers"] = new_solver_names
-            notification["total_solvers"] = len(fresh_solvers)
+            result["puzzle_name"] = current_entry.get("name", "")
+            result["puzzle_date"] = current_entry.get("date_text", "")
+            result["new_solvers"] = new_solver_names
+            result["total_solvers"] = len(fresh_solvers)
 
             logger.info(
                 f"Updated current puzzle: {len(fresh_solvers)} solvers "
@@ -149,10 +153,10 @@ def update_current(
                 puzzle_id, fresh_solvers, timeout,
             )
             # After transition, new puzzle is at index 0
-            notification["puzzle_name"] = puzzles[0].get("name", "")
-            notification["puzzle_date"] = puzzles[0].get("date_text", "")
-            notification["new_solvers"] = fresh_solvers
-            notification["total_solvers"] = len(fresh_solvers)
+            result["puzzle_name"] = puzzles[0].get("name", "")
+            result["puzzle_date"] = puzzles[0].get("date_text", "")
+            result["new_solvers"] = fresh_solvers
+            result["total_solvers"] = len(fresh_solvers)
     else:
         # No current entry found — add the new puzzle
         logger.info("No current puzzle entry found; adding new entry")
@@ -167,14 +171,71 @@ def update_current(
         }
         puzzles.insert(0, new_entry)
 
-        notification["puzzle_name"] = new_entry["name"]
-        notification["puzzle_date"] = new_entry["date_text"]
-        notification["new_solvers"] = fresh_solvers
-        notification["total_solvers"] = len(fresh_solvers)
+        result["puzzle_name"] = new_entry["name"]
+        result["puzzle_date"] = new_entry["date_text"]
+        result["new_solvers"] = fresh_solvers
+        result["total_solvers"] = len(fresh_solvers)
+
+    return result
+
+
+def update_current(
+    base_url: str,
+    output_path: str,
+    stats_path: str,
+    timeout: int = DEFAULT_TIMEOUT,
+    state_path: Optional[str] = None,
+    shard_dir: Optional[str] = None,
+    workers: int = 1,
+    stats_backend: str = "python",
+    journal: bool = False,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Lightweight daily update: only refresh the current puzzle's leaderboard.
+    Handles month transitions (new puzzle appearing) automatically.
+
+    When `state_path` is given, stats are updated from the persisted
+    aggregate state plus this run's solver delta instead of a full
+    `build_stats` recompute. `shard_dir` additionally receives the paginated
+    stats shards (see `aggregator.save_stats_shards`). `stats_backend` picks
+    the `build_stats` implementation used when recomputing from scratch.
+    With `journal`, puzzle changes are appended to the store's journal
+    (see `storage.save_puzzles_journaled`) instead of rewriting it.
+
+    Returns (puzzles, notification) where notification contains info about
+    new solvers detected during this run.
+    """
+    empty_notification: Dict[str, Any] = {
+        "puzzle_name": "", "puzzle_date": "", "new_solvers": [], "total_solvers": 0,
+        "late_solvers_by_puzzle": {},
+    }
+
+    session = build_session(pool_size=workers)
+    puzzles = load_puzzles_list(output_path)
+
+    if not puzzles:
+        logger.error("No existing data found. Run with --full to do initial scrape.")
+        return puzzles, empty_notification
+
+    state = load_state(state_path, puzzles) if state_path else None
+    snapshot = snapshot_puzzles(puzzles) if state is not None else None
+
+    # Scrape the current puzzle page
+    result = scrape_current_puzzle(session, timeout=timeout)
+    if result is None:
+        logger.warning("Could not fetch current puzzle; saving stats and exiting")
+        _save_stats_with_state(
+            puzzles, stats_path, state_path, snapshot, state, shard_dir, stats_backend, output_path,
+        )
+        return puzzles, empty_notification
+
+    puzzle_id, fresh_solvers = result
+    notification = dict(empty_notification)
+    notification.update(apply_current_puzzle(session, base_url, puzzles, puzzle_id, fresh_solvers, timeout))
 
     # Re-check recently archived puzzles for late solver additions that
     # Jane Street made after the puzzle moved into the archive.
-    late_by_puzzle = refresh_recent_archives(session, puzzles, timeout=timeout)
+    late_by_puzzle = refresh_recent_archives(session, puzzles, timeout=timeout, workers=workers)
     if late_by_puzzle:
         total_late = sum(len(v) for v in late_by_puzzle.values())
         logger.info(
@@ -183,12 +244,42 @@ def update_current(
         )
         notification["late_solvers_by_puzzle"] = late_by_puzzle
 
-    save_puzzles_raw(output_path, puzzles)
-    stats = build_stats(puzzles)
-    save_stats(stats_path, stats)
+    if journal:
+        save_puzzles_journaled(output_path, puzzles)
+    else:
+        save_puzzles_raw(output_path, puzzles)
+    _save_stats_with_state(
+        puzzles, stats_path, state_path, snapshot, state, shard_dir, stats_backend, output_path,
+    )
     return puzzles, notification
 
 
+def _save_stats_with_state(
+    puzzles: List[Dict[str, Any]],
+    stats_path: str,
+    state_path: Optional[str],
+    snapshot: Optional[Dict[str, Any]],
+    state: Optional[StatsState],
+    shard_dir: Optional[str] = None,
+    stats_backend: str = "python",
+    store_path: Optional[str] = None,
+) -> None:
+    """
+    Write stats.json, going through the incremental state when one is
+    configured. `store_path` is where `puzzles` were saved (see
+    `aggregator.build_stats`).
+    """
+    from .aggregator import build_stats, save_stats
+
+    if not state_path:
+        stats = build_stats(puzzles, backend=stats_backend, store_path=store_path)
+        save_stats(stats_path, stats, shard_dir=shard_dir)
+        return
+    state = update_stats_state(puzzles, snapshot, state)
+    save_stats(stats_path, render_stats(state), shard_dir=shard_dir)
+    save_state(state_path, state)
+
+
 def _handle_month_transition(
     session,
     base_url: str,
@@ -224,10 +315,15 @@ def _handle_month_transition(
         if key == old_key and meta.solution_url:
             logger.info(f"Finalizing old puzzle: {meta.name}")
             try:
-                solution_html = fetch_html(session, meta.solution_url, timeout=timeout)
-                solution_puzzle_id = parse_solution_page(solution_html)
+                # The current page's directory is the archived puzzle's leaderboard.
+                solution_puzzle_id = old_entry.get("puzzle_id")
+                if not solution_puzzle_id:
+                    solution_html = fetch_html(session, meta.solution_url, timeout=timeout)
+                    solution_puzzle_id = parse_solution_page(solution_html)
                 if solution_puzzle_id:
-                    final_solvers = get_leaderboard_names(session, solution_puzzle_id, timeout=timeout)
+                    # Raises rather than returning [], so a failed fetch can't
+                    # blank the stored solver list (see `enrich_puzzle`).
+                    final_solvers = fetch_leaderboard(session, solution_puzzle_id, timeout=timeout)
                     existing_ts = old_entry.get("solver_timestamps", {})
                     merged_ts = merge_solvers_with_timestamps(final_solvers, existing_ts)
                     old_entry["solvers"] = final_solvers
@@ -236,7 +332,7 @@ def _handle_month_transition(
                     old_entry["puzzle_id"] = solution_puzzle_id
                     old_entry["archived_at"] = datetime.now(timezone.utc).isoformat()
             except Exception as exc:
-                logger.warning(f"Failed to finalize old puzzle: {exc}")
+                logger.warning(f"Failed to finalize old puzzle {old_entry.get('name')}; keeping it as stored: {exc}")
             break
 
     # Step 3: Find the new puzzle's metadata from archive
@@ -296,6 +392,96 @@ def _days_since_archived(entry: Dict[str, Any]) -> Optional[int]:
     return (datetime.now(timezone.utc) - archived_dt).days
 
 
+class FreezePolicy:
+    """
+    When to stop re-fetching an archived puzzle's leaderboard.
+
+    Once a puzzle is past the LEEWAY_DAYS window, each refresh that finds its
+    leaderboard unchanged bumps `unchanged_fetches` on the entry; after
+    `after_unchanged` in a row (0: never) the entry is marked `frozen_at`.
+    With `after_days`, entries archived longer ago than that are frozen
+    without another fetch. `refresh_recent_archives` and `backfill_archives`
+    skip frozen entries unless `refresh_frozen`; a refresh that does find a
+    change thaws the entry again.
+    """
+
+    def __init__(
+        self,
+        after_unchanged: int = FREEZE_AFTER_UNCHANGED,
+        after_days: Optional[int] = None,
+        refresh_frozen: bool = False,
+    ):
+        self.after_unchanged = after_unchanged
+        self.after_days = after_days
+        self.refresh_frozen = refresh_frozen
+        self.counters: Dict[str, int] = {"skipped": 0, "frozen": 0, "thawed": 0}
+        self._lock = threading.Lock()
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _freeze(self, entry: Dict[str, Any]) -> None:
+        entry.pop("unchanged_fetches", None)
+        entry["frozen_at"] = datetime.now(timezone.utc).isoformat()
+        self.count("frozen")
+
+    def skip(self, entry: Dict[str, Any]) -> bool:
+        """True if `entry` is frozen (freezing it first if old enough) and should not be re-fetched."""
+        if not entry.get("frozen_at"):
+            age = _days_since_archived(entry)
+            if self.after_days is None or age is None or age <= max(self.after_days, LEEWAY_DAYS):
+                return False
+            self._freeze(entry)
+        if self.refresh_frozen:
+            return False
+        self.count("skipped")
+        return True
+
+    def record(self, entry: Dict[str, Any], changed: bool) -> None:
+        """Update `entry`'s freeze bookkeeping after a successful leaderboard fetch."""
+        if changed:
+            entry.pop("unchanged_fetches", None)
+            if entry.pop("frozen_at", None):
+                self.count("thawed")
+            return
+        if entry.get("frozen_at"):
+            return
+        age = _days_since_archived(entry)
+        if age is None or age <= LEEWAY_DAYS:
+            return  # late solvers are still expected; don't count (or rewrite) daily checks
+        streak = entry.get("unchanged_fetches", 0) + 1
+        if self.after_unchanged and streak >= self.after_unchanged:
+            self._freeze(entry)
+        else:
+            entry["unchanged_fetches"] = streak
+
+    def summary(self) -> str:
+        c = self.counters
+        return (
+            f"Freeze policy: skipped {c['skipped']} leaderboard fetch(es) of frozen puzzles, "
+            f"{c['frozen']} newly frozen, {c['thawed']} thawed"
+        )
+
+
+_freeze_policy = FreezePolicy()
+
+
+def configure_freeze(
+    after_unchanged: int = FREEZE_AFTER_UNCHANGED,
+    after_days: Optional[int] = None,
+    refresh_frozen: bool = False,
+) -> FreezePolicy:
+    """Replace the policy used by `refresh_recent_archives` and `backfill_archives`."""
+    global _freeze_policy
+    _freeze_policy = FreezePolicy(after_unchanged, after_days, refresh_frozen)
+    return _freeze_policy
+
+
+def get_freeze_policy() -> FreezePolicy:
+    return _freeze_policy
+
+
 def _ensure_puzzle_id(
     session,
     entry: Dict[str, Any],
@@ -321,6 +507,7 @@ def _ensure_puzzle_id(
     return pid
 
 
+@timed("pipeline.refresh_archived_entry")
 def refresh_archived_entry(
     session,
     entry: Dict[str, Any],
@@ -341,9 +528,12 @@ def refresh_archived_entry(
     if not late_solvers:
         # Still keep the leaderboard list in sync (handles renames/removals are
         # rare; only overwrite if the content actually changed).
-        if list(entry.get("solvers") or []) != fresh_solvers:
+        changed = list(entry.get("solvers") or []) != fresh_solvers
+        if changed:
             entry["solvers"] = fresh_solvers
+        _freeze_policy.record(entry, changed)
         return []
+    _freeze_policy.record(entry, True)
 
     existing_ts = entry.get("solver_timestamps", {})
     merged_ts = merge_solvers_with_timestamps(fresh_solvers, existing_ts)
@@ -356,27 +546,54 @@ def refresh_archived_entry(
     return late_solvers
 
 
+def _refresh_entries(
+    session,
+    entries: List[Dict[str, Any]],
+    timeout: int,
+    workers: int,
+) -> List[List[str]]:
+    """
+    Run `refresh_archived_entry` over `entries` on up to `workers` threads.
+    Each call only mutates its own entry; results come back in input order.
+    """
+    if workers <= 1 or len(entries) <= 1:
+        return [refresh_archived_entry(session, entry, timeout) for entry in entries]
+    pool_size = min(workers, len(entries))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=pool_size) as executor:
+        return list(executor.map(
+            lambda entry: refresh_archived_entry(session, entry, timeout),
+            entries,
+        ))
+
+
 def refresh_recent_archives(
     session,
     puzzles: List[Dict[str, Any]],
     timeout: int,
     leeway_days: int = LEEWAY_DAYS,
+    workers: int = 1,
 ) -> Dict[str, List[str]]:
     """
     Re-check archived puzzles whose archive date is within `leeway_days`,
     merging in any late solvers Jane Street has added since last run.
 
     Returns a mapping {"<date_text> - <name>": [late_solvers]} for any
-    entries that gained new names; empty if nothing changed.
+    entries that gained new names; empty if nothing changed. Frozen entries
+    are skipped (see `FreezePolicy`).
     """
-    late_by_puzzle: Dict[str, List[str]] = {}
+    due: List[Dict[str, Any]] = []
     for entry in puzzles:
         if not entry.get("solution_url"):
             continue  # current puzzle, handled elsewhere
         age = _days_since_archived(entry)
         if age is None or age < 0 or age > leeway_days:
             continue
-        late = refresh_archived_entry(session, entry, timeout)
+        if _freeze_policy.skip(entry):
+            continue
+        due.append(entry)
+
+    late_by_puzzle: Dict[str, List[str]] = {}
+    for entry, late in zip(due, _refresh_entries(session, due, timeout, workers)):
         if late:
             label = f"{entry.get('date_text', '?')} - {entry.get('name', '?')}"
             late_by_puzzle[label] = late
@@ -388,22 +605,29 @@ def backfill_archives(
     puzzles: List[Dict[str, Any]],
     timeout: int,
     months: int = 24,
+    workers: int = 1,
 ) -> Dict[str, List[str]]:
     """
     One-shot retroactive scan: re-fetch leaderboards for archived puzzles up to
     `months` old, regardless of the leeway window. Used to recover late solvers
     that were previously dropped on finalize. Stamps `puzzle_id` and
-    `archived_at` on entries that lack them.
+    `archived_at` on entries that lack them. Frozen entries are skipped
+    (see `FreezePolicy`).
     """
-    late_by_puzzle: Dict[str, List[str]] = {}
     cutoff_days = months * 31  # generous, calendar approximation
+    due: List[Dict[str, Any]] = []
     for entry in puzzles:
         if not entry.get("solution_url"):
             continue
         age = _days_since_archived(entry)
         if age is None or age < 0 or age > cutoff_days:
             continue
-        late = refresh_archived_entry(session, entry, timeout)
+        if _freeze_policy.skip(entry):
+            continue
+        due.append(entry)
+
+    late_by_puzzle: Dict[str, List[str]] = {}
+    for entry, late in zip(due, _refresh_entries(session, due, timeout, workers)):
         # Stamp archived_at so subsequent leeway-window checks work cleanly.
         if not entry.get("archived_at"):
             approx = _approx_archive_date(entry.get("date_text", ""))
@@ -440,21 +664,49 @@ def _name_from_puzzle_id(puzzle_id: str) -> str:
 # ---------------------------------------------------------------------------
 
 
+def stored_puzzle_id(meta: PuzzleMeta, existing_entry: Optional[Dict[str, Any]]) -> Optional[str]:
+    """The stored entry's `puzzle_id`, if it was recorded for the same solution page."""
+    if not existing_entry or existing_entry.get("solution_url") != meta.solution_url:
+        return None
+    return existing_entry.get("puzzle_id") or None
+
+
+@timed("pipeline.enrich_puzzle")
 def enrich_puzzle(
     session,
     meta: PuzzleMeta,
     existing_entry: Optional[Dict[str, Any]] = None,
     timeout: int = DEFAULT_TIMEOUT,
 ) -> Puzzle:
-    """Fetch leaderboard/solvers for a puzzle based on its solution page."""
+    """
+    Fetch leaderboard/solvers for a puzzle. The solution page is only
+    downloaded to find the leaderboard's `puzzle_id` when the stored entry
+    does not already carry one (see `stored_puzzle_id`); puzzles from before
+    leaderboards existed need neither request. If the fetch fails, the
+    stored solvers are kept, under the solution page the archive now lists.
+    The stored freeze bookkeeping is carried over and updated by the fetch
+    (see `FreezePolicy.record`).
+    """
     solvers: List[str] = []
-    try:
-        solution_html = fetch_html(session, meta.solution_url, timeout=timeout)
-        puzzle_id = parse_solution_page(solution_html)
-        if puzzle_id and meta.date >= datetime(2015, 11, 1):
-            solvers = get_leaderboard_names(session, puzzle_id, timeout=timeout)
-    except Exception as exc:  # pragma: no cover - network/HTML errors
-        logger.warning(f"Failed to enrich puzzle {meta.name}: {exc}")
+    fetched = False
+    puzzle_id = stored_puzzle_id(meta, existing_entry)
+    if meta.date >= LEADERBOARDS_SINCE:
+        try:
+            if not puzzle_id:
+                solution_html = fetch_html(session, meta.solution_url, timeout=timeout)
+                puzzle_id = parse_solution_page(solution_html)
+            if puzzle_id:
+                solvers = fetch_leaderboard(session, puzzle_id, timeout=timeout)
+                fetched = True
+        except Exception as exc:  # pragma: no cover - network/HTML errors
+            logger.warning(f"Failed to enrich puzzle {meta.name}: {exc}")
+            if existing_entry:
+                # The last run's current puzzle has to come back archived even
+                # so, or the store would be left with two current entries.
+                kept = _puzzle_from_entry(existing_entry)
+                kept.solution_url = meta.solution_url
+                kept.archived_at = _archived_at(existing_entry)
+                return kept
 
     # Preserve existing timestamps if available
     solver_timestamps: Dict[str, str] = {}
@@ -463,32 +715,93 @@ def enrich_puzzle(
             solvers, existing_entry["solver_timestamps"]
         )
 
+    marks: Dict[str, Any] = {}
+    if existing_entry:
+        marks = dict(existing_entry, archived_at=_archived_at(existing_entry))
+        if fetched:
+            _freeze_policy.record(marks, solvers != list(existing_entry.get("solvers") or []))
+
     return Puzzle(
         date_text=meta.date_text,
         name=meta.name,
         solution_url=meta.solution_url,
         solvers=solvers,
         solver_timestamps=solver_timestamps,
+        puzzle_id=puzzle_id,
+        archived_at=marks.get("archived_at"),
+        unchanged_fetches=marks.get("unchanged_fetches"),
+        frozen_at=marks.get("frozen_at"),
     )
 
 
-def scrape_page(
+def _archived_at(existing_entry: Optional[Dict[str, Any]]) -> Optional[str]:
+    archived_at = existing_entry.get("archived_at") if existing_entry else None
+    if existing_entry and not existing_entry.get("solution_url") and not archived_at:
+        # Stored as the current puzzle last time; it has just been archived.
+        archived_at = datetime.now(timezone.utc).isoformat()
+    return archived_at
+
+
+def _puzzle_from_entry(entry: Dict[str, Any]) -> Puzzle:
+    return Puzzle(
+        date_text=entry["date_text"],
+        name=entry["name"],
+        solution_url=entry.get("solution_url", ""),
+        solvers=entry.get("solvers", []),
+        solver_timestamps=entry.get("solver_timestamps", {}),
+        puzzle_id=entry.get("puzzle_id"),
+        archived_at=entry.get("archived_at"),
+        unchanged_fetches=entry.get("unchanged_fetches"),
+        frozen_at=entry.get("frozen_at"),
+    )
+
+
+def is_settled(
+    meta: PuzzleMeta,
+    existing_entry: Optional[Dict[str, Any]],
+    leeway_days: int = LEEWAY_DAYS,
+) -> bool:
+    """
+    True if an archived puzzle is already stored with the same solution page
+    and has left the late-solver window, so its leaderboard will not change.
+    """
+    if not meta.solution_url or not existing_entry:
+        return False
+    if existing_entry.get("solution_url") != meta.solution_url:
+        return False
+    age = _days_since_archived(existing_entry)
+    return age is not None and age > leeway_days
+
+
+def enrich_or_reuse(
     session,
-    page_url: str,
+    meta: PuzzleMeta,
+    existing_entry: Optional[Dict[str, Any]],
+    timeout: int = DEFAULT_TIMEOUT,
+    reuse_settled: bool = False,
+) -> Puzzle:
+    """`enrich_puzzle`, or the stored entry as-is when `reuse_settled` and it is settled."""
+    if reuse_settled and is_settled(meta, existing_entry):
+        return _puzzle_from_entry(existing_entry)
+    return enrich_puzzle(session, meta, existing_entry, timeout)
+
+
+def stored_remainder(
     existing: Dict[str, Dict[str, Any]],
-    timeout: int,
-    workers: int,
+    seen_keys: set,
 ) -> List[Puzzle]:
+    """Stored entries not on the pages scraped so far, in stored order."""
+    return [_puzzle_from_entry(entry) for key, entry in existing.items() if key not in seen_keys]
+
+
+def split_page_metas(
+    metas: List[PuzzleMeta],
+    existing: Dict[str, Dict[str, Any]],
+) -> Tuple[List[Puzzle], List[Tuple[PuzzleMeta, Optional[Dict[str, Any]]]]]:
     """
-    Scrape a single archive page, returning puzzle entries enriched with solvers where available.
+    Split an archive page into ready entries (puzzles without a solution yet)
+    and (meta, existing_entry) pairs that still need `enrich_puzzle`.
     """
-    try:
-        html = fetch_html(session, page_url, timeout=timeout)
-        metas = parse_archive_page(html)
-    except Exception as exc:  # pragma: no cover - network/HTML errors
-        logger.error(f"Error processing page {page_url}: {exc}")
-        return []
-
     puzzles: List[Puzzle] = []
     to_enrich: List[Tuple[PuzzleMeta, Optional[Dict[str, Any]]]] = []
 
@@ -500,15 +813,7 @@ def scrape_page(
             key = _puzzle_key(meta)
             existing_entry = existing.get(key)
             if existing_entry:
-                puzzles.append(
-                    Puzzle(
-                        date_text=existing_entry["date_text"],
-                        name=existing_entry["name"],
-                        solution_url=existing_entry.get("solution_url", ""),
-                        solvers=existing_entry.get("solvers", []),
-                        solver_timestamps=existing_entry.get("solver_timestamps", {}),
-                    )
-                )
+                puzzles.append(_puzzle_from_entry(existing_entry))
             else:
                 puzzles.append(
                     Puzzle(
@@ -518,17 +823,44 @@ def scrape_page(
                         solvers=[],
                     )
                 )
+    return puzzles, to_enrich
+
+
+def scrape_page(
+    session,
+    page_url: str,
+    existing: Dict[str, Dict[str, Any]],
+    timeout: int,
+    workers: int,
+    reuse_settled: bool = False,
+) -> Tuple[List[Puzzle], bool, bool]:
+    """
+    Scrape a single archive page, returning puzzle entries enriched with solvers
+    where available, whether every puzzle on it was already settled (see
+    `is_settled`), and whether the page could not be fetched because the site
+    is failing (as opposed to the page not existing). With `reuse_settled`,
+    settled puzzles are not re-fetched.
+    """
+    try:
+        html = fetch_html(session, page_url, timeout=timeout)
+        metas = parse_archive_page(html)
+    except Exception as exc:  # pragma: no cover - network/HTML errors
+        logger.error(f"Error processing page {page_url}: {exc}")
+        return [], False, is_upstream_failure(exc)
+
+    puzzles, to_enrich = split_page_metas(metas, existing)
+    settled = bool(metas) and all(is_settled(meta, existing.get(_puzzle_key(meta))) for meta in metas)
 
     if to_enrich:
         pool_size = max(1, min(workers, len(to_enrich)))
         with concurrent.futures.ThreadPoolExecutor(max_workers=pool_size) as executor:
             results = list(executor.map(
-                lambda args: enrich_puzzle(session, args[0], args[1], timeout),
+                lambda args: enrich_or_reuse(session, args[0], args[1], timeout, reuse_settled),
                 to_enrich,
             ))
             puzzles.extend(results)
 
-    return puzzles
+    return puzzles, settled, False
 
 
 def scrape_all(
@@ -538,9 +870,21 @@ def scrape_all(
     force_refresh: bool = False,
     workers: int = 10,
     timeout: int = DEFAULT_TIMEOUT,
+    session=None,
 ) -> List[Puzzle]:
-    session = build_session()
-    existing = {} if force_refresh else load_existing(output_path)
+    """
+    Walk the archive and rebuild the puzzle list. Unless `force_refresh`,
+    settled puzzles (see `is_settled`) are taken from the stored data
+    without fetching their solution page, and paging stops at the first
+    page made only of settled puzzles; the rest of the archive is then
+    carried over from storage. Other stored puzzles only refetch their
+    leaderboard, via the stored `puzzle_id`. Stored entries are loaded
+    lazily (see `storage.iter_puzzles`), so a forced refresh, which only
+    falls back on them if the archive fails, never decodes their timestamps.
+    """
+    session = session or build_session(pool_size=workers)
+    stored = load_existing(output_path, lazy=True)
+    existing = {} if force_refresh else stored
 
     all_puzzles: List[Puzzle] = []
     page_num = 1
@@ -549,21 +893,57 @@ def scrape_all(
     logger.info(f"Using {len(existing)} existing puzzles as reference")
 
     while True:
-        page_url = f"{base_url}{'page'+str(page_num)+'/' if page_num > 1 else ''}index.html"
+        page_url = archive_page_url(base_url, page_num)
         logger.info(f"Scraping page {page_num} at {page_url}")
 
-        page_puzzles = scrape_page(session, page_url, existing, timeout, workers)
+        page_puzzles, settled, failed = scrape_page(
+            session, page_url, existing, timeout, workers, reuse_settled=not force_refresh,
+        )
         if not page_puzzles:
+            if failed:
+                # Don't truncate the archive because the site is down.
+                rest = stored_remainder(stored, {f"{p.date_text}_{p.name}" for p in all_puzzles})
+                logger.warning(f"Archive unavailable; keeping {len(rest)} stored puzzle(s) for the rest")
+                all_puzzles.extend(rest)
             break
 
         logger.info(f"Found {len(page_puzzles)} puzzles on page {page_num}")
         all_puzzles.extend(page_puzzles)
 
+        if settled:
+            rest = stored_remainder(existing, {f"{p.date_text}_{p.name}" for p in all_puzzles})
+            logger.info(f"Page {page_num} is fully settled; reusing {len(rest)} stored puzzle(s) for the rest")
+            all_puzzles.extend(rest)
+            break
+
         if max_pages and page_num >= max_pages:
             break
 
         page_num += 1
 
+    return finalize_full_scrape(session, all_puzzles, output_path, timeout, force_refresh)
+
+
+def archive_page_url(base_url: str, page_num: int) -> str:
+    return f"{base_url}{'page'+str(page_num)+'/' if page_num > 1 else ''}index.html"
+
+
+def finalize_full_scrape(
+    session,
+    all_puzzles: List[Puzzle],
+    output_path: str,
+    timeout: int,
+    force_refresh: bool = False,
+) -> List[Puzzle]:
+    """
+    Merge the current puzzle's live leaderboard into a full scrape and save
+    it. A forced refresh that tripped the circuit breaker had no stored data
+    to fall back on, so it is discarded and the stored puzzles are returned.
+    """
+    if force_refresh and circuit_open(session):
+        logger.error("Circuit opened during a forced refresh; keeping the stored puzzles")
+        return [_puzzle_from_entry(entry) for entry in load_puzzles_list(output_path)]
+
     # Also scrape the current puzzle for timestamps
     result = scrape_current_puzzle(session, timeout=timeout)
     if result:
@@ -580,6 +960,8 @@ def scrape_all(
                     solution_url=p.solution_url,
                     solvers=fresh_solvers,
                     solver_timestamps=merged_ts,
+                    puzzle_id=puzzle_id,
+                    archived_at=p.archived_at,
                 )
                 break
 
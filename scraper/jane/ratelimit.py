@@ -0,0 +1,195 @@
+"""
+Client-side adaptive rate limiting for requests to janestreet.com.
+
+One `AdaptiveLimiter` is shared by every thread fetching through the
+sessions it is attached to (see `client.enable_rate_limit`). Requests
+take a token from a bucket refilled at the current rate and a slot under
+the current concurrency limit. Both limits follow AIMD: every healthy
+response raises them a little, and a 429, a 5xx, a network error or a
+response slower than the latency target halves them (at most once per
+cooldown window, so one burst of failures in flight counts once). A
+`Retry-After` header pauses all requests for that long. Until the first
+sign of congestion the rate grows multiplicatively (slow start), so a
+cautious starting rate does not cost a long ramp-up.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import requests
+
+from . import metrics
+
+# Statuses that mean "slow down"; they are retried through the limiter.
+THROTTLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveLimiter:
+    """
+    Token bucket plus concurrency cap, both adjusted by AIMD.
+
+    `rate` (requests/second) doubles about every second until the first
+    congestion signal and from then on grows by about `increase` per second
+    of healthy traffic; `concurrency` grows by one per window of healthy
+    responses. On congestion both are multiplied by `decrease`. `retries` is how many
+    times a throttled request is re-sent, each time through the limiter.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        max_concurrency: int = 10,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 2.0,
+        decrease: float = 0.5,
+        latency_target: float = 2.0,
+        retries: int = 3,
+    ):
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_concurrency = max(1, max_concurrency)
+        self.concurrency = float(self.max_concurrency)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.retries = retries
+        self.inflight = 0
+        self.counters: Dict[str, int] = {
+            "requests": 0, "throttled": 0, "slow": 0, "errors": 0, "decreases": 0, "retries": 0,
+        }
+        self.waited = 0.0
+        self.min_seen = self.max_seen = self.rate
+        self._tokens = 1.0
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._cooldown_until = 0.0
+        self._slow_start = True
+        self._cond = threading.Condition()
+
+    def _refill(self, now: float) -> None:
+        burst = max(1.0, self.concurrency)
+        self._tokens = min(burst, self._tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def acquire(self) -> None:
+        """Block until the bucket has a token and a concurrency slot is free."""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self.inflight >= int(self.concurrency):
+                    wait = None  # until a release
+                elif now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    self.inflight += 1
+                    self.counters["requests"] += 1
+                    self.waited += now - start
+                    return
+                else:
+                    wait = (1.0 - self._tokens) / self.rate
+                self._cond.wait(timeout=wait)
+
+    def release(self, status: Optional[int], latency: float, retry_after: Optional[float] = None) -> None:
+        """Record how a request went; `status` is None when it raised."""
+        with self._cond:
+            self.inflight -= 1
+            now = time.monotonic()
+            self._refill(now)
+            if status is None:
+                self.counters["errors"] += 1
+                congested = True
+            elif status in THROTTLE_STATUSES:
+                self.counters["throttled"] += 1
+                congested = True
+            else:
+                congested = latency > self.latency_target
+                if congested:
+                    self.counters["slow"] += 1
+
+            if congested:
+                self._slow_start = False
+                if now >= self._cooldown_until:
+                    self.rate = max(self.min_rate, self.rate * self.decrease)
+                    self.concurrency = max(1.0, self.concurrency * self.decrease)
+                    self.counters["decreases"] += 1
+                    self._cooldown_until = now + max(1.0, latency)
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            else:
+                self.rate += 1.0 if self._slow_start else self.increase / self.rate
+                if self.max_rate is not None:
+                    self.rate = min(self.max_rate, self.rate)
+                self.concurrency = min(float(self.max_concurrency), self.concurrency + 1.0 / self.concurrency)
+
+            self.min_seen = min(self.min_seen, self.rate)
+            self.max_seen = max(self.max_seen, self.rate)
+            rate, concurrency = self.rate, self.concurrency
+            self._cond.notify_all()
+        metrics.gauge("http.limiter.rate", rate)
+        metrics.gauge("http.limiter.concurrency", concurrency)
+
+    def call(
+        self,
+        send: Callable[[], requests.Response],
+        may_retry: Optional[Callable[[], bool]] = None,
+    ) -> requests.Response:
+        """
+        Run `send` under the limiter, re-sending throttled responses up to
+        `retries` times, or until `may_retry` returns False.
+        """
+        for attempt in range(self.retries + 1):
+            self.acquire()
+            start = time.monotonic()
+            try:
+                response = send()
+            except BaseException:
+                self.release(None, time.monotonic() - start)
+                raise
+            self.release(
+                response.status_code, time.monotonic() - start,
+                retry_after_seconds(response.headers.get("Retry-After")),
+            )
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.retries:
+                return response
+            if may_retry is not None and not may_retry():
+                return response
+            with self._cond:
+                self.counters["retries"] += 1
+            metrics.count("http.retries")
+        return response
+
+    def summary(self) -> str:
+        c = self.counters
+        return (
+            f"Rate limiter: {c['requests']} request(s), rate now {self.rate:.1f}/s "
+            f"(range {self.min_seen:.1f}-{self.max_seen:.1f}/s), concurrency {int(self.concurrency)}, "
+            f"{c['throttled']} throttled, {c['slow']} slow, {c['errors']} failed, "
+            f"{c['decreases']} backoff(s), {c['retries']} retried, {self.waited:.1f}s waiting"
+        )
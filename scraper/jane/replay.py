@@ -0,0 +1,279 @@
+"""
+Record/replay of janestreet.com responses for offline runs.
+
+`FixtureRecorder` wraps the transport adapter of every session built by
+`client.build_session` (see `client.enable_fixtures`) and keeps each
+response it sees, with how long it took, in a `FixtureArchive`: one
+gzipped JSON file holding, per URL, the responses in the order they were
+served. `FixtureReplayer` mounts an adapter that answers from such an
+archive instead of the network. A URL answered several times replays its
+responses in order and then keeps repeating the last one, so a recording
+that spans a change upstream (a new puzzle, a month rolling over) plays
+back the same way. Unrecorded URLs get a 404.
+
+Replayed responses are delayed by their recorded latency (scaled), or by
+a fixed latency, and a seeded share of attempts can be turned into
+connection resets, timeouts or throttling statuses. Everything below the
+adapter — urllib3's retries, the rate limiter, the circuit breaker, the
+HTTP cache — runs as it would against the real site.
+"""
+
+from __future__ import annotations
+
+import base64
+import gzip
+import io
+import json
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from http.client import responses as REASONS
+from typing import Any, Dict, List, Optional, Sequence
+
+import requests
+from loguru import logger
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+from urllib3.response import HTTPResponse
+
+from .writers import atomic_write
+
+FIXTURE_VERSION = 1
+# Response headers worth replaying; the rest (cookies, CDN noise) are dropped.
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control", "Retry-After")
+ERROR_KINDS = ("reset", "timeout", "429", "503")
+
+
+class FixtureArchive:
+    """Recorded responses by URL, in the order they were served."""
+
+    def __init__(self, responses: Optional[Dict[str, List[Dict[str, Any]]]] = None, recorded_at: Optional[str] = None):
+        self.responses: Dict[str, List[Dict[str, Any]]] = responses or {}
+        self.recorded_at = recorded_at
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.responses.values())
+
+    def add(self, url: str, status: int, headers: Dict[str, str], body: bytes, latency: float) -> None:
+        entry: Dict[str, Any] = {"status": status, "latency": round(latency, 4)}
+        kept = {name: headers[name] for name in KEPT_HEADERS if name in headers}
+        if kept:
+            entry["headers"] = kept
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body"] = base64.b64encode(body).decode("ascii")
+            entry["base64"] = True
+        with self._lock:
+            self.responses.setdefault(url, []).append(entry)
+
+    @staticmethod
+    def body(entry: Dict[str, Any]) -> bytes:
+        if entry.get("base64"):
+            return base64.b64decode(entry["body"])
+        return entry["body"].encode("utf-8")
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            payload = {
+                "version": FIXTURE_VERSION,
+                "recordedAt": self.recorded_at or datetime.now(timezone.utc).isoformat(),
+                "responses": self.responses,
+            }
+            data = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        atomic_write(path, gzip.compress(data, mtime=0))
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureArchive":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("version") != FIXTURE_VERSION:
+            raise ValueError(f"{path}: unsupported fixture version {payload.get('version')!r}")
+        return cls(payload["responses"], payload.get("recordedAt"))
+
+
+class RecordingAdapter(BaseAdapter):
+    """Send through `inner` and record every response in `recorder`."""
+
+    def __init__(self, recorder: "FixtureRecorder", inner: BaseAdapter):
+        super().__init__()
+        self.recorder = recorder
+        self.inner = inner
+
+    # `client._budget_retries` swaps the retry policy of mounted adapters.
+    @property
+    def max_retries(self):
+        return self.inner.max_retries
+
+    @max_retries.setter
+    def max_retries(self, value) -> None:
+        self.inner.max_retries = value
+
+    def send(self, request, **kwargs):
+        url = request.url  # before `inner` can rewrite it
+        start = time.perf_counter()
+        response = self.inner.send(request, **kwargs)
+        body = response.content
+        self.recorder.record(url, response, body, time.perf_counter() - start)
+        return response
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class FixtureRecorder:
+    """Collects what sessions fetch into an archive written by `save`."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.archive = FixtureArchive()
+        self.counters: Dict[str, int] = {"recorded": 0, "skipped": 0}
+        self._lock = threading.Lock()
+
+    def adapter(self, inner: BaseAdapter) -> BaseAdapter:
+        return RecordingAdapter(self, inner)
+
+    def record(self, url: str, response: requests.Response, body: bytes, latency: float) -> None:
+        # A 304 only makes sense to the cache that asked for it.
+        if response.status_code == 304:
+            with self._lock:
+                self.counters["skipped"] += 1
+            return
+        self.archive.add(url, response.status_code, response.headers, body, latency)
+        with self._lock:
+            self.counters["recorded"] += 1
+
+    def save(self) -> None:
+        self.archive.save(self.path)
+        logger.info(f"Recorded {len(self.archive)} response(s) for {len(self.archive.responses)} URL(s) to {self.path}")
+
+    def summary(self) -> str:
+        c = self.counters
+        return f"HTTP recording: {c['recorded']} response(s) recorded, {c['skipped']} 304(s) skipped"
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Answer requests from `replayer` instead of the network, honouring `max_retries`."""
+
+    def __init__(self, replayer: "FixtureReplayer", max_retries=None):
+        super().__init__(max_retries=max_retries if max_retries is not None else 0)
+        self.replayer = replayer
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        retries = self.max_retries
+        while True:
+            status, headers, body, error = self.replayer.attempt(request.url)
+            if error is not None:
+                try:
+                    retries = retries.increment(request.method, request.url, error=error)
+                except MaxRetryError as exc:
+                    if isinstance(error, ReadTimeoutError):
+                        raise requests.exceptions.ReadTimeout(exc, request=request)
+                    raise requests.exceptions.ConnectionError(exc, request=request)
+                retries.sleep()
+                continue
+            raw = HTTPResponse(
+                body=io.BytesIO(body),
+                headers=headers,
+                status=status,
+                reason=REASONS.get(status),
+                preload_content=False,
+                decode_content=False,
+                request_method=request.method,
+                retries=retries,
+            )
+            if retries.is_retry(request.method, status, "Retry-After" in headers):
+                try:
+                    retries = retries.increment(request.method, request.url, response=raw)
+                except MaxRetryError:
+                    if retries.raise_on_status:
+                        raise requests.exceptions.RetryError(f"{request.url}: too many {status} responses", request=request)
+                    return self.build_response(request, raw)
+                retries.sleep(raw)
+                continue
+            return self.build_response(request, raw)
+
+
+class FixtureReplayer:
+    """
+    Serves an archive back. `latency` fixes the delay of every attempt in
+    seconds; left as None each response takes its recorded latency times
+    `latency_scale`. `error_rate` of attempts fail with one of `errors`
+    (see `ERROR_KINDS`) drawn from a generator seeded with `seed`; an
+    injected timeout fails at once rather than after the request timeout.
+    """
+
+    def __init__(
+        self,
+        archive: FixtureArchive,
+        latency: Optional[float] = None,
+        latency_scale: float = 1.0,
+        error_rate: float = 0.0,
+        errors: Sequence[str] = ("reset", "503"),
+        seed: int = 0,
+    ):
+        unknown = set(errors) - set(ERROR_KINDS)
+        if unknown:
+            raise ValueError(f"unknown error kind(s): {', '.join(sorted(unknown))}")
+        self.archive = archive
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.error_rate = error_rate
+        self.errors = tuple(errors)
+        self.counters: Dict[str, int] = {"served": 0, "missing": 0, "injected": 0}
+        self._cursors: Dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "FixtureReplayer":
+        return cls(FixtureArchive.load(path), **kwargs)
+
+    def adapter(self, inner: Optional[BaseAdapter] = None) -> ReplayAdapter:
+        return ReplayAdapter(self, getattr(inner, "max_retries", None))
+
+    def _next(self, url: str) -> Optional[Dict[str, Any]]:
+        entries = self.archive.responses.get(url)
+        if not entries:
+            return None
+        n = self._cursors.get(url, 0)
+        self._cursors[url] = n + 1
+        return entries[min(n, len(entries) - 1)]
+
+    def attempt(self, url: str):
+        """(status, headers, body, error) for one attempt at `url`; `error` is an exception to retry on."""
+        with self._lock:
+            injected = self._rng.choice(self.errors) if self.errors and self._rng.random() < self.error_rate else None
+            entry = None if injected else self._next(url)
+            if injected:
+                self.counters["injected"] += 1
+            elif entry is None:
+                self.counters["missing"] += 1
+            else:
+                self.counters["served"] += 1
+        if self.latency is not None:
+            delay = self.latency
+        else:
+            delay = (entry or {}).get("latency", 0.0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+        if injected == "reset":
+            return 0, {}, b"", ProtocolError("Connection aborted.", ConnectionResetError("injected reset"))
+        if injected == "timeout":
+            return 0, {}, b"", ReadTimeoutError(None, url, "injected timeout")
+        if injected:
+            return int(injected), {"Content-Type": "text/plain"}, b"injected error", None
+        if entry is None:
+            logger.debug(f"No recorded response for {url}")
+            return 404, {"Content-Type": "text/plain"}, b"not recorded", None
+        return entry["status"], dict(entry.get("headers") or {}), FixtureArchive.body(entry), None
+
+    def summary(self) -> str:
+        c = self.counters
+        return (
+            f"HTTP replay: {c['served']} response(s) served, {c['missing']} unrecorded URL(s) "
+            f"answered 404, {c['injected']} injected error(s)"
+        )
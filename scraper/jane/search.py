@@ -0,0 +1,232 @@
+"""
+Solver-name search index, written next to the stats shards.
+
+Names are folded for matching (`fold`: NFKD, combining marks dropped,
+casefolded, a few letters without a decomposition spelled out,
+apostrophes dropped, anything else that is not a letter or digit turned
+into a single space), so "rodriguez" finds "Francisco Rodríguez-Carretero
+Roldán" and "oneill" finds "Rachel O’Neill". Solver ids are positions in
+`topSolvers`, so a smaller id is the better-ranked solver. The index has
+two parts:
+
+    prefix    sorted (key, id) table; the keys of a name are its folded form
+              from the start of every word (and of every CJK character), so
+              a query matches word prefixes anywhere in the name
+    trigrams  postings (sorted, delta-encoded ids) for each trigram of the
+              padded folded names, for typo-tolerant matching
+
+Both are split into shards by FNV-1a of the key's first character /
+of the trigram, so a client only loads the shards a query touches.
+`SearchIndex.search` returns prefix matches in rank order, topped up with
+trigram matches by similarity.
+"""
+
+from __future__ import annotations
+
+import bisect
+import heapq
+import json
+import math
+import os
+import unicodedata
+from collections import Counter
+from itertools import accumulate
+from typing import Any, Dict, List, Tuple
+
+from .writers import prune_directory, write_json, write_json_body
+
+SEARCH_DIR = "search"
+PREFIX_SHARDS = 32
+TRIGRAM_SHARDS = 64
+MIN_SIMILARITY = 0.3
+
+# Letters NFKD does not split into base letter + mark.
+_SPELLED_OUT = str.maketrans({
+    "ø": "o", "ł": "l", "đ": "d", "ð": "d", "ħ": "h", "ı": "i", "ŧ": "t",
+    "æ": "ae", "œ": "oe", "þ": "th", "ß": "ss",
+    "'": None, "’": None, "ʼ": None, "`": None,
+})
+
+
+def fold(name: str) -> str:
+    """Normalized form of `name` used for matching (see module docstring)."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(ch for ch in decomposed if unicodedata.category(ch) != "Mn")
+    lowered = stripped.casefold().translate(_SPELLED_OUT)
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in lowered).split())
+
+
+def _is_cjk(ch: str) -> bool:
+    return unicodedata.east_asian_width(ch) in ("W", "F") and ch.isalnum()
+
+
+def name_keys(folded: str) -> List[str]:
+    """Suffixes of `folded` starting at each word, and at each wide (CJK) character."""
+    keys = []
+    for i, ch in enumerate(folded):
+        if ch == " ":
+            continue
+        if i == 0 or folded[i - 1] == " " or _is_cjk(ch):
+            keys.append(folded[i:])
+    return keys
+
+
+def trigrams(folded: str) -> List[str]:
+    padded = f"  {folded} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def fnv1a_bucket(text: str, buckets: int) -> int:
+    """
+    FNV-1a (32-bit) of the UTF-8 `text`, mod `buckets`. Also places solver
+    profiles (`aggregator.profile_bucket`); the frontend mirrors it.
+    """
+    h = 0x811C9DC5
+    for byte in text.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return h % buckets
+
+
+def prefix_shard(key: str) -> int:
+    return fnv1a_bucket(key[:1], PREFIX_SHARDS)
+
+
+def trigram_shard(gram: str) -> int:
+    return fnv1a_bucket(gram, TRIGRAM_SHARDS)
+
+
+def build_search_shards(names: List[str]) -> Dict[str, Any]:
+    """{relative path: payload} for the index over `names` (in rank order)."""
+    prefix: List[List[Tuple[str, int]]] = [[] for _ in range(PREFIX_SHARDS)]
+    postings: List[Dict[str, List[int]]] = [{} for _ in range(TRIGRAM_SHARDS)]
+    gram_counts: List[int] = []
+    for sid, name in enumerate(names):
+        folded = fold(name)
+        for key in name_keys(folded):
+            prefix[prefix_shard(key)].append((key, sid))
+        grams = trigrams(folded) if folded else []
+        gram_counts.append(len(grams))
+        for gram in grams:
+            postings[trigram_shard(gram)].setdefault(gram, []).append(sid)
+
+    shards: Dict[str, Any] = {"names.json": {"names": names, "trigramCounts": gram_counts}}
+    for n, table in enumerate(prefix):
+        table.sort()
+        shards[f"prefix-{n:02d}.json"] = {"keys": [k for k, _ in table], "ids": [i for _, i in table]}
+    for n, grams in enumerate(postings):
+        shards[f"trigrams-{n:02d}.json"] = {
+            gram: [ids[0]] + [b - a for a, b in zip(ids, ids[1:])]
+            for gram, ids in sorted(grams.items())
+        }
+    return shards
+
+
+def save_search_index(directory: str, names: List[str]) -> Dict[str, Any]:
+    """Write the index shards and a `manifest.json` into `directory`; return the manifest."""
+    shards = build_search_shards(names)
+    entries: Dict[str, Dict[str, Any]] = {}
+    for rel_path, payload in shards.items():
+        body, _ = write_json_body(os.path.join(directory, rel_path), payload, compact=True, ensure_ascii=False)
+        entries[rel_path] = {"bytes": len(body)}
+    prune_directory(directory, list(shards) + ["manifest.json"])
+    manifest = {
+        "names": len(names),
+        "prefixShards": PREFIX_SHARDS,
+        "trigramShards": TRIGRAM_SHARDS,
+        "files": entries,
+    }
+    write_json(os.path.join(directory, "manifest.json"), manifest)
+    return manifest
+
+
+class SearchIndex:
+    """
+    Query side of the index. `load` reads shards from a directory on first
+    use; `from_names` builds the same structures in memory.
+    """
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._shards: Dict[str, Any] = {}
+        self._decoded: Dict[str, List[int]] = {}
+        meta = self._shard("names.json")
+        self.names: List[str] = meta["names"]
+        self._gram_counts: List[int] = meta["trigramCounts"]
+
+    @classmethod
+    def load(cls, directory: str) -> "SearchIndex":
+        def loader(rel_path: str) -> Any:
+            with open(os.path.join(directory, rel_path), "r", encoding="utf-8") as f:
+                return json.load(f)
+        return cls(loader)
+
+    @classmethod
+    def from_names(cls, names: List[str]) -> "SearchIndex":
+        return cls(build_search_shards(names).__getitem__)
+
+    def _shard(self, rel_path: str) -> Any:
+        shard = self._shards.get(rel_path)
+        if shard is None:
+            shard = self._shards[rel_path] = self._loader(rel_path)
+        return shard
+
+    def prefix_ids(self, folded: str, limit: int) -> List[int]:
+        """The `limit` best-ranked ids of names with a word starting with `folded`."""
+        table = self._shard(f"prefix-{prefix_shard(folded):02d}.json")
+        keys = table["keys"]
+        lo = bisect.bisect_left(keys, folded)
+        hi = bisect.bisect_left(keys, folded + "\U0010ffff", lo)
+        matches = table["ids"][lo:hi]
+        # A name can match through several of its words; widen until `limit` distinct ids.
+        wanted = limit
+        while True:
+            ids = sorted(set(heapq.nsmallest(wanted, matches)))
+            if len(ids) >= limit or wanted >= len(matches):
+                return ids[:limit]
+            wanted *= 2
+
+    def _postings(self, gram: str) -> List[int]:
+        ids = self._decoded.get(gram)
+        if ids is None:
+            deltas = self._shard(f"trigrams-{trigram_shard(gram):02d}.json").get(gram, [])
+            ids = self._decoded[gram] = list(accumulate(deltas))
+        return ids
+
+    def fuzzy_ids(self, folded: str, min_similarity: float = MIN_SIMILARITY) -> List[Tuple[float, int]]:
+        """(Dice similarity over trigrams, id) pairs above `min_similarity`, most similar first."""
+        grams = trigrams(folded)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings(gram))
+        # Dice >= t needs at least this many shared trigrams whatever the name's length.
+        need = math.ceil(min_similarity * (len(grams) + 1) / 2)
+        counts, size = self._gram_counts, len(grams)
+        scored = []
+        for sid, hits in shared.items():
+            if hits >= need:
+                score = 2.0 * hits / (size + counts[sid])
+                if score >= min_similarity:
+                    scored.append((score, sid))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        return scored
+
+    def search(self, query: str, limit: int = 10, fuzzy: bool = True) -> List[str]:
+        """Names matching `query`: word-prefix matches by rank, then fuzzy matches by similarity."""
+        folded = fold(query)
+        if not folded:
+            return []
+        ids = self.prefix_ids(folded, limit)
+        if fuzzy and len(ids) < limit and len(folded) >= 3:
+            seen = set(ids)
+            for _, sid in self.fuzzy_ids(folded):
+                if sid not in seen:
+                    ids.append(sid)
+                    seen.add(sid)
+                    if len(ids) == limit:
+                        break
+        return [self.names[sid] for sid in ids]
+
+
+def search_names(directory: str, query: str, limit: int = 10) -> List[str]:
+    """One-off query against an index written by `save_search_index`."""
+    return SearchIndex.load(directory).search(query, limit=limit)
@@ -0,0 +1,415 @@
+"""
+SQLite store for the puzzle list, with solver and puzzle-date indexes.
+
+Tables:
+
+    puzzles    one row per entry, in list order (`position`); the usual
+               fields as columns, `fields` keeps the key order and `extra`
+               any other keys, so loading yields the same dicts as data.json
+    solvers    interned solver names (unique index on `name`)
+    solves     (puzzle, rank, solver): the leaderboard, indexed by solver
+    sightings  (puzzle, ord, solver, seen_at): `solver_timestamps`
+
+`load_puzzles_sqlite` / `save_puzzles_sqlite` give `storage` the same
+load/save surface as data.json; `build_stats_from_db` computes stats.json
+with the heavy aggregation (per-solver counts, first/last solves, streaks,
+participation, growth) done in SQL (`aggregator.build_stats` uses it for
+`--stats-backend sqlite` on a `--sqlite` store); `puzzles_solved_by` backs
+`--solved-by` with the solver index.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .aggregator import _parse_date
+from .incremental import _month_index, _month_label
+
+SQLITE_SUFFIX = ".sqlite"
+SCHEMA_VERSION = 1
+
+# Keys stored in their own columns; everything else goes to `extra`.
+_COLUMNS = ("date_text", "name", "solution_url", "puzzle_id", "archived_at")
+_LEADERBOARD = ("solvers", "solver_timestamps")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS puzzles (
+    id INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL UNIQUE,
+    date_text TEXT,
+    name TEXT,
+    solution_url TEXT,
+    puzzle_id TEXT,
+    archived_at TEXT,
+    month INTEGER,
+    fields TEXT NOT NULL,
+    extra TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS puzzles_month ON puzzles (month);
+CREATE TABLE IF NOT EXISTS solvers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS solves (
+    puzzle INTEGER NOT NULL REFERENCES puzzles (id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    solver INTEGER NOT NULL REFERENCES solvers (id),
+    PRIMARY KEY (puzzle, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS solves_solver ON solves (solver, puzzle);
+CREATE TABLE IF NOT EXISTS sightings (
+    puzzle INTEGER NOT NULL REFERENCES puzzles (id) ON DELETE CASCADE,
+    ord INTEGER NOT NULL,
+    solver INTEGER NOT NULL REFERENCES solvers (id),
+    seen_at TEXT,
+    PRIMARY KEY (puzzle, ord)
+) WITHOUT ROWID;
+"""
+
+
+def is_sqlite_path(file_path: str) -> bool:
+    return file_path.endswith(SQLITE_SUFFIX)
+
+
+def connect(file_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(file_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    elif version != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"{file_path} has schema version {version}, expected {SCHEMA_VERSION}")
+    return conn
+
+
+def _month_or_none(date_text: Any) -> Optional[int]:
+    return _month_index(date_text) if isinstance(date_text, str) else None
+
+
+def _key(entry: Dict[str, Any]) -> str:
+    return f"{entry.get('date_text', '')}_{entry.get('name', '')}"
+
+
+def _same(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    # Dict equality ignores key order, which data.json round trips preserve.
+    return (
+        a == b and list(a) == list(b)
+        and list(a.get("solver_timestamps") or {}) == list(b.get("solver_timestamps") or {})
+    )
+
+
+def write_puzzles(conn: sqlite3.Connection, puzzles: List[Dict[str, Any]]) -> None:
+    """
+    Make the stored puzzle list equal to `puzzles` in one transaction.
+    Entries that are unchanged (matched by date and name) keep their rows
+    and only move position, so a daily run rewrites just the puzzles whose
+    leaderboard moved.
+    """
+    stored = read_puzzles(conn, with_ids=True)
+    by_key = {_key(p): (pid, p) for pid, p in stored}
+    keep: Dict[int, int] = {}
+    changed: List[Tuple[int, Dict[str, Any]]] = []
+    for position, p in enumerate(puzzles):
+        match = by_key.pop(_key(p), None)
+        if match is not None and _same(match[1], p):
+            keep[match[0]] = position
+        else:
+            changed.append((position, p))
+    stale = [pid for pid, _ in stored if pid not in keep]
+
+    with conn:
+        # Cascades to solves and sightings.
+        conn.executemany("DELETE FROM puzzles WHERE id = ?", ((pid,) for pid in stale))
+        # Two passes so the UNIQUE position never collides mid-update.
+        conn.executemany("UPDATE puzzles SET position = -1 - position WHERE id = ?", ((pid,) for pid in keep))
+        conn.executemany("UPDATE puzzles SET position = ? WHERE id = ?", ((pos, pid) for pid, pos in keep.items()))
+
+        names = {
+            name for _, p in changed
+            for name in [*(p.get("solvers") or []), *(p.get("solver_timestamps") or {})]
+        }
+        conn.executemany("INSERT OR IGNORE INTO solvers (name) VALUES (?)", ((n,) for n in names))
+        ids = dict(conn.execute("SELECT name, id FROM solvers")) if names else {}
+
+        solves: List[Tuple[int, int, int]] = []
+        sightings: List[Tuple[int, int, int, Any]] = []
+        for position, p in changed:
+            extra = {k: v for k, v in p.items() if k not in _COLUMNS and k not in _LEADERBOARD}
+            cursor = conn.execute(
+                "INSERT INTO puzzles (position, date_text, name, solution_url, puzzle_id, archived_at,"
+                " month, fields, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    position, *(p.get(k) for k in _COLUMNS), _month_or_none(p.get("date_text")),
+                    json.dumps(list(p)), json.dumps(extra, ensure_ascii=False),
+                ),
+            )
+            puzzle = cursor.lastrowid
+            solves.extend((puzzle, rank, ids[name]) for rank, name in enumerate(p.get("solvers") or []))
+            sightings.extend(
+                (puzzle, order, ids[name], ts)
+                for order, (name, ts) in enumerate((p.get("solver_timestamps") or {}).items())
+            )
+        conn.executemany("INSERT INTO solves VALUES (?, ?, ?)", solves)
+        conn.executemany("INSERT INTO sightings VALUES (?, ?, ?, ?)", sightings)
+        if stale:
+            conn.execute(
+                "DELETE FROM solvers WHERE id NOT IN (SELECT solver FROM solves)"
+                " AND id NOT IN (SELECT solver FROM sightings)"
+            )
+
+
+def read_puzzles(conn: sqlite3.Connection, with_ids: bool = False) -> List[Any]:
+    """The stored puzzle list; `with_ids` pairs each entry with its row id."""
+    names = dict(conn.execute("SELECT id, name FROM solvers"))
+    solvers: Dict[int, List[str]] = {}
+    for puzzle, solver in conn.execute("SELECT puzzle, solver FROM solves ORDER BY puzzle, rank"):
+        solvers.setdefault(puzzle, []).append(names[solver])
+    timestamps: Dict[int, Dict[str, Any]] = {}
+    for puzzle, solver, seen_at in conn.execute(
+        "SELECT puzzle, solver, seen_at FROM sightings ORDER BY puzzle, ord"
+    ):
+        timestamps.setdefault(puzzle, {})[names[solver]] = seen_at
+
+    puzzles = []
+    for row in conn.execute(
+        "SELECT id, date_text, name, solution_url, puzzle_id, archived_at, fields, extra"
+        " FROM puzzles ORDER BY position"
+    ):
+        puzzle, values, fields, extra = row[0], dict(zip(_COLUMNS, row[1:6])), row[6], row[7]
+        values.update(json.loads(extra))
+        values["solvers"] = solvers.get(puzzle, [])
+        values["solver_timestamps"] = timestamps.get(puzzle, {})
+        entry = {key: values[key] for key in json.loads(fields)}
+        puzzles.append((puzzle, entry) if with_ids else entry)
+    return puzzles
+
+
+def load_puzzles_sqlite(file_path: str) -> List[Dict[str, Any]]:
+    with closing(connect(file_path)) as conn:
+        return read_puzzles(conn)
+
+
+def save_puzzles_sqlite(file_path: str, puzzles: List[Dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    with closing(connect(file_path)) as conn:
+        write_puzzles(conn, puzzles)
+
+
+def puzzles_solved_by(file_path: str, solver: str) -> List[Dict[str, Any]]:
+    """Puzzles `solver` is on the leaderboard of, newest first, with their 1-based rank."""
+    with closing(connect(file_path)) as conn:
+        rows = conn.execute(
+            "SELECT p.date_text, p.name, p.solution_url, s.rank + 1 FROM solves s"
+            " JOIN solvers n ON n.id = s.solver JOIN puzzles p ON p.id = s.puzzle"
+            " WHERE n.name = ? ORDER BY p.month DESC, p.position",
+            (solver,),
+        ).fetchall()
+    return [{"date_text": d, "name": n, "solution_url": u, "rank": r} for d, n, u, r in rows]
+
+
+def _order_puzzles(conn: sqlite3.Connection) -> None:
+    """
+    Fill TEMP table `ord` with each puzzle's position in `build_stats`'
+    newest-first order and its month index. The order is computed with the
+    same date parsing as `build_stats` so every tie-break carries over.
+    """
+    rows = conn.execute("SELECT id, date_text FROM puzzles ORDER BY position").fetchall()
+    ordered = sorted(rows, key=lambda r: _parse_date(r[1] if isinstance(r[1], str) else ""), reverse=True)
+    conn.execute("DROP TABLE IF EXISTS temp.ord")
+    conn.execute("CREATE TEMP TABLE ord (puzzle INTEGER PRIMARY KEY, sort_pos INTEGER, month INTEGER)")
+    conn.executemany(
+        "INSERT INTO temp.ord VALUES (?, ?, ?)",
+        ((pid, pos, _month_index(date_text if isinstance(date_text, str) else ""))
+         for pos, (pid, date_text) in enumerate(ordered)),
+    )
+
+
+# Per-solver aggregates. `enc` is the first (newest-first position, rank),
+# which is the order build_stats meets solvers in; `first_key` picks the
+# earliest month, newest-first position breaking ties within it; `last_pos`
+# is the newest puzzle.
+_SOLVER_AGG = """
+WITH s AS (
+    SELECT solves.solver, o.sort_pos, o.month, solves.rank
+    FROM solves JOIN temp.ord o ON o.puzzle = solves.puzzle
+)
+SELECT solver, COUNT(*) AS cnt, MIN(sort_pos * 1000000000 + rank) AS enc,
+       MIN(month * 1000000 + sort_pos) AS first_key, MIN(sort_pos) AS last_pos
+FROM s GROUP BY solver
+"""
+
+# Best run of consecutive active months per solver (gaps and islands),
+# longest first and earliest on ties.
+_STREAKS = """
+WITH active AS (
+    SELECT DISTINCT solves.solver, o.month
+    FROM solves JOIN temp.ord o ON o.puzzle = solves.puzzle
+), islands AS (
+    SELECT solver, month, month - ROW_NUMBER() OVER (PARTITION BY solver ORDER BY month) AS grp
+    FROM active
+), runs AS (
+    SELECT solver, MIN(month) AS start, COUNT(*) AS length FROM islands GROUP BY solver, grp
+    HAVING COUNT(*) >= 2
+), ranked AS (
+    SELECT solver, start, length,
+           ROW_NUMBER() OVER (PARTITION BY solver ORDER BY length DESC, start) AS pick
+    FROM runs
+)
+SELECT solver, start, length FROM ranked WHERE pick = 1
+"""
+
+_PARTICIPATION = """
+SELECT o.month, COUNT(DISTINCT solves.solver)
+FROM solves JOIN temp.ord o ON o.puzzle = solves.puzzle GROUP BY o.month
+"""
+
+_MOST_SOLVED = """
+SELECT p.name, p.solution_url, p.fields, o.month, COUNT(s.rank) AS solved
+FROM puzzles p JOIN temp.ord o ON o.puzzle = p.id LEFT JOIN solves s ON s.puzzle = p.id
+GROUP BY p.id ORDER BY solved DESC, o.sort_pos LIMIT 20
+"""
+
+
+def _sampled(months: List[int]) -> List[int]:
+    if len(months) > 48:
+        return [m for idx, m in enumerate(months) if idx % 3 == 0 or idx == len(months) - 1]
+    return months
+
+
+def _current_progress(conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+    row = conn.execute(
+        "SELECT p.id, p.name, p.date_text FROM puzzles p JOIN temp.ord o ON o.puzzle = p.id"
+        " WHERE EXISTS (SELECT 1 FROM sightings WHERE puzzle = p.id) ORDER BY o.sort_pos LIMIT 1"
+    ).fetchone()
+    if row is None:
+        return None
+    puzzle, name, date_text = row
+    timeline = conn.execute(
+        "SELECT n.name, s.seen_at FROM sightings s JOIN solvers n ON n.id = s.solver"
+        " WHERE s.puzzle = ? ORDER BY s.seen_at, s.ord",
+        (puzzle,),
+    ).fetchall()
+    solver_count = conn.execute("SELECT COUNT(*) FROM solves WHERE puzzle = ?", (puzzle,)).fetchone()[0]
+    return {
+        "puzzleName": name or "",
+        "puzzleDate": date_text or "",
+        "solverCount": solver_count,
+        "timeline": [{"solver": n, "timestamp": ts} for n, ts in timeline],
+    }
+
+
+def build_stats_sql(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """`aggregator.build_stats` over the puzzles stored in `conn`."""
+    _order_puzzles(conn)
+    names = dict(conn.execute("SELECT id, name FROM solvers"))
+    date_texts = {
+        pos: date_text if isinstance(date_text, str) else "N/A"
+        for pos, date_text in conn.execute(
+            "SELECT o.sort_pos, p.date_text FROM puzzles p JOIN temp.ord o ON o.puzzle = p.id"
+        )
+    }
+
+    # Encounter order is build_stats' solver_map order; topSolvers is a stable
+    # sort of it by count.
+    solvers = sorted(conn.execute(_SOLVER_AGG).fetchall(), key=lambda r: r[2])
+    top = sorted(solvers, key=lambda r: -r[1])
+    rank_of = {row[0]: idx for idx, row in enumerate(top)}
+
+    streaks = sorted(
+        conn.execute(_STREAKS).fetchall(), key=lambda r: (-r[2], rank_of[r[0]])
+    )[:20]
+    longest_streaks = [
+        {
+            "solver": names[solver],
+            "start": _month_label(start),
+            "end": _month_label(start + length - 1),
+            "length": length,
+        }
+        for solver, start, length in streaks
+    ]
+
+    now = datetime.now(timezone.utc)
+    one_year_ago = (now.year - 1) * 12 + now.month - 1
+    rising = []
+    for solver, count, _, first_key, _ in solvers:
+        month = first_key // 1000000
+        if month >= one_year_ago and count >= 3:
+            months_since = max(1, (now.year - month // 12) * 12 + (now.month - month % 12 - 1))
+            rising.append({
+                "solver": names[solver],
+                "puzzlesSolved": count,
+                "solveRate": count / months_since,
+                "firstAppearance": date_texts[first_key % 1000000],
+            })
+    rising.sort(key=lambda s: -s["solveRate"])
+
+    months = [m for (m,) in conn.execute("SELECT DISTINCT month FROM temp.ord ORDER BY month")]
+    participation = dict(conn.execute(_PARTICIPATION).fetchall())
+    new_by_month: Dict[int, int] = {}
+    for _, _, _, first_key, _ in solvers:
+        month = first_key // 1000000
+        new_by_month[month] = new_by_month.get(month, 0) + 1
+    solvers_growth, total = [], 0
+    for month in months:
+        total += new_by_month.get(month, 0)
+        solvers_growth.append({"month": _month_label(month), "totalSolvers": total})
+    if solvers_growth:
+        solvers_growth[-1]["totalSolvers"] = len(solvers)
+
+    most_solved = []
+    for name, solution_url, fields, month, solved in conn.execute(_MOST_SOLVED):
+        keys = json.loads(fields)
+        most_solved.append({
+            "id": f"{month // 12}-{month % 12 + 1}",
+            "name": name if "name" in keys else "Unknown",
+            "solvers": solved,
+            "solution_url": solution_url if "solution_url" in keys else "",
+        })
+
+    counts = [row[1] for row in solvers]
+    return {
+        "totalPuzzles": conn.execute("SELECT COUNT(*) FROM puzzles").fetchone()[0],
+        "uniqueSolvers": len(solvers),
+        "solverDistribution": {
+            "onePuzzle": sum(1 for c in counts if c == 1),
+            "twoToNine": sum(1 for c in counts if 2 <= c <= 9),
+            "tenPlus": sum(1 for c in counts if c >= 10),
+        },
+        "topSolvers": [
+            {
+                "name": names[solver],
+                "puzzlesSolved": count,
+                "firstAppearance": date_texts[first_key % 1000000],
+                "lastSolve": date_texts[last_pos],
+            }
+            for solver, count, _, first_key, last_pos in top
+        ],
+        "longestStreaks": longest_streaks,
+        "risingStars": rising[:20],
+        "monthlyParticipation": [
+            {"month": _month_label(m), "solvers": participation.get(m, 0)} for m in _sampled(months)
+        ],
+        "solversGrowth": solvers_growth,
+        "mostSolvedPuzzles": most_solved,
+        "currentPuzzleProgress": _current_progress(conn),
+        "generatedAt": now.isoformat(),
+    }
+
+
+def build_stats_from_db(file_path: str) -> Dict[str, Any]:
+    with closing(connect(file_path)) as conn:
+        return build_stats_sql(conn)
+
+
+def build_stats_sqlite(puzzles: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """`build_stats` through an in-memory database, for puzzles not stored in SQLite."""
+    with closing(connect(":memory:")) as conn:
+        write_puzzles(conn, list(puzzles))
+        return build_stats_sql(conn)
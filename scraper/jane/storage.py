@@ -1,61 +1,550 @@
 from __future__ import annotations
 
+import copy
+import gzip
 import json
 import os
-from typing import Dict, Any, List
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterator, List, Optional, TextIO, Tuple
 
 from loguru import logger
 
 from .models import Puzzle
+from .metrics import timed
+from .writers import write_json
+from .columnar import is_columnar_path, load_puzzles_columnar, save_puzzles_columnar
+from .sqlite_store import is_sqlite_path, load_puzzles_sqlite, save_puzzles_sqlite
 
 
-def load_existing(file_path: str) -> Dict[str, Dict[str, Any]]:
+# Streaming reads of data.json. `json.load` holds the whole file as one
+# string while it builds the parsed list, so a load peaked at about twice
+# the size of the data. `iter_puzzles` reads the top-level array a chunk
+# at a time and decodes one entry at a time; solver names are shared
+# between entries instead of kept once per puzzle. In lazy mode each
+# entry's `solver_timestamps` is kept as its JSON text until first read.
+STREAM_CHUNK_CHARS = 1 << 18
+_TIMESTAMPS = "solver_timestamps"
+_WS = r"[ \t\n\r]*"
+_WHITESPACE = re.compile(_WS)
+_JSON_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_STRING_PAIR = _JSON_STRING + _WS + ":" + _WS + _JSON_STRING + _WS
+# An object of string values only, which is what `solver_timestamps` holds.
+_FLAT_STRING_OBJECT = re.compile(r"\{" + _WS + "(?:" + _STRING_PAIR + "(?:," + _WS + _STRING_PAIR + ")*)?\}")
+_decoder = json.JSONDecoder()
+
+
+class LazyPuzzle(dict):
+    """
+    Stored puzzle entry whose `solver_timestamps` is decoded from its JSON
+    text the first time it is read. Reads that need the value (`get`,
+    indexing, `items`, copying, comparing, serializing) decode it; checking
+    for the key or listing keys does not. Otherwise a plain dict.
+    """
+
+    __slots__ = ("_raw_timestamps",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._raw_timestamps: Optional[str] = None
+
+    def _set_raw_timestamps(self, raw: str) -> None:
+        dict.__setitem__(self, _TIMESTAMPS, None)  # keeps the key in place
+        self._raw_timestamps = raw
+
+    @property
+    def timestamps_decoded(self) -> bool:
+        return self._raw_timestamps is None
+
+    def _decode(self) -> None:
+        raw = self._raw_timestamps
+        if raw is not None:
+            self._raw_timestamps = None
+            dict.__setitem__(self, _TIMESTAMPS, json.loads(raw))
+
+    def __getitem__(self, key):
+        if key == _TIMESTAMPS:
+            self._decode()
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key == _TIMESTAMPS:
+            self._decode()
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value) -> None:
+        if key == _TIMESTAMPS:
+            self._raw_timestamps = None
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key) -> None:
+        if key == _TIMESTAMPS:
+            self._raw_timestamps = None
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if key == _TIMESTAMPS:
+            self._decode()
+        return dict.pop(self, key, *default)
+
+    def setdefault(self, key, default=None):
+        if key == _TIMESTAMPS:
+            self._decode()
+        return dict.setdefault(self, key, default)
+
+    # Defined so that dict(entry) and {**entry} go through keys() and
+    # __getitem__ rather than copying the undecoded slot.
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def _decoded(name):
+        def method(self, *args, **kwargs):
+            self._decode()
+            return getattr(dict, name)(self, *args, **kwargs)
+        method.__name__ = name
+        return method
+
+    items = _decoded("items")
+    values = _decoded("values")
+    popitem = _decoded("popitem")
+    update = _decoded("update")
+    __eq__ = _decoded("__eq__")
+    __ne__ = _decoded("__ne__")
+    __repr__ = _decoded("__repr__")
+    del _decoded
+
+    __hash__ = None
+
+    def copy(self) -> Dict[str, Any]:
+        self._decode()
+        return dict(self)
+
+    def __reduce__(self):
+        return dict, (self.copy(),)
+
+
+def _skip_whitespace(text: str, pos: int) -> int:
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _shared(names: Any, seen: Dict[str, str]) -> List[Any]:
+    """`names` with each string replaced by the first equal one seen while streaming."""
+    try:
+        return list(map(seen.setdefault, names, names))
+    except TypeError:  # something unhashable in there; leave it alone
+        return list(names)
+
+
+def _decode_entry(text: str, pos: int, lazy: bool, names: Dict[str, str]) -> Tuple[Any, int]:
+    """
+    Decode the array element at `text[pos]`. Raises `ValueError` or
+    `IndexError` if `text` ends before the element does.
+    """
+    if text[pos] != "{":
+        return _decoder.raw_decode(text, pos)
+    entry: Dict[str, Any] = LazyPuzzle() if lazy else {}
+    pos = _skip_whitespace(text, pos + 1)
+    if text[pos] == "}":
+        return entry, pos + 1
+    while True:
+        if text[pos] != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, pos)
+        key, pos = json.decoder.scanstring(text, pos + 1)
+        pos = _skip_whitespace(text, pos)
+        if text[pos] != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, pos)
+        pos = _skip_whitespace(text, pos + 1)
+        key = names.setdefault(key, key)
+        raw = _FLAT_STRING_OBJECT.match(text, pos) if lazy and key == _TIMESTAMPS else None
+        if raw is not None:
+            entry._set_raw_timestamps(raw.group())
+            pos = raw.end()
+        else:
+            value, pos = _decoder.raw_decode(text, pos)
+            if key == "solvers" and isinstance(value, list):
+                value = _shared(value, names)
+            elif key == _TIMESTAMPS and isinstance(value, dict):
+                value = dict(zip(_shared(value, names), value.values()))
+            dict.__setitem__(entry, key, value)
+        pos = _skip_whitespace(text, pos)
+        if text[pos] == "}":
+            return entry, pos + 1
+        if text[pos] != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+        pos = _skip_whitespace(text, pos + 1)
+
+
+def _stream_json_array(f: TextIO, lazy: bool, chunk_chars: int = STREAM_CHUNK_CHARS) -> Iterator[Any]:
+    """Yield the elements of the JSON array in `f`, holding about one chunk of text at a time."""
+    text, pos, eof = f.read(chunk_chars), 0, False
+    pos = _skip_whitespace(text, pos)
+    if text[pos:pos + 1] != "[":
+        raise json.JSONDecodeError("Expecting '['", text, pos)
+    pos += 1
+    names: Dict[str, str] = {}
+    expect_value = True
+    while True:
+        pos = _skip_whitespace(text, pos)
+        if pos < len(text):
+            ch = text[pos]
+            if ch == "]":
+                return
+            if not expect_value:
+                if ch != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+                pos, expect_value = pos + 1, True
+                continue
+            try:
+                entry, end = _decode_entry(text, pos, lazy, names)
+            except ValueError:
+                if eof:
+                    raise
+            except IndexError:
+                if eof:
+                    raise json.JSONDecodeError("Unterminated array", text, len(text))
+            else:
+                yield entry
+                pos, expect_value = end, False
+                continue
+        elif eof:
+            raise json.JSONDecodeError("Unterminated array", text, pos)
+        # The element runs past the end of the buffer: read on (at least doubling it).
+        more = f.read(max(chunk_chars, len(text) - pos))
+        text, pos, eof = text[pos:] + more, 0, not more
+
+
+def iter_puzzles(file_path: str, lazy: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the stored puzzles one entry at a time, with the journal applied.
+    A JSON store is read incrementally unless a journal has to be replayed
+    over it; `lazy` entries (see `LazyPuzzle`) leave `solver_timestamps`
+    undecoded until read. Columnar and SQLite stores are read whole.
+    """
+    if not os.path.exists(file_path):
+        return
+    if is_columnar_path(file_path) or is_sqlite_path(file_path) or os.path.exists(journal_path(file_path)):
+        yield from _read_puzzles(file_path, lazy)
+        return
+    with open(file_path, "r", encoding="utf-8") as f:
+        yield from _stream_json_array(f, lazy)
+
+
+def load_existing(file_path: str, lazy: bool = False) -> Dict[str, Dict[str, Any]]:
     """
     Load existing puzzles from disk and index them by key to allow cheap lookups.
+    The index is built while the file is streamed (see `iter_puzzles`).
     """
     if not os.path.exists(file_path):
         return {}
 
+    puzzles_dict: Dict[str, Dict[str, Any]] = {}
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            puzzles_list = json.load(f)
+        for puzzle in iter_puzzles(file_path, lazy):
+            key = f"{puzzle.get('date_text')}_{puzzle.get('name')}"
+            puzzles_dict[key] = puzzle
     except Exception as exc:  # pragma: no cover - defensive
         logger.warning(f"Failed to load existing puzzles from {file_path}: {exc}")
         return {}
 
-    puzzles_dict: Dict[str, Dict[str, Any]] = {}
-    for puzzle in puzzles_list:
-        key = f"{puzzle.get('date_text')}_{puzzle.get('name')}"
-        puzzles_dict[key] = puzzle
-
     logger.info(f"Loaded {len(puzzles_dict)} existing puzzles from {file_path}")
     return puzzles_dict
 
 
+def _read_puzzles(file_path: str, lazy: bool = False) -> List[Dict[str, Any]]:
+    if is_columnar_path(file_path):
+        puzzles = load_puzzles_columnar(file_path)
+    elif is_sqlite_path(file_path):
+        puzzles = load_puzzles_sqlite(file_path)
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            puzzles = list(_stream_json_array(f, lazy))
+    events = read_journal(file_path)
+    if events:
+        replay_journal(puzzles, events)
+    return puzzles
+
+
+@timed("write.puzzles")
 def save_puzzles(file_path: str, puzzles: List[Puzzle]) -> None:
-    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump([p.to_dict() for p in puzzles], f, indent=2, default=str)
+    if is_columnar_path(file_path):
+        save_puzzles_columnar(file_path, [p.to_dict() for p in puzzles])
+    elif is_sqlite_path(file_path):
+        save_puzzles_sqlite(file_path, [p.to_dict() for p in puzzles])
+    elif not write_json(file_path, [p.to_dict() for p in puzzles], default=str):
+        logger.info(f"{file_path} unchanged ({len(puzzles)} puzzles); skipped write")
+        _retire_journal(file_path)
+        return
     logger.info(f"Saved {len(puzzles)} puzzles to {file_path}")
+    _retire_journal(file_path)
 
 
-def load_puzzles_list(file_path: str) -> List[Dict[str, Any]]:
+@timed("read.puzzles")
+def load_puzzles_list(file_path: str, lazy: bool = False) -> List[Dict[str, Any]]:
     """Load puzzles from disk as a raw list of dicts (preserves order and all fields)."""
     if not os.path.exists(file_path):
         return []
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _read_puzzles(file_path, lazy)
     except Exception as exc:
         logger.warning(f"Failed to load puzzles list from {file_path}: {exc}")
         return []
 
 
+@timed("write.puzzles")
 def save_puzzles_raw(file_path: str, puzzles: List[Dict[str, Any]]) -> None:
-    """Save a list of raw puzzle dicts to disk."""
-    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(puzzles, f, indent=2, ensure_ascii=False)
+    """Save a list of raw puzzle dicts to disk (columnar for .jcol, SQLite for .sqlite paths)."""
+    if is_columnar_path(file_path):
+        save_puzzles_columnar(file_path, puzzles)
+    elif is_sqlite_path(file_path):
+        save_puzzles_sqlite(file_path, puzzles)
+    elif not write_json(file_path, puzzles, ensure_ascii=False):
+        logger.info(f"{file_path} unchanged ({len(puzzles)} puzzles); skipped write")
+        _retire_journal(file_path)
+        return
     logger.info(f"Saved {len(puzzles)} puzzles to {file_path}")
+    _retire_journal(file_path)
+
+
+def export_puzzles_json(source_path: str, json_path: str) -> None:
+    """Regenerate the frontend's data.json from another store (e.g. a .jcol or .sqlite file)."""
+    save_puzzles_raw(json_path, load_puzzles_list(source_path))
+
+
+# Append-only journal of leaderboard changes next to the puzzle snapshot.
+# Daily runs append a few small JSON lines instead of rewriting the whole
+# snapshot; loaders replay the journal on top of the snapshot, and
+# compaction folds it back in (moving the records to a gzipped history so
+# the audit trail of when each solver appeared survives). Any full
+# snapshot write supersedes the journal.
+#
+# Events, one JSON object per line, each with "at" (UTC ISO time) and "key"
+# (`date_text`_`name` of the puzzle):
+#   puzzle   a new puzzle, {"index", "entry"}
+#   add      solvers added to the current puzzle, {"solvers", "timestamps"}
+#   late     solvers added to an archived puzzle, same payload as add
+#   solvers  any other leaderboard change, the full {"solvers", "timestamps"}
+#   archive  fields set when a puzzle is archived, {"fields"}
+#   update   any other field change, {"fields", "removed"}
+# Replaying is idempotent, so a crash between writing a compacted snapshot
+# and removing the journal is harmless.
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_HISTORY_SUFFIX = ".journal-history.gz"
+JOURNAL_COMPACT_DAYS = 7
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+_LEADERBOARD_FIELDS = ("solvers", "solver_timestamps")
 
 
+def journal_path(file_path: str) -> str:
+    return file_path + JOURNAL_SUFFIX
+
+
+def _key(entry: Dict[str, Any]) -> str:
+    return f"{entry.get('date_text', '')}_{entry.get('name', '')}"
+
+
+def read_journal(file_path: str) -> List[Dict[str, Any]]:
+    """Journal events for the snapshot at `file_path` (empty if there is no journal)."""
+    path = journal_path(file_path)
+    if not os.path.exists(path):
+        return []
+    events = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                # A torn final line from an interrupted append.
+                logger.warning(f"Skipping unreadable journal line {line_no} in {path}")
+    return events
+
+
+def replay_journal(puzzles: List[Dict[str, Any]], events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply journal `events` to `puzzles` in place and return it."""
+    by_key = {_key(p): p for p in puzzles}
+    for event in events:
+        kind, key = event.get("type"), event.get("key")
+        if kind == "puzzle":
+            if key not in by_key:
+                entry = event["entry"]
+                puzzles.insert(min(event["index"], len(puzzles)), entry)
+                by_key[key] = entry
+            continue
+        entry = by_key.get(key)
+        if entry is None:
+            logger.warning(f"Journal event {kind} for unknown puzzle {key}; skipping")
+            continue
+        if kind in ("add", "late"):
+            solvers = entry.setdefault("solvers", [])
+            present = set(solvers)
+            solvers.extend(name for name in event["solvers"] if name not in present)
+            timestamps = entry.setdefault("solver_timestamps", {})
+            for name, ts in event["timestamps"].items():
+                timestamps.setdefault(name, ts)
+        elif kind == "solvers":
+            entry["solvers"] = list(event["solvers"])
+            entry["solver_timestamps"] = dict(event["timestamps"])
+        elif kind in ("archive", "update"):
+            entry.update(event["fields"])
+            for field in event.get("removed", []):
+                entry.pop(field, None)
+            new_key = _key(entry)
+            if new_key != key:
+                by_key.pop(key, None)
+                by_key[new_key] = entry
+        else:
+            logger.warning(f"Unknown journal event type {kind!r}; skipping")
+    return puzzles
+
+
+def _leaderboard_events(old: Dict[str, Any], new: Dict[str, Any], key: str, at: str) -> List[Dict[str, Any]]:
+    old_solvers, new_solvers = old.get("solvers") or [], new.get("solvers") or []
+    old_ts, new_ts = old.get("solver_timestamps") or {}, new.get("solver_timestamps") or {}
+    if old_solvers == new_solvers and old_ts == new_ts:
+        return []
+    added_ts = list(new_ts.items())[len(old_ts):]
+    if (
+        new_solvers[:len(old_solvers)] == old_solvers
+        and list(new_ts.items())[:len(old_ts)] == list(old_ts.items())
+    ):
+        kind = "late" if new.get("solution_url") else "add"
+        return [{
+            "at": at, "type": kind, "key": key,
+            "solvers": new_solvers[len(old_solvers):], "timestamps": dict(added_ts),
+        }]
+    return [{"at": at, "type": "solvers", "key": key, "solvers": new_solvers, "timestamps": new_ts}]
+
+
+def diff_puzzles(
+    old: List[Dict[str, Any]],
+    new: List[Dict[str, Any]],
+    at: Optional[str] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Journal events turning `old` into `new`, or None when the change cannot
+    be expressed as events (puzzles removed or reordered) and needs a full
+    snapshot write. The events are checked by replaying them onto a copy
+    of `old`.
+    """
+    at = at or datetime.now(timezone.utc).isoformat()
+    old_by_key = {_key(p): p for p in old}
+    new_keys = [_key(p) for p in new]
+    if len(old_by_key) != len(old) or len(set(new_keys)) != len(new_keys):
+        return None
+    if [k for k in new_keys if k in old_by_key] != list(old_by_key):
+        return None
+
+    events: List[Dict[str, Any]] = []
+    for index, (key, entry) in enumerate(zip(new_keys, new)):
+        before = old_by_key.get(key)
+        if before is None:
+            events.append({"at": at, "type": "puzzle", "key": key, "index": index, "entry": entry})
+            continue
+        if before == entry:
+            continue
+        fields = {
+            k: v for k, v in entry.items()
+            if k not in _LEADERBOARD_FIELDS and (k not in before or before[k] != v)
+        }
+        removed = [k for k in before if k not in entry]
+        if fields or removed:
+            archived = "solution_url" in fields and not before.get("solution_url")
+            event = {"at": at, "type": "archive" if archived else "update", "key": key, "fields": fields}
+            if removed:
+                event["removed"] = removed
+            events.append(event)
+        events.extend(_leaderboard_events(before, entry, _key({**before, **fields}), at))
+
+    if not events:
+        return events
+    replayed = replay_journal(copy.deepcopy(old), copy.deepcopy(events))
+    if json.dumps(replayed, ensure_ascii=False) != json.dumps(new, ensure_ascii=False, default=str):
+        return None
+    return events
+
+
+def _append_journal(file_path: str, events: List[Dict[str, Any]]) -> int:
+    path = journal_path(file_path)
+    body = "".join(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n" for event in events)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f:
+        # Terminate a torn line left by an interrupted append so it stays on its own.
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        f.write(body.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    return len(body.encode("utf-8"))
+
+
+def _journal_started(file_path: str) -> Optional[datetime]:
+    with open(journal_path(file_path), "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                return datetime.fromisoformat(json.loads(line)["at"])
+            except (ValueError, KeyError):
+                continue
+    return None
+
+
+def _compaction_due(file_path: str, max_days: int, max_bytes: int) -> bool:
+    path = journal_path(file_path)
+    if not os.path.exists(path):
+        return False
+    if os.path.getsize(path) >= max_bytes:
+        return True
+    started = _journal_started(file_path)
+    return started is not None and datetime.now(timezone.utc) - started >= timedelta(days=max_days)
+
+
+def _retire_journal(file_path: str) -> None:
+    """Move the journal into the gzipped history once the snapshot holds its events."""
+    path = journal_path(file_path)
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        records = f.read()
+    if records:
+        # Each retirement appends one gzip member; gzip readers see a single stream.
+        with open(file_path + JOURNAL_HISTORY_SUFFIX, "ab") as f:
+            f.write(gzip.compress(records))
+    os.remove(path)
+
+
+def compact_journal(file_path: str) -> None:
+    """Fold the journal into the snapshot at `file_path`."""
+    if not os.path.exists(journal_path(file_path)):
+        return
+    save_puzzles_raw(file_path, _read_puzzles(file_path))
+
+
+@timed("write.puzzles_journal")
+def save_puzzles_journaled(
+    file_path: str,
+    puzzles: List[Dict[str, Any]],
+    compact_after_days: int = JOURNAL_COMPACT_DAYS,
+    compact_after_bytes: int = JOURNAL_COMPACT_BYTES,
+) -> None:
+    """
+    Persist `puzzles` by appending the changes since the stored state to the
+    journal. The snapshot is rewritten instead when there is none yet, when
+    the change is not expressible as events, or when the journal is older
+    than `compact_after_days` or larger than `compact_after_bytes`.
+    """
+    previous = load_puzzles_list(file_path)
+    events = diff_puzzles(previous, puzzles) if previous else None
+    if events is None:
+        save_puzzles_raw(file_path, puzzles)
+        return
+    if events:
+        written = _append_journal(file_path, events)
+        logger.info(f"Appended {len(events)} event(s) ({written} bytes) to {journal_path(file_path)}")
+    else:
+        logger.info(f"No puzzle changes to journal for {file_path}")
+    if _compaction_due(file_path, compact_after_days, compact_after_bytes):
+        logger.info(f"Compacting journal into {file_path}")
+        save_puzzles_raw(file_path, puzzles)
@@ -0,0 +1,283 @@
+"""
+Streaming extractors for the archive and solution pages.
+
+These drive the same `html.parser` tokenizer BeautifulSoup uses, but keep
+only a tag stack instead of building a tree, replaying just enough of
+BeautifulSoup's tree-building rules (implicit pops on end tags, void
+elements, string containers, entity handling) to give identical answers
+for the selectors in `parsers`. Markup they do not model raises
+`UnsupportedMarkup` so the caller can fall back to BeautifulSoup.
+"""
+
+from __future__ import annotations
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+# (date text, name text, solution href); None where the row lacks the tag.
+ArchiveRow = Tuple[Optional[str], Optional[str], Optional[str]]
+
+# body > div.site-wrap > main > div > div.container > div > div, innermost first.
+_CONTAINER_PATH: Tuple[Tuple[str, Optional[str]], ...] = (
+    ("div", None),
+    ("div", None),
+    ("div", "container"),
+    ("div", None),
+    ("main", None),
+    ("div", "site-wrap"),
+    ("body", None),
+)
+
+_VOID_ELEMENTS = frozenset(HTMLTreeBuilder().empty_element_tags)
+# Strings under these become Script/Stylesheet/... and are skipped by get_text().
+_STRING_CONTAINERS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+
+_DECIMAL_REF = re.compile("^([0-9]+)(.*)")
+_HEX_REF = re.compile("^([0-9a-f]+)(.*)")
+
+
+class UnsupportedMarkup(Exception):
+    """Raised when a page needs the full BeautifulSoup tree to be answered exactly."""
+
+
+class _Stop(Exception):
+    pass
+
+
+def _attr_dict(attrs: List[Tuple[str, Optional[str]]]) -> Dict[str, str]:
+    # Later duplicates win and valueless attributes become "", as in bs4.
+    return {key: "" if value is None else value for key, value in attrs}
+
+
+def _charref_text(name: str) -> str:
+    base, pattern = 10, _DECIMAL_REF
+    if name[:1] in ("x", "X"):
+        name, base, pattern = name[1:], 16, _HEX_REF
+    extra = ""
+    try:
+        code: Optional[int] = int(name, base)
+    except ValueError:
+        match = pattern.search(name)
+        if match is None:
+            return name
+        code, extra = int(match.group(1), base), match.group(2)
+    text, _ = UnicodeDammit.numeric_character_reference(code)
+    return text + extra
+
+
+class _Element:
+    __slots__ = ("name", "classes", "texts")
+
+    def __init__(self, name: str, classes: Tuple[str, ...]):
+        self.name = name
+        self.classes = classes
+        self.texts: Optional[List[str]] = None  # set while get_text() is being collected
+
+
+class _Row:
+    __slots__ = ("element", "date", "name", "link", "href")
+
+    def __init__(self, element: _Element):
+        self.element = element
+        self.date: Optional[_Element] = None
+        self.name: Optional[_Element] = None
+        self.link = False
+        self.href: Optional[str] = None
+
+
+class _ArchiveExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.stack: List[_Element] = []
+        self.counts: Dict[str, int] = {}
+        self.already_closed: List[str] = []
+        self.container: Optional[_Element] = None
+        self.rows: List[_Row] = []
+        self.open_rows: List[_Row] = []
+        self.capturing = 0
+        self.containers_open = 0
+        self.buf: List[str] = []
+
+    # -- text -------------------------------------------------------------
+
+    def _flush(self) -> None:
+        if not self.buf:
+            return
+        text = "".join(self.buf).strip()
+        self.buf = []
+        if text and not self.containers_open:
+            for element in self.stack:
+                if element.texts is not None:
+                    element.texts.append(text)
+
+    def handle_data(self, data: str) -> None:
+        if self.capturing:
+            self.buf.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        if self.capturing:
+            self.buf.append(EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name) or "&" + name)
+
+    def handle_charref(self, name: str) -> None:
+        if self.capturing:
+            self.buf.append(_charref_text(name))
+
+    def handle_comment(self, data: str) -> None:
+        self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        if self.capturing:
+            raise UnsupportedMarkup("CDATA inside a captured tag")
+        self._flush()
+
+    # -- structure --------------------------------------------------------
+
+    def _has_ancestor(self, cls: str) -> bool:
+        return any(cls in element.classes for element in self.stack)
+
+    def _is_container(self, name: str) -> bool:
+        if name != "div" or len(self.stack) < len(_CONTAINER_PATH) - 1:
+            return False
+        chain = [(name, None)] + [(e.name, e) for e in reversed(self.stack[-(len(_CONTAINER_PATH) - 1):])]
+        for (tag, element), (want, cls) in zip(chain, _CONTAINER_PATH):
+            if tag != want:
+                return False
+            if cls is not None and (element is None or cls not in element.classes):
+                return False
+        return True
+
+    def _start(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._flush()
+        attr = _attr_dict(attrs) if attrs else {}
+        classes = tuple(attr["class"].split()) if "class" in attr else ()
+        element = _Element(tag, classes)
+
+        if self.container is None:
+            if self._is_container(tag):
+                self.container = element
+        elif self.open_rows and classes:
+            if tag == "span" and ("date" in classes or "name" in classes) and self._has_ancestor("left"):
+                for slot in ("date", "name"):
+                    if slot in classes:
+                        for row in self.open_rows:
+                            if getattr(row, slot) is None:
+                                setattr(row, slot, element)
+                                element.texts = []
+                if element.texts is not None:
+                    self.capturing += 1
+            elif tag == "a" and "solution-link" in classes and self._has_ancestor("right"):
+                for row in self.open_rows:
+                    if not row.link:
+                        row.link = True
+                        row.href = attr.get("href")
+
+        if (
+            self.container is not None
+            and tag == "div"
+            and "row" in classes
+            and any(e is self.container for e in self.stack)
+        ):
+            row = _Row(element)
+            self.rows.append(row)
+            self.open_rows.append(row)
+
+        self.stack.append(element)
+        self.counts[tag] = self.counts.get(tag, 0) + 1
+        if tag in _STRING_CONTAINERS:
+            self.containers_open += 1
+
+    def _pop(self) -> None:
+        element = self.stack.pop()
+        self.counts[element.name] -= 1
+        if element.name in _STRING_CONTAINERS:
+            self.containers_open -= 1
+        if element.texts is not None:
+            self.capturing -= 1
+        if self.open_rows and self.open_rows[-1].element is element:
+            self.open_rows.pop()
+
+    def _end(self, tag: str) -> None:
+        self._flush()
+        # BeautifulSoup._popToTag: pop through the most recent `tag`, if any is open.
+        if not self.counts.get(tag):
+            return
+        while self.stack:
+            name = self.stack[-1].name
+            self._pop()
+            if name == tag:
+                break
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs)
+        if tag in _VOID_ELEMENTS:
+            self._end(tag)
+            self.already_closed.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs)
+        self._end(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.already_closed:
+            self.already_closed.remove(tag)
+        else:
+            self._end(tag)
+
+
+class _SolutionExtractor(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.found = False
+        self.directory: Optional[str] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag != "p" or not attrs:
+            return
+        attr = _attr_dict(attrs)
+        if "correct-submissions" in attr.get("class", "").split():
+            self.found = True
+            self.directory = attr.get("data-directory")
+            raise _Stop
+
+
+def extract_archive_rows(html: str) -> List[ArchiveRow]:
+    """
+    Rows of the archive listing, as `parse_archive_page` sees them through
+    BeautifulSoup: raw get_text(strip=True) of the date and name spans and
+    the solution link's href.
+    """
+    parser = _ArchiveExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except AssertionError as exc:
+        raise UnsupportedMarkup(str(exc)) from exc
+    parser._flush()
+
+    def text(element: Optional[_Element]) -> Optional[str]:
+        return None if element is None else "".join(element.texts or ())
+
+    return [(text(row.date), text(row.name), row.href) for row in parser.rows]
+
+
+def extract_solution_directory(html: str) -> Optional[str]:
+    """`data-directory` of the first p.correct-submissions, stopping as soon as it is seen."""
+    parser = _SolutionExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _Stop:
+        pass
+    except AssertionError as exc:
+        raise UnsupportedMarkup(str(exc)) from exc
+    return parser.directory
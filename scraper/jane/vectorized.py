@@ -0,0 +1,197 @@
+"""
+NumPy aggregation backend for `stats.json`.
+
+Solves are flattened into parallel (solver id, puzzle position) arrays and
+folded into a solver x month incidence matrix over integer month indices;
+counts, first/last solve, streaks, participation and growth are then
+array reductions. Output is identical to `aggregator.build_stats`.
+NumPy is optional; `aggregator.build_stats(..., backend="numpy")` falls
+back to the pure-Python path when it is missing.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Dict, Iterable, List, Any
+
+import numpy as np
+
+from .aggregator import _build_current_puzzle_progress, _parse_date
+from .incremental import _month_index, _month_label
+
+
+def _first_index(ids: np.ndarray) -> np.ndarray:
+    """Index of the first occurrence of each distinct id, in id order."""
+    order = np.argsort(ids, kind="stable")
+    heads = np.ones(len(ids), dtype=bool)
+    heads[1:] = ids[order[1:]] != ids[order[:-1]]
+    return order[heads]
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    # Sort-and-mask: np.unique hashes int64 input, which is several times slower at these sizes.
+    values = np.sort(values)
+    keep = np.ones(len(values), dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+
+def _labels_of(values: List[str], index: np.ndarray) -> List[str]:
+    return np.array(values, dtype=object)[index].tolist()
+
+
+def _best_streaks(cells: np.ndarray, width: int, n_solvers: int):
+    """
+    Longest run of consecutive active months per solver, earliest run on ties.
+    `cells` are the sorted flat indices (solver * width + month) of the set
+    cells of the incidence matrix, so runs are where the index steps by one
+    within a row. Returns (start column, length) arrays; length is 0 where
+    no run reaches 2.
+    """
+    rows, cols = np.divmod(cells, width)
+    breaks = np.ones(len(cells), dtype=bool)
+    breaks[1:] = (np.diff(cells) != 1) | (rows[1:] != rows[:-1])
+    run_starts = np.flatnonzero(breaks)
+    lengths = np.diff(np.append(run_starts, len(cells)))
+    rows, starts = rows[run_starts], cols[run_starts]
+
+    keep = lengths >= 2
+    rows, starts, lengths = rows[keep], starts[keep], lengths[keep]
+    order = np.lexsort((starts, -lengths, rows))
+    rows, starts, lengths = rows[order], starts[order], lengths[order]
+    firsts = _first_index(rows)
+
+    best_start = np.zeros(n_solvers, dtype=np.int64)
+    best_length = np.zeros(n_solvers, dtype=np.int64)
+    best_start[rows[firsts]] = starts[firsts]
+    best_length[rows[firsts]] = lengths[firsts]
+    return best_start, best_length
+
+
+def build_stats_numpy(puzzles: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    sorted_puzzles = sorted(puzzles, key=lambda p: _parse_date(p.get("date_text", "")), reverse=True)
+    date_texts = [p.get("date_text", "N/A") for p in sorted_puzzles]
+    months = np.array([_month_index(p.get("date_text", "")) for p in sorted_puzzles], dtype=np.int64)
+
+    # Solver ids follow build_stats' encounter order, which fixes every tie-break.
+    per_puzzle = [len(p.get("solvers") or []) for p in sorted_puzzles]
+    flat = list(chain.from_iterable(p.get("solvers") or [] for p in sorted_puzzles))
+    names = list(dict.fromkeys(flat))
+    ids = dict(zip(names, range(len(names))))
+    n_solvers = len(names)
+
+    solver_ids = np.fromiter(map(ids.__getitem__, flat), dtype=np.int64, count=len(flat))
+    positions = np.repeat(np.arange(len(sorted_puzzles), dtype=np.int64), per_puzzle)
+    solve_months = months[positions]
+
+    counts = np.bincount(solver_ids, minlength=n_solvers)
+    # Positions only grow along the flat array, so the first occurrence is the newest solve.
+    last_pos = positions[_first_index(solver_ids)]
+    # First appearance: earliest month, then lowest position within it.
+    order = np.lexsort((positions, solve_months, solver_ids))
+    first_pos = positions[order][_first_index(solver_ids[order])]
+
+    month_lo = int(months.min()) if len(months) else 0
+    width = int(months.max()) - month_lo + 1 if len(months) else 0
+    # Solver x month incidence matrix, kept as the sorted flat indices of its set cells.
+    cells = _sorted_unique(solver_ids * width + (solve_months - month_lo))
+
+    ranked = np.argsort(-counts, kind="stable")
+
+    streak_start, streak_length = _best_streaks(cells, width, n_solvers)
+    with_streak = ranked[streak_length[ranked] > 0]
+    with_streak = with_streak[np.argsort(-streak_length[with_streak], kind="stable")][:20]
+    longest_streaks = [
+        {
+            "solver": names[i],
+            "start": _month_label(month_lo + start),
+            "end": _month_label(month_lo + start + length - 1),
+            "length": length,
+        }
+        for i, start, length in zip(
+            with_streak.tolist(), streak_start[with_streak].tolist(), streak_length[with_streak].tolist()
+        )
+    ]
+
+    now = datetime.now(timezone.utc)
+    one_year_ago = (now.year - 1) * 12 + now.month - 1
+    first_months = months[first_pos]
+    candidates = np.nonzero((first_months >= one_year_ago) & (counts >= 3))[0]
+    rising = []
+    for i, count, month in zip(candidates.tolist(), counts[candidates].tolist(), first_months[candidates].tolist()):
+        months_since = max(1, (now.year - month // 12) * 12 + (now.month - month % 12 - 1))
+        rising.append((count / months_since, i, count))
+    rising.sort(key=lambda r: -r[0])
+    rising_stars = [
+        {
+            "solver": names[i],
+            "puzzlesSolved": count,
+            "solveRate": rate,
+            "firstAppearance": date_texts[first_pos[i]],
+        }
+        for rate, i, count in rising[:20]
+    ]
+
+    sorted_months = _sorted_unique(months)
+    columns = sorted_months - month_lo
+    participation = np.bincount(cells % width, minlength=width)
+    if len(sorted_months) > 48:
+        sampled = [idx for idx in range(len(sorted_months)) if idx % 3 == 0 or idx == len(sorted_months) - 1]
+    else:
+        sampled = list(range(len(sorted_months)))
+    monthly_participation = [
+        {"month": _month_label(int(sorted_months[idx])), "solvers": int(participation[columns[idx]])}
+        for idx in sampled
+    ]
+
+    growth = np.cumsum(np.bincount(first_months - month_lo, minlength=width))
+    solvers_growth = [
+        {"month": _month_label(month), "totalSolvers": total}
+        for month, total in zip(sorted_months.tolist(), growth[columns].tolist())
+    ]
+    if solvers_growth:
+        solvers_growth[-1]["totalSolvers"] = n_solvers
+
+    most_solved_puzzles = sorted(
+        [
+            {
+                "id": f"{month // 12}-{month % 12 + 1}",
+                "name": p.get("name", "Unknown"),
+                "solvers": solved,
+                "solution_url": p.get("solution_url", ""),
+            }
+            for p, month, solved in zip(sorted_puzzles, months.tolist(), per_puzzle)
+        ],
+        key=lambda p: p["solvers"],
+        reverse=True,
+    )[:20]
+
+    return {
+        "totalPuzzles": len(sorted_puzzles),
+        "uniqueSolvers": n_solvers,
+        "solverDistribution": {
+            "onePuzzle": int(np.count_nonzero(counts == 1)),
+            "twoToNine": int(np.count_nonzero((counts >= 2) & (counts <= 9))),
+            "tenPlus": int(np.count_nonzero(counts >= 10)),
+        },
+        "topSolvers": [
+            {
+                "name": name,
+                "puzzlesSolved": count,
+                "firstAppearance": first,
+                "lastSolve": last,
+            }
+            for name, count, first, last in zip(
+                _labels_of(names, ranked), counts[ranked].tolist(),
+                _labels_of(date_texts, first_pos[ranked]), _labels_of(date_texts, last_pos[ranked]),
+            )
+        ],
+        "longestStreaks": longest_streaks,
+        "risingStars": rising_stars,
+        "monthlyParticipation": monthly_participation,
+        "solversGrowth": solvers_growth,
+        "mostSolvedPuzzles": most_solved_puzzles,
+        "currentPuzzleProgress": _build_current_puzzle_progress(sorted_puzzles),
+        "generatedAt": now.isoformat(),
+    }
@@ -0,0 +1,241 @@
+"""
+Long-running `--watch` mode: poll the current puzzle on an adaptive schedule.
+
+A `Watcher` keeps the session, the puzzle list and the aggregate stats
+state (see `incremental.StatsState`) in memory between polls, so a poll
+that finds the leaderboard unchanged costs the two current-puzzle requests
+and no writes. When it did change, the new solvers are merged in, the
+store is saved and stats.json is re-rendered from the state updated by just
+that delta (without a `state_path`, stats.json is recomputed with
+`stats_backend`, as in the daily mode). Recently archived puzzles are re-checked for late solvers every
+`archive_interval` seconds rather than on every poll. A poll that raises is
+counted as failed and backs the schedule off; the watch keeps going.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from .aggregator import build_stats, save_stats
+from .client import build_session, DEFAULT_TIMEOUT
+from .incremental import load_state, render_stats, save_state, snapshot_puzzles, update_stats_state
+from .pipeline import (
+    apply_current_puzzle, current_puzzle_unchanged, refresh_recent_archives, scrape_current_puzzle,
+)
+from .storage import load_puzzles_list, save_puzzles_journaled, save_puzzles_raw
+
+DEFAULT_MIN_INTERVAL = 120.0
+DEFAULT_MAX_INTERVAL = 3600.0
+ARCHIVE_INTERVAL = 24 * 3600.0
+
+
+class PollSchedule:
+    """
+    Adaptive interval between polls of the current puzzle.
+
+    A new puzzle is polled every `min_interval`. From then on the interval
+    follows the solver arrival rate (a moving average of new solvers per
+    second over the recent polls): it is set so that about
+    `solvers_per_poll` solvers arrive between polls, which stretches it as
+    the rate decays. A poll that finds nobody new, or fails, multiplies the
+    interval by `backoff`. It always stays within [min_interval, max_interval].
+    """
+
+    def __init__(
+        self,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        solvers_per_poll: float = 1.0,
+        backoff: float = 1.5,
+        smoothing: float = 0.3,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.solvers_per_poll = solvers_per_poll
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.interval = min_interval
+        self.rate: Optional[float] = None
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def new_puzzle(self) -> float:
+        self.rate = None
+        self.interval = self.min_interval
+        return self.interval
+
+    def observe(self, new_solvers: int, elapsed: float) -> float:
+        """Account for a poll that found `new_solvers` after `elapsed` seconds; returns the next interval."""
+        if elapsed > 0:
+            sample = new_solvers / elapsed
+            self.rate = sample if self.rate is None else self.smoothing * sample + (1 - self.smoothing) * self.rate
+        if new_solvers and self.rate:
+            self.interval = self._clamp(self.solvers_per_poll / self.rate)
+        else:
+            self.interval = self._clamp(self.interval * self.backoff)
+        return self.interval
+
+    def failed(self) -> float:
+        self.interval = self._clamp(self.interval * self.backoff)
+        return self.interval
+
+
+def _current_puzzle_id(puzzles: List[Dict[str, Any]]) -> Optional[str]:
+    for entry in puzzles:
+        if not entry.get("solution_url"):
+            return entry.get("puzzle_id")
+    return None
+
+
+class Watcher:
+    """
+    In-memory state for `--watch`. `poll` runs one update and returns whether
+    anything was written; `run` polls on `schedule` until interrupted.
+    `on_change` is called with the puzzle list after every save (the CLI
+    uses it to export data.json and the profile index).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        output_path: str,
+        stats_path: str,
+        timeout: int = DEFAULT_TIMEOUT,
+        state_path: Optional[str] = None,
+        shard_dir: Optional[str] = None,
+        workers: int = 1,
+        stats_backend: str = "python",
+        journal: bool = False,
+        schedule: Optional[PollSchedule] = None,
+        archive_interval: float = ARCHIVE_INTERVAL,
+        on_change: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+        session=None,
+    ):
+        self.base_url = base_url
+        self.output_path = output_path
+        self.stats_path = stats_path
+        self.timeout = timeout
+        self.state_path = state_path
+        self.shard_dir = shard_dir
+        self.workers = workers
+        self.stats_backend = stats_backend
+        self.journal = journal
+        self.schedule = schedule or PollSchedule()
+        self.archive_interval = archive_interval
+        self.on_change = on_change
+        self.session = session or build_session(pool_size=workers)
+        self.puzzles = load_puzzles_list(output_path)
+        self.state = load_state(state_path, self.puzzles) if state_path else None
+        self.counters: Dict[str, int] = {
+            "polls": 0, "changed": 0, "unchanged": 0, "failed": 0, "new_solvers": 0, "late_solvers": 0,
+        }
+        self._last_poll: Optional[float] = None
+        self._last_archive_check: Optional[float] = None
+        # Snapshot of a poll that raised before saving what it had changed.
+        self._unsaved: Optional[Dict[str, Any]] = None
+
+    def poll(self) -> bool:
+        breaker = getattr(self.session, "circuit_breaker", None)
+        if breaker is not None:
+            breaker.renew()
+        self.counters["polls"] += 1
+        now = time.monotonic()
+        elapsed = now - self._last_poll if self._last_poll is not None else 0.0
+        self._last_poll = now
+
+        # A poll that failed part-way may have changed the puzzles without
+        # saving them; diff from its snapshot so this poll saves both.
+        changed = self._unsaved is not None
+        snapshot = self._unsaved if changed else snapshot_puzzles(self.puzzles)
+        self._unsaved = snapshot
+        result = scrape_current_puzzle(self.session, timeout=self.timeout)
+        if result is None:
+            self.counters["failed"] += 1
+            self.schedule.failed()
+        else:
+            puzzle_id, fresh_solvers = result
+            if current_puzzle_unchanged(self.puzzles, puzzle_id, fresh_solvers):
+                self.schedule.observe(0, elapsed)
+            else:
+                previous_id = _current_puzzle_id(self.puzzles)
+                info = apply_current_puzzle(
+                    self.session, self.base_url, self.puzzles, puzzle_id, fresh_solvers, self.timeout,
+                )
+                new_solvers = info.get("new_solvers", [])
+                self.counters["new_solvers"] += len(new_solvers)
+                if previous_id and previous_id != puzzle_id:
+                    self.schedule.new_puzzle()
+                    self._last_archive_check = None  # the old puzzle was just archived
+                else:
+                    self.schedule.observe(len(new_solvers), elapsed)
+                if new_solvers:
+                    logger.info(f"{len(new_solvers)} new solver(s) on {info.get('puzzle_name', '?')}: {new_solvers}")
+                changed = True
+
+        if self._last_archive_check is None or now - self._last_archive_check >= self.archive_interval:
+            # The refresh edits entries in place and may change them without
+            # adding anyone (a reordered leaderboard, a stamped `puzzle_id`
+            # or freeze marker), so compare against copies taken before it.
+            before = [dict(entry) for entry in self.puzzles]
+            late_by_puzzle = refresh_recent_archives(
+                self.session, self.puzzles, timeout=self.timeout, workers=self.workers,
+            )
+            self._last_archive_check = now  # only once it went through
+            if late_by_puzzle:
+                self.counters["late_solvers"] += sum(len(v) for v in late_by_puzzle.values())
+            if before != self.puzzles:
+                changed = True
+
+        if changed:
+            self._save(snapshot)
+            self.counters["changed"] += 1
+        else:
+            self.counters["unchanged"] += 1
+        self._unsaved = None
+        return changed
+
+    def _save(self, snapshot: Dict[str, Any]) -> None:
+        if self.journal:
+            save_puzzles_journaled(self.output_path, self.puzzles)
+        else:
+            save_puzzles_raw(self.output_path, self.puzzles)
+        if not self.state_path:
+            stats = build_stats(self.puzzles, backend=self.stats_backend, store_path=self.output_path)
+            save_stats(self.stats_path, stats, shard_dir=self.shard_dir)
+        else:
+            self.state = update_stats_state(self.puzzles, snapshot, self.state)
+            save_stats(self.stats_path, render_stats(self.state), shard_dir=self.shard_dir)
+            save_state(self.state_path, self.state)
+        if self.on_change is not None:
+            self.on_change(self.puzzles)
+
+    def run(self, max_polls: Optional[int] = None, sleep: Callable[[float], None] = time.sleep) -> None:
+        if not self.puzzles:
+            logger.error("No existing data found. Run with --full to do initial scrape.")
+            return
+        logger.info(
+            f"Watching the current puzzle every {self.schedule.min_interval:.0f}-"
+            f"{self.schedule.max_interval:.0f}s"
+        )
+        while True:
+            try:
+                self.poll()
+            except Exception as exc:
+                self.counters["failed"] += 1
+                self.schedule.failed()
+                logger.error(f"Poll failed; retrying on schedule: {exc}")
+            if max_polls is not None and self.counters["polls"] >= max_polls:
+                return
+            logger.info(f"Next poll in {self.schedule.interval:.0f}s")
+            sleep(self.schedule.interval)
+
+    def summary(self) -> str:
+        c = self.counters
+        return (
+            f"Watch: {c['polls']} poll(s), {c['changed']} with changes, {c['unchanged']} unchanged, "
+            f"{c['failed']} failed; {c['new_solvers']} new solver(s), {c['late_solvers']} late solver(s)"
+        )
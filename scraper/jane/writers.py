@@ -0,0 +1,185 @@
+"""
+Output writers for the files the frontend downloads.
+
+Every write goes to a temp file in the target directory and is renamed
+over the destination, so a crash never leaves a truncated data.json or
+stats.json behind. A write whose content matches what is already on disk
+(ignoring volatile keys such as `generatedAt`) is skipped, which leaves
+the file, its mtime and the git tree untouched. Optionally each file gets
+`.gz` and `.br` siblings so the static host can serve them as-is; `.br`
+needs the `brotli` package and is silently omitted without it.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None  # type: ignore[assignment]
+
+# Top-level keys that change on every run without the data changing.
+VOLATILE_KEYS = ("generatedAt",)
+
+
+@dataclass
+class OutputOptions:
+    """
+    How JSON outputs are encoded. `compact` drops indentation (the default
+    keeps it so the committed files diff line by line); `precompress`
+    writes `.gz` / `.br` siblings next to each file.
+    """
+
+    compact: bool = False
+    precompress: bool = False
+
+
+_options = OutputOptions()
+
+
+def configure_output(compact: bool = False, precompress: bool = False) -> OutputOptions:
+    global _options
+    _options = OutputOptions(compact=compact, precompress=precompress)
+    return _options
+
+
+def get_output_options() -> OutputOptions:
+    return _options
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Replace `path` with `data` via a temp file and rename."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def encode_json(obj: Any, compact: bool = False, ensure_ascii: bool = True, default=None) -> bytes:
+    if compact:
+        text = json.dumps(obj, ensure_ascii=ensure_ascii, separators=(",", ":"), default=default)
+    else:
+        text = json.dumps(obj, ensure_ascii=ensure_ascii, indent=2, default=default)
+    return text.encode("utf-8")
+
+
+def _strip_volatile(obj: Any, ignore: Iterable[str]) -> Any:
+    if isinstance(obj, dict):
+        return {k: v for k, v in obj.items() if k not in ignore}
+    return obj
+
+
+def content_hash(obj: Any, ignore: Iterable[str] = VOLATILE_KEYS, default=None) -> str:
+    """SHA-256 of `obj` independent of formatting and of the `ignore`d top-level keys."""
+    body = json.dumps(
+        _strip_volatile(obj, tuple(ignore)), ensure_ascii=False, sort_keys=True,
+        separators=(",", ":"), default=default,
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _unchanged(path: str, body: bytes, obj: Any, compact: bool, ensure_ascii: bool, ignore, default) -> bool:
+    """True if `path` holds the same content as `obj`, in the same encoding."""
+    if not os.path.exists(path):
+        return False
+    current = _read(path)
+    if current == body:
+        return True
+    try:
+        existing = json.loads(current)
+    except ValueError:
+        return False
+    if content_hash(existing, ignore) != content_hash(obj, ignore, default=default):
+        return False
+    # Same content; keep the file only if it is already in the requested encoding.
+    return encode_json(existing, compact=compact, ensure_ascii=ensure_ascii) == current
+
+
+def _compressed_suffixes() -> Tuple[str, ...]:
+    return (".gz", ".br") if brotli is not None else (".gz",)
+
+
+def _write_compressed(path: str, body: bytes) -> None:
+    # mtime=0 keeps the .gz byte-identical across runs for unchanged content.
+    atomic_write(path + ".gz", gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        atomic_write(path + ".br", brotli.compress(body, quality=11))
+
+
+def _drop_compressed(path: str) -> None:
+    for suffix in (".gz", ".br"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def write_json_body(
+    path: str,
+    obj: Any,
+    compact: Optional[bool] = None,
+    precompress: Optional[bool] = None,
+    ensure_ascii: bool = True,
+    ignore: Iterable[str] = VOLATILE_KEYS,
+    default=None,
+) -> Tuple[bytes, bool]:
+    """
+    Atomically write `obj` as JSON unless the file already holds the same
+    content. `compact` / `precompress` default to the configured
+    `OutputOptions`. Returns the bytes now on disk (the old ones when the
+    write was skipped, so callers can hash what is actually served) and
+    whether the file was rewritten.
+    """
+    compact = _options.compact if compact is None else compact
+    precompress = _options.precompress if precompress is None else precompress
+    body = encode_json(obj, compact=compact, ensure_ascii=ensure_ascii, default=default)
+
+    if _unchanged(path, body, obj, compact, ensure_ascii, ignore, default):
+        current = _read(path)
+        # Still fill in siblings that are missing, e.g. on the first --precompress run.
+        if precompress and not all(os.path.exists(path + s) for s in _compressed_suffixes()):
+            _write_compressed(path, current)
+        return current, False
+
+    # Siblings go first: if we die in between, the main file still differs
+    # from the new content and the next run rewrites everything.
+    if precompress:
+        _write_compressed(path, body)
+    else:
+        # Stale siblings would be served in place of the new file.
+        _drop_compressed(path)
+    atomic_write(path, body)
+    return body, True
+
+
+def write_json(path: str, obj: Any, **kwargs) -> bool:
+    """`write_json_body` for callers that only care whether anything changed."""
+    return write_json_body(path, obj, **kwargs)[1]
+
+
+def prune_directory(directory: str, keep: Iterable[str]) -> None:
+    """Remove files in `directory` (and their compressed siblings) not named in `keep`."""
+    if not os.path.isdir(directory):
+        return
+    keep = set(keep)
+    for name in os.listdir(directory):
+        base = name[:-3] if name.endswith((".gz", ".br")) else name
+        if base not in keep and os.path.isfile(os.path.join(directory, name)):
+            os.remove(os.path.join(directory, name))
@@ -36,7 +36,7 @@ const MoonIcon = () => (
 );
 
 const Leaderboard: React.FC = () => {
-  const { data, loading, error } = useLeaderboardData();
+  const { data, loading, error, ensureTopSolvers } = useLeaderboardData();
   const { theme, toggleTheme } = useTheme();
   const [showConfetti, setShowConfetti] = useState(false);
   const [topSolversSearch, setTopSolversSearch] = useState('');
@@ -90,10 +90,9 @@ const Leaderboard: React.FC = () => {
     return () => window.removeEventListener('popstate', onPop);
   }, []);
 
-  // Lazy-load raw puzzle data once a solver modal is opened or once the
-  // YoY chart needs it. The hook caches at module scope so opening multiple
-  // modals only fetches once.
-  const needPuzzles = !!selectedSolver || !!data;
+  // Lazy-load raw puzzle data once the YoY chart needs it. Solver profiles
+  // come from the bucketed profile index and no longer need data.json.
+  const needPuzzles = !!data;
   const { puzzles: rawPuzzles, loading: puzzlesLoading } = useRawPuzzleData(needPuzzles);
 
   // Tick once a minute so the relative-time string stays fresh while the tab is open.
@@ -335,6 +334,8 @@ const Leaderboard: React.FC = () => {
             data={data.topSolvers || []}
             searchTerm={topSolversSearch}
             onSolverClick={openFromTopSolvers}
+            totalCount={data.topSolversTotal}
+            onLoadMore={ensureTopSolvers}
           />
         </div>
         
@@ -1,5 +1,6 @@
 import React, { useEffect, useMemo } from 'react';
 import { useRawPuzzleData } from '../hooks/useRawPuzzleData';
+import { useSolverProfile } from '../hooks/useSolverProfile';
 import { Puzzle } from '../types';
 import {
   SolverPlacement,
@@ -19,35 +20,43 @@ const AVG_PERCENTILE_TOOLTIP =
   '0 = always last. Formula: 100 × (1 − (rank − 1) / (solvers − 1)), ' +
   'averaged across puzzles. Puzzles with only one solver are excluded.';
 
-const computeSolverStats = (solverName: string, puzzles: Puzzle[]) => {
-  const placements: SolverPlacement[] = [];
-  for (const p of puzzles) {
-    const placement = findSolverPlacement(solverName, p);
-    if (placement) placements.push(placement);
-  }
+const summarizePlacements = (placements: SolverPlacement[]) => {
   // Sort newest first by puzzle date_text
-  placements.sort((a, b) => {
+  const sorted = [...placements].sort((a, b) => {
     const da = new Date(a.puzzle.date_text).getTime();
     const db = new Date(b.puzzle.date_text).getTime();
     return db - da;
   });
 
-  const avg = computeAveragePercentile(placements);
+  const avg = computeAveragePercentile(sorted);
 
   return {
-    placements,
-    totalSolved: placements.length,
-    firstAppearance: placements.length
-      ? formatDate(placements[placements.length - 1].puzzle.date_text)
+    placements: sorted,
+    totalSolved: sorted.length,
+    firstAppearance: sorted.length
+      ? formatDate(sorted[sorted.length - 1].puzzle.date_text)
       : 'N/A',
-    lastSolve: placements.length ? formatDate(placements[0].puzzle.date_text) : 'N/A',
+    lastSolve: sorted.length ? formatDate(sorted[0].puzzle.date_text) : 'N/A',
     avgPercentile: avg,
   };
 };
 
+const computeSolverStats = (solverName: string, puzzles: Puzzle[]) => {
+  const placements: SolverPlacement[] = [];
+  for (const p of puzzles) {
+    const placement = findSolverPlacement(solverName, p);
+    if (placement) placements.push(placement);
+  }
+  return summarizePlacements(placements);
+};
+
 const SolverProfileModal: React.FC<SolverProfileModalProps> = ({ solverName, onClose }) => {
   const open = !!solverName;
-  const { puzzles, loading, error } = useRawPuzzleData(open);
+  const profile = useSolverProfile(solverName);
+  // Fall back to scanning the full data.json only if the profile index fails.
+  const raw = useRawPuzzleData(open && !!profile.error);
+  const loading = profile.loading || raw.loading;
+  const error = profile.error ? raw.error : null;
 
   // Close on Escape; lock body scroll while modal is open.
   useEffect(() => {
@@ -65,9 +74,11 @@ const SolverProfileModal: React.FC<SolverProfileModalProps> = ({ solverName, onC
   }, [open, onClose]);
 
   const stats = useMemo(() => {
-    if (!solverName || !puzzles) return null;
-    return computeSolverStats(solverName, puzzles);
-  }, [solverName, puzzles]);
+    if (!solverName) return null;
+    if (profile.placements) return summarizePlacements(profile.placements);
+    if (profile.error && raw.puzzles) return computeSolverStats(solverName, raw.puzzles);
+    return null;
+  }, [solverName, profile.placements, profile.error, raw.puzzles]);
 
   if (!open || !solverName) return null;
 
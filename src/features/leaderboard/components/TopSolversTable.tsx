@@ -1,4 +1,4 @@
-import React, { useEffect, useMemo } from 'react';
+import React, { useCallback, useEffect, useMemo } from 'react';
 import { useScrollPagination } from '../../../hooks/useScrollPagination';
 import RankBadge from './RankBadge';
 import { trackEvent } from '../../../utils/analytics';
@@ -7,10 +7,13 @@ interface TopSolversTableProps {
   data: Array<{ name: string; puzzlesSolved: number; lastSolve: string }>;
   searchTerm: string;
   onSolverClick?: (name: string) => void;
+  /** Full solver count when `data` is a prefix still being paged in. */
+  totalCount?: number;
+  onLoadMore?: (count: number) => void;
 }
 
 const TopSolversTable: React.FC<TopSolversTableProps> = React.memo(
-  ({ data, searchTerm, onSolverClick }) => {
+  ({ data, searchTerm, onSolverClick, totalCount, onLoadMore }) => {
     // Build a lookup map for O(1) rank access instead of O(n) findIndex per row
     const rankMap = useMemo(() => {
       const map = new Map<string, number>();
@@ -27,9 +30,20 @@ const TopSolversTable: React.FC<TopSolversTableProps> = React.memo(
       );
     }, [data, searchTerm]);
 
+    const hasMore = !!onLoadMore && totalCount !== undefined && data.length < totalCount;
+    const searching = !!searchTerm.trim();
+
+    // Search needs every name, so pull in all remaining pages.
+    useEffect(() => {
+      if (searching && hasMore) onLoadMore!(Infinity);
+    }, [searching, hasMore, onLoadMore, data.length]);
+
+    const loadNextPage = useCallback(() => onLoadMore?.(data.length + 1), [onLoadMore, data.length]);
+
     const { visibleItems, containerRef, tableRef, handleScroll } = useScrollPagination({
       totalItems: filteredData.length,
       trackLabel: 'top-solvers',
+      onReachEnd: hasMore && !searching ? loadNextPage : undefined,
     });
 
     // Report searches once typing settles, with whether they found anyone.
@@ -95,7 +109,7 @@ const TopSolversTable: React.FC<TopSolversTableProps> = React.memo(
                 <td colSpan={4}>No data available</td>
               </tr>
             )}
-            {visibleItems < filteredData.length && (
+            {(visibleItems < filteredData.length || hasMore) && (
               <tr className="loading-row">
                 <td colSpan={4}>Loading more...</td>
               </tr>
@@ -1,11 +1,13 @@
-import { useEffect, useState } from 'react';
-import { loadLeaderboardData } from '../services/leaderboardService';
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { loadLeaderboardData, loadTopSolverPage } from '../services/leaderboardService';
 import { LeaderboardData } from '../types';
 
 interface UseLeaderboardDataResult {
   data: LeaderboardData | null;
   loading: boolean;
   error: Error | null;
+  /** Fetch topSolvers pages until at least `count` solvers are loaded (sharded stats only). */
+  ensureTopSolvers: (count: number) => void;
 }
 
 export const useLeaderboardData = (): UseLeaderboardDataResult => {
@@ -36,6 +38,41 @@ export const useLeaderboardData = (): UseLeaderboardDataResult => {
     };
   }, []);
 
-  return { data, loading, error };
+  const pagesLoadedRef = useRef(0);
+  const pageInflightRef = useRef<Promise<void> | null>(null);
+  const manifest = data?.statsManifest;
+
+  const ensureTopSolvers = useCallback(
+    (count: number) => {
+      if (!manifest || pageInflightRef.current) return;
+      const pages = manifest.topSolverPages;
+      const target = pages.findIndex((page) => page.offset + page.count >= count);
+      const lastNeeded = target === -1 ? pages.length - 1 : target;
+      const start = pagesLoadedRef.current;
+      if (start > lastNeeded) return;
+
+      const indexes = Array.from({ length: lastNeeded - start + 1 }, (_, i) => start + i);
+      pageInflightRef.current = Promise.all(indexes.map((i) => loadTopSolverPage(manifest, i)))
+        .then((loaded) => {
+          pagesLoadedRef.current = lastNeeded + 1;
+          setData((prev) => {
+            if (!prev) return prev;
+            // Page 1 starts at offset 0 and supersedes the summary's slice.
+            const base = start === 0 ? [] : prev.topSolvers;
+            return { ...prev, topSolvers: base.concat(...loaded) };
+          });
+        })
+        .catch((err) => {
+          // Keep showing what we have; the next scroll retries.
+          console.warn('Failed to load top solvers page', err);
+        })
+        .finally(() => {
+          pageInflightRef.current = null;
+        });
+    },
+    [manifest],
+  );
+
+  return { data, loading, error, ensureTopSolvers };
 };
 
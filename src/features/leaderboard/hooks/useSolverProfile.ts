@@ -0,0 +1,114 @@
+import { useEffect, useState } from 'react';
+import { Puzzle } from '../types';
+import { SolverPlacement, placementFromRank } from '../../../utils/leaderboardUtils';
+
+interface ProfileManifest {
+  buckets: number;
+  puzzles: Array<{ date_text: string; name: string; solution_url: string; solvers: number }>;
+  files: Array<{ path: string; sha256: string }>;
+}
+
+interface SolverProfile {
+  /** [puzzle index into manifest.puzzles, 1-based rank, first-seen timestamp?], newest first. */
+  solves: Array<[number, number, string?]>;
+  monthlyActivity: string[];
+  streaks: Array<{ start: string; end: string; length: number }>;
+  firstSeen?: string;
+}
+
+/** FNV-1a over UTF-8 bytes — must match `fnv1a_bucket` in scraper/jane/search.py. */
+export const profileBucket = (name: string, buckets: number): number => {
+  let hash = 0x811c9dc5;
+  new TextEncoder().encode(name).forEach((byte) => {
+    hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+  });
+  return hash % buckets;
+};
+
+const fetchJson = async <T>(path: string): Promise<T> => {
+  const response = await fetch(path);
+  if (!response.ok) throw new Error(`Failed to load ${path}: ${response.status}`);
+  return (await response.json()) as T;
+};
+
+// Module-level caches: the manifest is shared, and each bucket file holds
+// ~60 solvers, so reopening nearby profiles is often free.
+let manifestPromise: Promise<ProfileManifest> | null = null;
+const bucketCache = new Map<number, Promise<Record<string, SolverProfile>>>();
+
+const loadManifest = (): Promise<ProfileManifest> => {
+  if (!manifestPromise) {
+    manifestPromise = fetchJson<ProfileManifest>('/data/profiles/manifest.json');
+    manifestPromise.catch(() => {
+      manifestPromise = null;
+    });
+  }
+  return manifestPromise;
+};
+
+const loadPlacements = async (solverName: string): Promise<SolverPlacement[]> => {
+  const manifest = await loadManifest();
+  const bucket = profileBucket(solverName, manifest.buckets);
+  let contents = bucketCache.get(bucket);
+  if (!contents) {
+    const file = manifest.files[bucket];
+    contents = fetchJson<Record<string, SolverProfile>>(
+      `/data/profiles/${file.path}?v=${file.sha256.slice(0, 12)}`,
+    );
+    bucketCache.set(bucket, contents);
+    contents.catch(() => bucketCache.delete(bucket));
+  }
+  const profile = (await contents)[solverName];
+  if (!profile) return [];
+  return profile.solves.map(([index, rank]) => {
+    const meta = manifest.puzzles[index];
+    const puzzle: Puzzle = {
+      date_text: meta.date_text,
+      name: meta.name,
+      solution_url: meta.solution_url,
+      solvers: [],
+    };
+    return placementFromRank(puzzle, rank, meta.solvers);
+  });
+};
+
+interface UseSolverProfileResult {
+  placements: SolverPlacement[] | null;
+  loading: boolean;
+  error: Error | null;
+}
+
+/**
+ * Load one solver's placements from the bucketed profile index
+ * (/data/profiles), which costs one small request per profile.
+ */
+export const useSolverProfile = (solverName: string | null): UseSolverProfileResult => {
+  const [placements, setPlacements] = useState<SolverPlacement[] | null>(null);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState<Error | null>(null);
+
+  useEffect(() => {
+    setPlacements(null);
+    setError(null);
+    if (!solverName) return;
+
+    let cancelled = false;
+    setLoading(true);
+    loadPlacements(solverName)
+      .then((result) => {
+        if (!cancelled) setPlacements(result);
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err as Error);
+      })
+      .finally(() => {
+        if (!cancelled) setLoading(false);
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [solverName]);
+
+  return { placements, loading, error };
+};
@@ -1,5 +1,5 @@
 import { calculateLeaderboardData, formatDate } from '../../../utils/leaderboardUtils';
-import { LeaderboardData, Puzzle } from '../types';
+import { LeaderboardData, Puzzle, StatsManifest, StatsShard } from '../types';
 
 const fetchJson = async <T>(path: string): Promise<T> => {
   const response = await fetch(path);
@@ -9,42 +9,75 @@ const fetchJson = async <T>(path: string): Promise<T> => {
   return (await response.json()) as T;
 };
 
+type TopSolver = LeaderboardData['topSolvers'][number];
+
+const mapTopSolver = (s: any): TopSolver => ({
+  name: s.name,
+  puzzlesSolved: s.puzzlesSolved,
+  firstAppearance: formatDate(s.firstAppearance),
+  lastSolve: formatDate(s.lastSolve),
+});
+
+// stats.json uses raw field names (solver, length, start, end) — map to our types
+const mapStats = (raw: Record<string, any>): LeaderboardData => ({
+  totalPuzzles: raw.totalPuzzles,
+  uniqueSolvers: raw.uniqueSolvers,
+  solverDistribution: raw.solverDistribution,
+  generatedAt: raw.generatedAt,
+  monthlyParticipation: raw.monthlyParticipation ?? [],
+  solversGrowth: raw.solversGrowth ?? [],
+  mostSolvedPuzzles: raw.mostSolvedPuzzles ?? [],
+  topSolvers: (raw.topSolvers ?? []).map(mapTopSolver),
+  longestStreaks: (raw.longestStreaks ?? []).map((s: any) => ({
+    name: s.solver,
+    streakLength: s.length,
+    startDate: formatDate(s.start),
+    endDate: formatDate(s.end),
+  })),
+  risingStars: (raw.risingStars ?? []).map((s: any) => ({
+    name: s.solver,
+    solveRate: s.solveRate,
+    puzzlesSolved: s.puzzlesSolved,
+    firstAppearance: formatDate(s.firstAppearance),
+  })),
+  currentPuzzleProgress: raw.currentPuzzleProgress ?? undefined,
+});
+
+// Shards are content-addressed through the manifest, so the hash doubles as
+// a cache-buster and unchanged pages stay cached across daily updates.
+const shardUrl = (shard: StatsShard) => `/data/stats/${shard.path}?v=${shard.sha256.slice(0, 12)}`;
+
 export const loadLeaderboardData = async (): Promise<LeaderboardData> => {
-  // Try loading precomputed stats first (faster, smaller payload)
+  // Sharded stats first: a ~100 KB summary is enough for first paint, and
+  // topSolvers pages are fetched on demand via loadTopSolverPage.
   try {
-    // stats.json uses raw field names (solver, length, start, end) — map to our types
-    const raw = await fetchJson<Record<string, any>>('/data/stats.json');
+    const manifest = await fetchJson<StatsManifest>('/data/stats/manifest.json');
+    const raw = await fetchJson<Record<string, any>>(shardUrl(manifest.summary));
     return {
-      totalPuzzles: raw.totalPuzzles,
-      uniqueSolvers: raw.uniqueSolvers,
-      solverDistribution: raw.solverDistribution,
-      generatedAt: raw.generatedAt,
-      monthlyParticipation: raw.monthlyParticipation ?? [],
-      solversGrowth: raw.solversGrowth ?? [],
-      mostSolvedPuzzles: raw.mostSolvedPuzzles ?? [],
-      topSolvers: (raw.topSolvers ?? []).map((s: any) => ({
-        name: s.name,
-        puzzlesSolved: s.puzzlesSolved,
-        firstAppearance: formatDate(s.firstAppearance),
-        lastSolve: formatDate(s.lastSolve),
-      })),
-      longestStreaks: (raw.longestStreaks ?? []).map((s: any) => ({
-        name: s.solver,
-        streakLength: s.length,
-        startDate: formatDate(s.start),
-        endDate: formatDate(s.end),
-      })),
-      risingStars: (raw.risingStars ?? []).map((s: any) => ({
-        name: s.solver,
-        solveRate: s.solveRate,
-        puzzlesSolved: s.puzzlesSolved,
-        firstAppearance: formatDate(s.firstAppearance),
-      })),
-      currentPuzzleProgress: raw.currentPuzzleProgress ?? undefined,
+      ...mapStats(raw),
+      topSolversTotal: raw.topSolversTotal,
+      statsManifest: manifest,
     };
+  } catch {
+    // Fall through to the single-file stats.json
+  }
+
+  // Try loading precomputed stats next (faster, smaller payload)
+  try {
+    return mapStats(await fetchJson<Record<string, any>>('/data/stats.json'));
   } catch {
     // Fallback: load raw puzzle data and calculate stats client-side
     const puzzles = await fetchJson<Puzzle[]>('/data/data.json');
     return calculateLeaderboardData(puzzles);
   }
 };
+
+export const loadTopSolverPage = async (
+  manifest: StatsManifest,
+  index: number,
+): Promise<TopSolver[]> => {
+  const raw = await fetchJson<{ offset: number; topSolvers: any[] }>(
+    shardUrl(manifest.topSolverPages[index]),
+  );
+  return raw.topSolvers.map(mapTopSolver);
+};
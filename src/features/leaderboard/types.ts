@@ -53,5 +53,23 @@ export interface LeaderboardData {
     timeline: Array<{ solver: string; timestamp: string }>;
   };
   generatedAt?: string;
+  /** Total solver count when `topSolvers` is only the first page(s) of a sharded load. */
+  topSolversTotal?: number;
+  statsManifest?: StatsManifest;
+}
+
+export interface StatsShard {
+  path: string;
+  bytes: number;
+  sha256: string;
+}
+
+export interface StatsManifest {
+  generatedAt?: string;
+  topSolversTotal: number;
+  pageSize: number;
+  summaryTopSolvers: number;
+  summary: StatsShard;
+  topSolverPages: Array<StatsShard & { offset: number; count: number }>;
 }
 
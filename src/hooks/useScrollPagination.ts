@@ -8,6 +8,8 @@ interface UseScrollPaginationOptions {
   threshold?: number;
   /** When set, reports the first scroll-triggered load-more as a `table_scroll` event. */
   trackLabel?: string;
+  /** Called when the user scrolls to the bottom with every item already visible. */
+  onReachEnd?: () => void;
 }
 
 export const useScrollPagination = ({
@@ -16,6 +18,7 @@ export const useScrollPagination = ({
   batchSize = 10,
   threshold = 50,
   trackLabel,
+  onReachEnd,
 }: UseScrollPaginationOptions) => {
   const [visibleItems, setVisibleItems] = useState(initialCount);
   const containerRef = useRef<HTMLDivElement>(null);
@@ -43,9 +46,11 @@ export const useScrollPagination = ({
           trackOnce(`table-scroll:${trackLabel}`, 'table_scroll', { table: trackLabel });
         }
         setVisibleItems(prev => Math.min(prev + batchSize, totalItems));
+      } else if (bottom && onReachEnd) {
+        onReachEnd();
       }
     },
-    [visibleItems, totalItems, batchSize, threshold, trackLabel],
+    [visibleItems, totalItems, batchSize, threshold, trackLabel, onReachEnd],
   );
 
   return { visibleItems, containerRef, tableRef, handleScroll };
@@ -39,8 +39,15 @@ export const findSolverPlacement = (
   if (!solvers || solvers.length === 0) return null;
   const idx = solvers.indexOf(solverName);
   if (idx < 0) return null;
-  const total = solvers.length;
-  const rank = idx + 1;
+  return placementFromRank(puzzle, idx + 1, solvers.length);
+};
+
+/** Build a placement from a known 1-based rank (e.g. from the profile index). */
+export const placementFromRank = (
+  puzzle: Puzzle,
+  rank: number,
+  total: number,
+): SolverPlacement => {
   const percentile = total > 1 ? 100 * (1 - (rank - 1) / (total - 1)) : null;
   return { puzzle, rank, total, percentile };
 };
@@ -0,0 +1,239 @@
+"""
+On-disk HTTP cache (`client.HttpCache`) against a local stand-in for janestreet.com.
+
+A local server honouring conditional GETs serves four pages, fetched through
+`build_session` with `enable_http_cache` on; each session gets a fresh cache
+object on the same directory, as across runs:
+
+    this month's leaderboard   ETag
+    an old leaderboard         ETag and Last-Modified, older than
+                               `immutable_after_months`
+    a solution page            ETag and Last-Modified
+    the archive listing        Last-Modified
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from benchmarks.standin import ARCHIVE_PATH, SITE, Reroute
+from benchmarks.synthetic import generate_puzzles, render_archive_pages, render_solution_page
+from scraper.jane import client
+from scraper.jane.client import CachePolicy, build_session, enable_http_cache, fetch_html, fetch_json
+
+IMMUTABLE_AFTER_MONTHS = 3
+
+
+class Page:
+    """A page the stand-in serves, with the validators it answers with."""
+
+    def __init__(self, kind: str, content_type: str, body: bytes, etag: bool, last_modified: bool):
+        self.kind = kind
+        self.content_type = content_type
+        self.use_etag = etag
+        self.use_last_modified = last_modified
+        self.version = 0
+        self.update(body)
+
+    def update(self, body: bytes) -> None:
+        self.body = body
+        self.version += 1
+        self.etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"' if self.use_etag else None
+        stamp = datetime(2020, 1, 1, tzinfo=timezone.utc).replace(day=self.version)
+        self.last_modified = format_datetime(stamp, usegmt=True) if self.use_last_modified else None
+
+    def validators(self) -> Dict[str, Optional[str]]:
+        return {"if_none_match": self.etag, "if_modified_since": self.last_modified}
+
+    def expected(self) -> Any:
+        if self.content_type == "application/json":
+            return json.loads(self.body)
+        return self.body.decode("utf-8")
+
+
+class ValidatingServer:
+    """Local HTTP server for `pages` that answers conditional GETs with 304 and logs every request."""
+
+    def __init__(self, pages: Dict[str, Page]):
+        self.requests: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+        log = self.requests
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                page = pages.get(self.path)
+                if_none_match = self.headers.get("If-None-Match")
+                if_modified_since = self.headers.get("If-Modified-Since")
+                if page is None:
+                    status = 404
+                elif if_none_match is not None:
+                    # If-None-Match takes precedence over If-Modified-Since.
+                    status = 304 if page.etag and if_none_match == page.etag else 200
+                elif if_modified_since is not None:
+                    status = 304 if page.last_modified and if_modified_since == page.last_modified else 200
+                else:
+                    status = 200
+                body = b"not found" if page is None else b"" if status == 304 else page.body
+                with lock:
+                    log.append({
+                        "kind": page.kind if page else "not-found",
+                        "status": status,
+                        "if_none_match": if_none_match,
+                        "if_modified_since": if_modified_since,
+                    })
+                self.send_response(status)
+                if page is not None:
+                    if page.etag:
+                        self.send_header("ETag", page.etag)
+                    if page.last_modified:
+                        self.send_header("Last-Modified", page.last_modified)
+                self.send_header("Content-Type", page.content_type if page else "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.origin = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def pages() -> Dict[str, Page]:
+    puzzles = generate_puzzles(1, 0)
+    current, solved, oldest = puzzles[0], puzzles[1], puzzles[-1]
+    # Dated from today rather than the synthetic archive, so the current
+    # leaderboard stays inside the revalidation window whenever this runs.
+    this_month = datetime.now(timezone.utc).strftime("%Y-%m-01")
+    html = "text/html; charset=utf-8"
+    return {
+        f"/puzzles/{this_month}-current-leaderboard.json": Page(
+            "current-board", "application/json", json.dumps({"leaders": current["solvers"]}).encode("utf-8"),
+            etag=True, last_modified=False,
+        ),
+        f"/puzzles/{oldest['puzzle_id']}-leaderboard.json": Page(
+            "old-board", "application/json", json.dumps({"leaders": oldest["solvers"]}).encode("utf-8"),
+            etag=True, last_modified=True,
+        ),
+        solved["solution_url"][len(SITE):]: Page(
+            "solution", html, render_solution_page(solved).encode("utf-8"), etag=True, last_modified=True,
+        ),
+        ARCHIVE_PATH: Page(
+            "archive", html, render_archive_pages(puzzles)[0].encode("utf-8"), etag=False, last_modified=True,
+        ),
+    }
+
+
+@pytest.fixture
+def server(pages):
+    server = ValidatingServer(pages)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def run_session(server, pages, tmp_path, monkeypatch):
+    """Fetch every page in a new session with a new cache object on the same directory."""
+    monkeypatch.setattr(client, "_default_cache", None)
+    cache_dir = str(tmp_path / "http-cache")
+
+    def run() -> Dict[str, Any]:
+        cache = enable_http_cache(cache_dir, CachePolicy(immutable_after_months=IMMUTABLE_AFTER_MONTHS))
+        session = build_session()
+        session.mount(SITE, Reroute(server.origin))
+        del server.requests[:]
+        bodies = {}
+        for path, page in pages.items():
+            fetch = fetch_json if page.content_type == "application/json" else fetch_html
+            bodies[page.kind] = fetch(session, SITE + path)
+        return {"counters": dict(cache.counters), "requests": list(server.requests), "bodies": bodies}
+
+    return run
+
+
+def assert_session(
+    result: Dict[str, Any],
+    pages: Dict[str, Page],
+    counters: Dict[str, int],
+    statuses: Dict[str, Optional[int]],
+    validators: Optional[Dict[str, Dict[str, Optional[str]]]] = None,
+) -> None:
+    """
+    `statuses` maps each page kind to the status the server must have sent
+    for it (None: no request at all); `validators` maps revalidated kinds to
+    the conditional headers they must have sent.
+    """
+    assert result["counters"] == counters
+    per_kind = Counter(r["kind"] for r in result["requests"])
+    seen = {r["kind"]: r for r in result["requests"]}
+    for kind, status in statuses.items():
+        if status is None:
+            assert kind not in seen, f"{kind} was requested although it is immutable in the cache"
+        else:
+            assert per_kind[kind] == 1 and seen[kind]["status"] == status, kind
+    for kind, headers in (validators or {}).items():
+        for header, value in headers.items():
+            if value is not None:
+                assert seen[kind][header] == value, f"{kind} sent the wrong {header}"
+    for page in pages.values():
+        assert result["bodies"][page.kind] == page.expected(), f"{page.kind} body differs from the server's"
+
+
+def test_cold_session_downloads_and_stores_every_page(run_session, pages):
+    assert_session(
+        run_session(), pages,
+        {"hits": 0, "revalidated": 0, "misses": 4, "stored": 4},
+        {page.kind: 200 for page in pages.values()},
+    )
+
+
+def test_warm_session_serves_immutable_pages_and_revalidates_the_rest(run_session, pages):
+    by_kind = {page.kind: page for page in pages.values()}
+    run_session()
+    # The validators must have survived into a new cache object.
+    assert_session(
+        run_session(), pages,
+        {"hits": 2, "revalidated": 2, "misses": 0, "stored": 0},
+        {"old-board": None, "solution": None, "current-board": 304, "archive": 304},
+        {"current-board": by_kind["current-board"].validators(), "archive": by_kind["archive"].validators()},
+    )
+
+
+def test_changed_pages_are_stored_again_with_their_new_validators(run_session, pages):
+    by_kind = {page.kind: page for page in pages.values()}
+    board, archive = by_kind["current-board"], by_kind["archive"]
+    run_session()
+    old = {"current-board": board.validators(), "archive": archive.validators()}
+
+    board.update(json.dumps({"leaders": json.loads(board.body)["leaders"] + ["Late Solver"]}).encode("utf-8"))
+    archive.update(archive.body.replace(b"</body>", b"<!-- relisted --></body>"))
+    assert_session(
+        run_session(), pages,
+        {"hits": 2, "revalidated": 0, "misses": 2, "stored": 2},
+        {"old-board": None, "solution": None, "current-board": 200, "archive": 200},
+        old,
+    )
+    assert_session(
+        run_session(), pages,
+        {"hits": 2, "revalidated": 2, "misses": 0, "stored": 0},
+        {"old-board": None, "solution": None, "current-board": 304, "archive": 304},
+        {"current-board": board.validators(), "archive": archive.validators()},
+    )
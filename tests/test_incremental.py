@@ -0,0 +1,110 @@
+"""
+Incremental stats updates vs a full `build_stats`.
+
+Replays the changes the daily run makes to a synthetic store, bringing the
+persisted aggregate state up to date with `update_stats_state` after each
+one (saved and reloaded in between, as across runs), and checks that
+`render_stats` matches `build_stats` on the same puzzles apart from
+`generatedAt`.
+"""
+
+from __future__ import annotations
+
+import copy
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from benchmarks.synthetic import generate_puzzles
+from scraper.jane.aggregator import build_stats
+from scraper.jane.incremental import (
+    _month_index, _month_label, load_state, render_stats, save_state, snapshot_puzzles, update_stats_state,
+)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _add_solvers(entry: Dict[str, Any], names: List[str]) -> None:
+    # The pipeline replaces the lists rather than mutating them in place.
+    entry["solvers"] = list(entry.get("solvers") or []) + names
+    entry["solver_timestamps"] = {**(entry.get("solver_timestamps") or {}), **{n: _now() for n in names}}
+
+
+def _current(puzzles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return next(p for p in puzzles if not p.get("solution_url"))
+
+
+def new_solvers(puzzles: List[Dict[str, Any]]) -> None:
+    _add_solvers(_current(puzzles), ["Incremental New 1", "Incremental New 2", puzzles[5]["solvers"][0]])
+
+
+def late_solvers(puzzles: List[Dict[str, Any]]) -> None:
+    archived = next(p for p in puzzles if p.get("solution_url") and p.get("solvers"))
+    veteran = next(p for p in reversed(puzzles) if p.get("solvers"))["solvers"][0]
+    _add_solvers(archived, ["Late Solver", veteran])
+    _add_solvers(_current(puzzles), ["Incremental New 3"])
+
+
+def month_rollover(puzzles: List[Dict[str, Any]]) -> None:
+    current = _current(puzzles)
+    current["solution_url"] = f"https://www.janestreet.com/puzzles/{current['puzzle_id']}-solution/"
+    current["archived_at"] = _now()
+    _add_solvers(current, ["Final Day Solver"])
+    month = _month_label(_month_index(current["date_text"]) + 1)
+    date_text = datetime.strptime(month, "%b %Y").strftime("%B %Y")
+    puzzles.insert(0, {
+        "date_text": date_text,
+        "name": "Rollover Puzzle",
+        "solution_url": "",
+        "solvers": ["Rollover First", current["solvers"][0]],
+        "solver_timestamps": {"Rollover First": _now(), current["solvers"][0]: _now()},
+        "puzzle_id": "rollover-puzzle",
+    })
+
+
+def after_rollover(puzzles: List[Dict[str, Any]]) -> None:
+    _add_solvers(_current(puzzles), ["Rollover Second"])
+
+
+# (step, whether it must apply as a delta rather than a rebuild)
+STEPS = [
+    (new_solvers, True),
+    (late_solvers, True),
+    (month_rollover, False),
+    (after_rollover, True),
+]
+
+
+def _assert_matches_full(state, puzzles: List[Dict[str, Any]]) -> None:
+    incremental = render_stats(state)
+    full = build_stats(puzzles)
+    incremental.pop("generatedAt", None)
+    full.pop("generatedAt", None)
+    assert incremental == full
+
+
+def test_empty_store(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = update_stats_state([], None, load_state(path, []))
+    _assert_matches_full(state, [])
+    save_state(path, state)
+    _assert_matches_full(load_state(path, []), [])
+
+
+def test_deltas_match_full_recompute(tmp_path):
+    path = str(tmp_path / "state.json")
+    puzzles = copy.deepcopy(generate_puzzles(1, 0))
+    state = update_stats_state(puzzles, None, None)
+    _assert_matches_full(state, puzzles)
+    save_state(path, state)
+
+    for step, incremental in STEPS:
+        state = load_state(path, puzzles)
+        assert state is not None
+        snapshot = snapshot_puzzles(puzzles)
+        step(puzzles)
+        updated = update_stats_state(puzzles, snapshot, state)
+        assert (updated is state) == incremental, f"{step.__name__}: wrong update path"
+        _assert_matches_full(updated, puzzles)
+        save_state(path, updated)
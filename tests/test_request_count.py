@@ -0,0 +1,86 @@
+"""
+Requests a `--full` scrape makes against the local stand-in for janestreet.com.
+
+Scrapes a synthetic archive twice:
+
+    no-ids    every puzzle stored and still inside the late-solver window,
+              but without `puzzle_id` (the layout older runs wrote)
+    with-ids  the same store with `puzzle_id` kept
+
+`with-ids` must fetch no solution pages and produce the same puzzles as
+`no-ids`, apart from the stored ids it keeps on puzzles that predate
+leaderboards, whose solution page is never fetched.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from benchmarks.standin import ARCHIVE_PATH, SITE, Reroute, StandInServer, build_routes
+from benchmarks.synthetic import generate_puzzles
+from scraper.jane.client import build_session
+from scraper.jane.pipeline import scrape_all
+
+WORKERS = 8
+
+
+def _store_for(puzzles: List[Dict[str, Any]], archived_at: str, keep_ids: bool) -> List[Dict[str, Any]]:
+    """`puzzles` as stored data with every archived puzzle archived at `archived_at`."""
+    stored = copy.deepcopy(puzzles)
+    for entry in stored:
+        if entry["solution_url"]:
+            entry["archived_at"] = archived_at
+        if not keep_ids:
+            entry.pop("puzzle_id", None)
+    return stored
+
+
+def _run(server: StandInServer, store: List[Dict[str, Any]], output: str) -> Tuple[Counter, List[Dict[str, Any]]]:
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(store, f, ensure_ascii=False, indent=2)
+    session = build_session()
+    session.mount(SITE, Reroute(server.origin))
+    server.counts.clear()
+    puzzles = scrape_all(SITE + ARCHIVE_PATH, None, output, workers=WORKERS, session=session)
+    return Counter(server.counts), [p.to_dict() for p in puzzles]
+
+
+@pytest.fixture(scope="module")
+def scenarios(tmp_path_factory):
+    puzzles = generate_puzzles(1, 0)
+    # Inside the late-solver window, so nothing is settled and every puzzle is re-enriched.
+    recent = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+    stores = {
+        "no-ids": _store_for(puzzles, recent, keep_ids=False),
+        "with-ids": _store_for(puzzles, recent, keep_ids=True),
+    }
+    server = StandInServer(build_routes(puzzles))
+    try:
+        results = {
+            name: _run(server, store, str(tmp_path_factory.mktemp(name) / "data.json"))
+            for name, store in stores.items()
+        }
+    finally:
+        server.close()
+    return results
+
+
+def test_stored_ids_skip_solution_pages(scenarios):
+    assert scenarios["no-ids"][0]["solution"] > 0
+    assert scenarios["with-ids"][0]["solution"] == 0
+
+
+def test_stored_ids_produce_the_same_puzzles(scenarios):
+    no_ids, with_ids = scenarios["no-ids"][1], scenarios["with-ids"][1]
+    assert len(no_ids) == len(with_ids)
+    trimmed = [
+        {k: v for k, v in b.items() if k != "puzzle_id" or "puzzle_id" in a}
+        for a, b in zip(no_ids, with_ids)
+    ]
+    assert trimmed == no_ids